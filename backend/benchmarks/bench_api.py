@@ -0,0 +1,299 @@
+"""
+Benchmark suite for the API.
+
+Starts the app with uvicorn, drives the party endpoints and /health at fixed
+concurrency levels, runs in-process microbenchmarks of the loader and
+serialization paths, and saves everything as JSON so runs on different
+commits can be compared.
+
+    python benchmarks/bench_api.py
+    python benchmarks/bench_api.py --compare benchmarks/results/<commit>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+ENDPOINTS = {
+    "parties": "/api/parties",
+    "parties_summary": "/api/parties?fields=id,name,color,logo_url,key_policies",
+    "party": "/api/parties/{party_id}",
+    "party_similar": "/api/parties/{party_id}/similar?k=3",
+    "health": "/health",
+}
+PARTY_IDS = range(1, 16)
+
+
+def git_commit() -> str:
+    """Short hash of the checked-out commit, or 'unknown' outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    """Start uvicorn in the backend directory and wait until /health answers."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+def latency_stats(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Throughput and latency percentiles in milliseconds."""
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+async def drive(
+    base_url: str, path: str, concurrency: int, total_requests: int
+) -> Dict[str, float]:
+    """Send total_requests requests from `concurrency` concurrent clients."""
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    latencies: List[float] = []
+    errors = 0
+    sent = 0
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        async def worker() -> None:
+            nonlocal errors, sent
+            while sent < total_requests:
+                url = path.format(party_id=PARTY_IDS[sent % len(PARTY_IDS)])
+                sent += 1
+                start = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        # Warm up connections and the server-side snapshot
+        for _ in range(concurrency):
+            await client.get(path.format(party_id=PARTY_IDS[0]))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {**latency_stats(latencies, elapsed), "errors": errors}
+
+
+def run_http_benchmarks(
+    port: int, concurrency_levels: List[int], total_requests: int
+) -> Dict[str, Dict[str, dict]]:
+    base_url = f"http://127.0.0.1:{port}"
+    results: Dict[str, Dict[str, dict]] = {}
+    for name, path in ENDPOINTS.items():
+        results[name] = {}
+        for concurrency in concurrency_levels:
+            stats = asyncio.run(drive(base_url, path, concurrency, total_requests))
+            results[name][str(concurrency)] = stats
+            print(
+                f"  {name:<16} c={concurrency:<4} "
+                f"{stats['throughput_rps']:>9.1f} req/s  "
+                f"p50 {stats['p50_ms']:.2f}ms  p95 {stats['p95_ms']:.2f}ms  "
+                f"p99 {stats['p99_ms']:.2f}ms"
+            )
+    return results
+
+
+def time_call(func: Callable[[], object], repeat: int = 5) -> Dict[str, float]:
+    """Per-call time in microseconds (best and median of `repeat` timing runs)."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    runs = [
+        elapsed / number * 1e6
+        for elapsed in timer.repeat(repeat=repeat, number=number)
+    ]
+    return {
+        "best_us": round(min(runs), 2),
+        "median_us": round(statistics.median(runs), 2),
+        "calls": number,
+    }
+
+
+def run_microbenchmarks() -> Dict[str, Dict[str, float]]:
+    """Time the loader and serialization paths in-process."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    from pydantic import TypeAdapter
+
+    import main
+    from payloads import EncodedPayload
+
+    snapshot = main.party_snapshot.get()
+    party_data = [party.model_dump(mode="json") for party in snapshot.parties]
+    parties_adapter = TypeAdapter(List[main.Party])
+
+    benchmarks: Dict[str, Callable[[], object]] = {
+        "load_party_data_from_database": (
+            lambda: main.load_party_data_from_database("VVD")
+        ),
+        "get_party_with_database_fallback": (
+            lambda: main.get_party_with_database_fallback(main.PARTIES_2025[2])
+        ),
+        "build_snapshot": main.build_snapshot,
+        "snapshot_get": main.party_snapshot.get,
+        "pydantic_dump_json_parties": (
+            lambda: parties_adapter.dump_json(list(snapshot.parties))
+        ),
+        "encode_payload_parties": lambda: EncodedPayload.from_data(party_data),
+    }
+    results = {}
+    for name, func in benchmarks.items():
+        results[name] = time_call(func)
+        print(f"  {name:<34} {results[name]['best_us']:>12.2f} µs")
+    return results
+
+
+def compare(baseline: dict, current: dict) -> None:
+    """Print relative changes of p50/p99 latency, throughput and microbenchmarks."""
+    print(f"\nComparison with {baseline['meta']['commit']} (negative is faster):")
+    for name, levels in current.get("http", {}).items():
+        for concurrency, stats in levels.items():
+            old = baseline.get("http", {}).get(name, {}).get(concurrency)
+            if not old:
+                continue
+            changes = {
+                key: (stats[key] - old[key]) / old[key] * 100
+                for key in ("p50_ms", "p99_ms")
+                if old[key]
+            }
+            old_throughput = old["throughput_rps"]
+            throughput = (
+                (stats["throughput_rps"] - old_throughput) / old_throughput * 100
+            )
+            print(
+                f"  {name:<16} c={concurrency:<4} "
+                f"p50 {changes.get('p50_ms', 0):+6.1f}%  "
+                f"p99 {changes.get('p99_ms', 0):+6.1f}%  "
+                f"throughput {throughput:+6.1f}%"
+            )
+    for name, stats in current.get("micro", {}).items():
+        old = baseline.get("micro", {}).get(name)
+        if old:
+            change = (stats["best_us"] - old["best_us"]) / old["best_us"] * 100
+            print(f"  {name:<34} {change:+6.1f}%")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the API endpoints and loader paths"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 8, 32, 64],
+        help="Concurrency levels",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=2000,
+        help="Requests per endpoint and concurrency level",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="uvicorn worker processes"
+    )
+    parser.add_argument(
+        "--skip-http",
+        action="store_true",
+        help="Only run the in-process microbenchmarks",
+    )
+    parser.add_argument(
+        "--skip-micro", action="store_true", help="Only run the HTTP benchmarks"
+    )
+    parser.add_argument(
+        "--output", help="Result file (default: benchmarks/results/<commit>.json)"
+    )
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results: dict = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "requests": args.requests,
+            "workers": args.workers,
+        }
+    }
+
+    if not args.skip_http:
+        port = free_port()
+        print(f"HTTP benchmarks against uvicorn on port {port}:")
+        server = start_server(port, args.workers)
+        try:
+            results["http"] = run_http_benchmarks(port, args.concurrency, args.requests)
+        finally:
+            server.terminate()
+            server.wait()
+
+    if not args.skip_micro:
+        print("Microbenchmarks:")
+        results["micro"] = run_microbenchmarks()
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Startup benchmark with an import-time budget.
+
+Measures `python -X importtime` for the API module and the summary CLI, lists
+the slowest imports, and times a cold uvicorn start until /health and the first
+/api/parties response. Exits with status 1 when an import exceeds its budget,
+so it can run in CI.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget main=400 --skip-server
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import httpx
+from bench_api import free_port
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Module -> (directory to import it from, budget in milliseconds). Budgets sit below
+# the import times before the lazy imports, so going back to eager imports fails:
+# main took about 560 ms before and 430 ms after, summarize_programs about 1.2 s
+# before and 40 ms after (median of 5 runs of this script, Python 3.11, 1 CPU).
+IMPORT_TARGETS = {
+    "main": (BACKEND_DIR, 500.0),
+    "summarize_programs": (BACKEND_DIR / "summaries", 150.0),
+}
+
+
+def import_times(module: str, cwd: Path) -> Tuple[float, List[Tuple[float, str]]]:
+    """Total import time of module in ms and what it imported.
+
+    The imports are (cumulative ms, name indented by nesting depth) pairs.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <name indented by nesting depth>"
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative) / 1000, name[1:].rstrip()))
+    end = max(i for i, (_, name) in enumerate(modules) if name == module)
+    # Nested imports are listed before their parent, indented two spaces per level
+    start = end
+    while start > 0 and modules[start - 1][1].startswith(" "):
+        start -= 1
+    return modules[end][0], modules[start:end]
+
+
+def measure_imports(
+    runs: int, budgets: Dict[str, float], top: int
+) -> Tuple[Dict[str, dict], bool]:
+    results = {}
+    within_budget = True
+    for module, (cwd, _) in IMPORT_TARGETS.items():
+        samples = []
+        modules: List[Tuple[float, str]] = []
+        for _ in range(runs):
+            total, modules = import_times(module, cwd)
+            samples.append(total)
+        median = statistics.median(samples)
+        budget = budgets[module]
+        ok = median <= budget
+        within_budget = within_budget and ok
+        # Direct dependencies only, slowest first
+        direct = sorted(
+            (
+                (ms, name.strip())
+                for ms, name in modules
+                if not name.startswith("   ")
+            ),
+            reverse=True,
+        )[:top]
+        results[module] = {
+            "median_ms": round(median, 1),
+            "budget_ms": budget,
+            "slowest": direct,
+        }
+        print(
+            f"  {'✓' if ok else '✗'} import {module:<20} {median:8.1f} ms"
+            f"  (budget {budget:.0f} ms)"
+        )
+        for ms, name in direct:
+            print(f"      {name:<30} {ms:8.1f} ms")
+    return results, within_budget
+
+
+def measure_server_start() -> Dict[str, float]:
+    """Time from spawning uvicorn until /health answers and the first /api/parties."""
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            if time.perf_counter() - start > 30:
+                raise RuntimeError("uvicorn did not become healthy within 30s")
+            time.sleep(0.01)
+        healthy = time.perf_counter() - start
+        httpx.get(f"http://127.0.0.1:{port}/api/parties").raise_for_status()
+        first_response = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+    print(
+        f"  uvicorn healthy after {healthy * 1000:.0f} ms, "
+        f"first /api/parties after {first_response * 1000:.0f} ms"
+    )
+    return {
+        "healthy_ms": round(healthy * 1000, 1),
+        "first_parties_ms": round(first_response * 1000, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Check import time budgets and cold start latency"
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Import measurements per module (median is used)",
+    )
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="MODULE=MS",
+        help="Override a module's budget",
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="Slowest direct imports to list per module"
+    )
+    parser.add_argument(
+        "--skip-server", action="store_true", help="Only measure import times"
+    )
+
+    args = parser.parse_args()
+
+    budgets = {module: budget for module, (_, budget) in IMPORT_TARGETS.items()}
+    for override in args.budget:
+        module, _, ms = override.partition("=")
+        if module not in budgets or not ms:
+            parser.error(f"--budget expects one of {', '.join(budgets)} as MODULE=MS")
+        budgets[module] = float(ms)
+
+    print("Import times:")
+    _, within_budget = measure_imports(args.runs, budgets, args.top)
+
+    if not args.skip_server:
+        print("Cold start:")
+        measure_server_start()
+
+    return 0 if within_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
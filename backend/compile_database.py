@@ -0,0 +1,98 @@
+"""
+CLI script to compile database/*_summary.json into a single validated bundle.
+Run after generating summaries; the API then loads only the bundle at startup.
+"""
+
+import argparse
+import os
+import sys
+
+from main import (
+    CURRENT_ELECTION,
+    DatabaseError,
+    Election,
+    compile_parties,
+    load_positions,
+    make_snapshot,
+    party_ids_by_key,
+    publish_shared_snapshot,
+    write_bundle,
+)
+from matching import PositionMatrix, PositionsError
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compile party summaries into one bundle"
+    )
+    parser.add_argument(
+        "--election",
+        default=CURRENT_ELECTION,
+        help="Election to compile (database/<election>/ unless current)",
+    )
+    parser.add_argument(
+        "--database-dir",
+        help="Directory containing *_summary.json files (default: the election's)",
+    )
+    parser.add_argument(
+        "--output", help="Path of the bundle to write (default: the election's bundle)"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Only validate, don't write the bundle"
+    )
+    parser.add_argument(
+        "--shared",
+        action="store_true",
+        help="Also publish the memory-mapped snapshot shared by all workers",
+    )
+
+    args = parser.parse_args()
+
+    election = Election.named(args.election)
+    if not election.exists():
+        parser.error(
+            f"no party definitions for election {args.election} "
+            f"at {election.definitions_path}"
+        )
+    if args.shared and args.election != CURRENT_ELECTION:
+        parser.error("--shared is only supported for the current election")
+    database_dir = args.database_dir or election.database_dir
+    output = args.output or election.bundle_path
+
+    try:
+        parties = compile_parties(database_dir, election.definitions_path)
+    except DatabaseError as e:
+        print(f"✗ Database is invalid:\n{e}", file=sys.stderr)
+        return 1
+
+    positions_path = os.path.join(database_dir, "positions.json")
+    if os.path.exists(positions_path):
+        try:
+            positions = PositionMatrix.load(
+                positions_path, party_ids_by_key(election.definitions_path)
+            )
+        except PositionsError as e:
+            print(f"✗ Party positions are invalid:\n{e}", file=sys.stderr)
+            return 1
+        print(
+            f"✓ Positions of {len(positions.party_ids)} parties "
+            f"on {len(positions.statements)} statements are valid"
+        )
+
+    if args.check:
+        print(f"✓ {len(parties)} parties are valid")
+        return 0
+
+    write_bundle(parties, output)
+    print(f"✓ Wrote {len(parties)} parties to {output}")
+
+    if args.shared:
+        shared_positions = load_positions(positions_path, election.definitions_path)
+        snapshot = make_snapshot(tuple(parties), (), shared_positions)
+        generation = publish_shared_snapshot(snapshot)
+        print(f"✓ Published shared snapshot generation {generation}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Lazily loaded per-election snapshots, pooled values and LRU eviction by memory."""
+
+import threading
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    TypeVar,
+)
+
+V = TypeVar("V")
+
+
+class SharedPool(Generic[V]):
+    """Reference-counted pool of canonical values.
+
+    Values with the same key in several elections are stored, and counted, once.
+    """
+
+    def __init__(self, key: Callable[[V], Hashable], size: Callable[[V], int]) -> None:
+        self.key = key
+        self.size = size
+        self._values: Dict[Hashable, V] = {}
+        self._counts: Dict[Hashable, int] = {}
+        self._memory_size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def memory_size(self) -> int:
+        """Estimated bytes held by the pooled values."""
+        with self._lock:
+            return self._memory_size
+
+    def share(self, value: V) -> V:
+        """Return the canonical copy of value, registering one more user of it."""
+        key = self.key(value)
+        with self._lock:
+            canonical = self._values.get(key)
+            if canonical is None:
+                canonical = self._values[key] = value
+                self._memory_size += self.size(value)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            return canonical
+
+    def release(self, values: Iterable[V]) -> None:
+        """Drop one user of each value; values without users are forgotten."""
+        with self._lock:
+            for value in values:
+                key = self.key(value)
+                count = self._counts.get(key, 0) - 1
+                if count > 0:
+                    self._counts[key] = count
+                elif key in self._counts:
+                    del self._counts[key]
+                    self._memory_size -= self.size(self._values.pop(key))
+
+
+class TextPool(SharedPool[str]):
+    """Pool of the text shared between elections."""
+
+    def __init__(self) -> None:
+        super().__init__(key=lambda text: text, size=len)
+
+
+class SizedSnapshot(Protocol):
+    @property
+    def memory_size(self) -> int: ...
+
+
+S = TypeVar("S", bound=SizedSnapshot)
+S_co = TypeVar("S_co", bound=SizedSnapshot, covariant=True)
+
+
+class SnapshotSource(Protocol[S_co]):
+    def current(self) -> Optional[S_co]: ...
+
+    def get(self) -> S_co: ...
+
+    def release(self) -> None: ...
+
+
+class ElectionStore(Generic[S]):
+    """Per-election snapshot sources, opened on first access.
+
+    Above the memory cap the least recently used election is evicted first.
+    Pinned elections (the current one) are never evicted and their own memory
+    doesn't count towards the cap. A snapshot's memory_size leaves out what it
+    keeps in shared pools; shared_size() counts that once for all elections,
+    including what the pinned ones share.
+    """
+
+    def __init__(
+        self,
+        open_election: Callable[[str], Optional[SnapshotSource[S]]],
+        memory_cap: int,
+        pinned: Mapping[str, SnapshotSource[S]],
+        on_event: Callable[[str], None] = lambda event: None,
+        shared_size: Callable[[], int] = lambda: 0,
+    ) -> None:
+        self.open_election = open_election
+        self.memory_cap = memory_cap
+        self.pinned = dict(pinned)
+        self.on_event = on_event
+        self.shared_size = shared_size
+        self._loaded: "OrderedDict[str, SnapshotSource[S]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def loaded(self) -> List[str]:
+        """Loaded, evictable elections from least to most recently used."""
+        with self._lock:
+            return list(self._loaded)
+
+    def memory_size(self) -> int:
+        """Estimated bytes held by the evictable elections and the shared pools."""
+        with self._lock:
+            return self._memory_size()
+
+    def current(self, election: str) -> Optional[S]:
+        """A loaded election's snapshot if it needs no file reads, else None."""
+        source = self.pinned.get(election)
+        if source is None:
+            with self._lock:
+                source = self._loaded.get(election)
+                if source is None:
+                    return None
+                self._loaded.move_to_end(election)
+        return source.current()
+
+    def get(self, election: str) -> S:
+        """Return the snapshot of an election, loading it if needed.
+
+        KeyError if there is no such election.
+        """
+        source = self.pinned.get(election)
+        if source is not None:
+            return source.get()
+
+        with self._lock:
+            source = self._loaded.get(election)
+            if source is not None:
+                self._loaded.move_to_end(election)
+        if source is None:
+            source = self.open_election(election)
+            if source is None:
+                raise KeyError(election)
+            with self._lock:
+                # Another request may have opened the same election meanwhile; keep the
+                # first one
+                existing = self._loaded.setdefault(election, source)
+                self._loaded.move_to_end(election)
+            if existing is not source:
+                source = existing
+            else:
+                self.on_event("load")
+
+        snapshot = source.get()
+        with self._lock:
+            if election in self._loaded:
+                self._sizes[election] = snapshot.memory_size
+            self._evict(keep=election)
+        return snapshot
+
+    def _memory_size(self) -> int:
+        return sum(self._sizes.values()) + self.shared_size()
+
+    def _evict(self, keep: str) -> None:
+        while self._memory_size() > self.memory_cap:
+            victim = next(
+                (election for election in self._loaded if election != keep), None
+            )
+            if victim is None:
+                return
+            source = self._loaded.pop(victim)
+            self._sizes.pop(victim, None)
+            source.release()
+            self.on_event("evict")
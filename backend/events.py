@@ -0,0 +1,126 @@
+"""
+Server-Sent Events fan-out of the party data version.
+
+One watcher task per worker polls for the current version and, when it
+changed, publishes it as a single pre-encoded message. Subscribers keep no
+queue: they wait on a shared asyncio.Event that is swapped on every publish
+and then send the latest message. An idle connection costs one suspended
+generator, and a slow client skips versions instead of buffering them.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+# Seconds between comments that keep idle connections open through proxies
+KEEPALIVE_INTERVAL = 15.0
+# Reconnect delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 5000
+
+logger = logging.getLogger(__name__)
+
+
+def encode_event(event: str, event_id: str, data: Dict[str, Any]) -> bytes:
+    """One SSE message with its data as single-line JSON."""
+    body = json.dumps(data, separators=(",", ":"))
+    return f"event: {event}\nid: {event_id}\ndata: {body}\n\n".encode("utf-8")
+
+
+class Broadcaster:
+    """Publishes the version returned by poll to every subscriber whenever it changes.
+
+    The watcher only runs while there are subscribers.
+    """
+
+    def __init__(
+        self,
+        poll: Callable[[], Awaitable[Tuple[str, Dict[str, Any]]]],
+        interval: float,
+        event: str = "version",
+        keepalive: float = KEEPALIVE_INTERVAL,
+        on_event: Callable[[str], None] = lambda event: None,
+    ) -> None:
+        self.poll = poll
+        self.interval = interval
+        self.event = event
+        self.keepalive = keepalive
+        self.on_event = on_event
+        self.subscribers = 0
+        self.message_id: Optional[str] = None
+        self.message: Optional[bytes] = None
+        # Created on the running loop, so the broadcaster can outlive a loop (e.g.
+        # between test clients)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._watcher: Optional["asyncio.Task[None]"] = None
+
+    def publish(self, message_id: str, data: Dict[str, Any]) -> None:
+        """Make data the latest message and wake all subscribers, unless current."""
+        if message_id == self.message_id:
+            return
+        self.message_id = message_id
+        self.message = encode_event(self.event, message_id, data)
+        changed, self._changed = self._changed, asyncio.Event()
+        if changed is not None:
+            changed.set()
+        self.on_event("publish")
+
+    async def _next_publish(self) -> None:
+        changed = self._changed
+        if changed is None:
+            raise RuntimeError(
+                "subscribe() starts the broadcaster before waiting on it"
+            )
+        await changed.wait()
+
+    async def _watch(self) -> None:
+        while True:
+            try:
+                self.publish(*await self.poll())
+            except Exception:
+                logger.exception("Checking for a new %s event failed", self.event)
+            await asyncio.sleep(self.interval)
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._changed, self._watcher = loop, asyncio.Event(), None
+            self.message_id = self.message = None
+        if self._watcher is None or self._watcher.done():
+            self._watcher = loop.create_task(self._watch())
+
+    def _stop(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+        # Without a watcher the message goes stale; the next subscriber waits for a
+        # fresh one
+        self.message_id = self.message = None
+
+    async def subscribe(
+        self, last_event_id: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream SSE bytes: the current version, then every change.
+
+        The current version is skipped when the client already has it.
+        """
+        self._start()
+        self.subscribers += 1
+        self.on_event("connect")
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode("utf-8")
+            sent = last_event_id
+            while True:
+                if self.message is not None and self.message_id != sent:
+                    sent = self.message_id
+                    yield self.message
+                    continue
+                try:
+                    await asyncio.wait_for(self._next_publish(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self.subscribers -= 1
+            self.on_event("disconnect")
+            if self.subscribers == 0:
+                self._stop()
@@ -0,0 +1,142 @@
+"""
+CLI script to render the read-only API to static files for a CDN.
+
+Writes every party route as <path>.json with precompressed .gz and .br
+siblings, plus a manifest.json with the content hash of each file. The frontend
+reads these when VITE_STATIC_BASE_URL is set and falls back to the API otherwise.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Tuple
+
+from main import (
+    SUMMARY_VIEW_FIELDS,
+    DatabaseError,
+    build_snapshot,
+    similar_parties,
+    statement_models,
+)
+from payloads import EncodedPayload
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "static_export")
+MANIFEST_FORMAT = 1
+
+# Static file extension per content coding
+CODING_SUFFIXES = {"identity": "", "gzip": ".gz", "br": ".br"}
+
+
+def static_routes() -> Iterator[Tuple[str, str, EncodedPayload]]:
+    """Yield (static path, API path, payload) for every exported route."""
+    snapshot = build_snapshot()
+    yield "api/parties.json", "/api/parties", snapshot.list_payload
+    yield (
+        "api/parties/summary.json",
+        f"/api/parties?fields={','.join(SUMMARY_VIEW_FIELDS)}",
+        snapshot.fields_payload(SUMMARY_VIEW_FIELDS),
+    )
+    for party_id, payload in snapshot.party_payloads.items():
+        yield f"api/parties/{party_id}.json", f"/api/parties/{party_id}", payload
+        similar = [
+            party.model_dump(mode="json")
+            for party in similar_parties(snapshot, party_id)
+        ]
+        yield (
+            f"api/parties/{party_id}/similar.json",
+            f"/api/parties/{party_id}/similar",
+            EncodedPayload.from_data(similar),
+        )
+    if snapshot.positions is not None:
+        statements = [
+            statement.model_dump(mode="json")
+            for statement in statement_models(snapshot.positions)
+        ]
+        yield (
+            "api/statements.json",
+            "/api/statements",
+            EncodedPayload.from_data(statements),
+        )
+
+
+def write_file(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def export(output_dir: str) -> Dict[str, Any]:
+    """Render all routes into a fresh directory next to output_dir, then swap it in."""
+    build_dir = f"{output_dir}.tmp"
+    shutil.rmtree(build_dir, ignore_errors=True)
+
+    files: Dict[str, dict] = {}
+    for static_path, api_path, payload in static_routes():
+        for coding, content in payload.encodings().items():
+            path = os.path.join(build_dir, static_path + CODING_SUFFIXES[coding])
+            # An encoded body may be a memoryview (payloads.Buffer)
+            write_file(path, bytes(content))
+        files[static_path] = {
+            "route": api_path,
+            "sha256": hashlib.sha256(payload.body).hexdigest(),
+            "etag": payload.etag,
+            "size": len(payload.body),
+            "encodings": sorted(payload.encodings()),
+        }
+
+    # The version changes whenever any exported file does, so clients can cheaply
+    # check for updates
+    listing = "".join(
+        f"{path}:{info['sha256']}\n" for path, info in sorted(files.items())
+    )
+    version = hashlib.sha256(listing.encode("utf-8")).hexdigest()[:16]
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "version": version,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files": files,
+    }
+    write_file(
+        os.path.join(build_dir, "manifest.json"),
+        json.dumps(manifest, indent=2).encode("utf-8"),
+    )
+
+    # Swap the complete export in so a deploy never picks up a half-written tree
+    old_dir = f"{output_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(output_dir):
+        os.replace(output_dir, old_dir)
+    os.replace(build_dir, output_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Export the party API as static, precompressed JSON files"
+    )
+    parser.add_argument(
+        "--output", default=DEFAULT_OUTPUT_DIR, help="Directory to write the export to"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        manifest = export(os.path.abspath(args.output))
+    except DatabaseError as e:
+        print(f"✗ Database is invalid:\n{e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"✓ Exported {len(manifest['files'])} routes "
+        f"(version {manifest['version']}) to {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
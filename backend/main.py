@@ -1,11 +1,41 @@
-# ruff: noqa: E501
 import json
+import logging
 import os
-from typing import List
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from election_store import ElectionStore, SharedPool, TextPool
+from events import Broadcaster
+from metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from models import PARTY_DEFINITIONS_PATH, Party, load_party_definitions
+from payloads import EncodedPayload, payload_response
+from search_index import SearchIndex
+from shared_snapshot import SharedSnapshotReader, write_shared_snapshot
+from single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from matching import PositionMatrix
+    from similarity import PartySimilarity
 
 app = FastAPI(
     title="Nederland 2025 API",
@@ -25,267 +55,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the frontend compare the data it loaded with the /api/events digests
+    expose_headers=["ETag"],
 )
 
+app.add_middleware(MetricsMiddleware)
 
-class Party(BaseModel):
-    id: int
-    name: str
-    color: str
-    logo_url: str
-    current_vision: str
-    future_vision: str
-    key_policies: List[str]
-    website_url: str
-
-
-PARTIES_2025 = [
-    Party(
-        id=1,
-        name="PVV",
-        color="#F39200",
-        logo_url="/logos/pvv.png",
-        current_vision=(
-            "Volgens het partijprogramma ziet de Partij voor de Vrijheid (PVV) Nederland als een land dat momenteel onder druk staat door omvangrijke immigratie- en asielinstromen, vermeende islamisering en toenemende onveiligheid in wijken. "
-            "De PVV stelt dat Nederland één van de dichtstbevolkte landen van Europa is en dat de bevolkingsgroei de laatste decennia vrijwel uitsluitend door immigratie plaatsvindt. Het programma verwijst naar cijfers en voorbeelden: sinds 2010 zou bijna een half miljoen asielzoekers zijn toegekomen en de opvang van asielzoekers (inclusief Oekraïners) zou honderden miljoenen tot miljarden kosten. Volgens de partij leidt dit tot overlast en criminaliteit bij azc’s, druk op de openbare orde en spanning in stadsdelen. De PVV noemt daarnaast problematische integratie, meertaligheid in bepaalde buurten en zichtbare islamitische culturele kenmerken als signalen dat de Nederlandse identiteit en vrijheden onder druk staan; het programma spreekt expliciet over islamisering als een existentiële bedreiging en verwijst naar een breed ongenoegen bij delen van de bevolking. Economisch en sociaal ziet de PVV Nederland als een rijk land dat volgens het programma verkeerde prioriteiten stelt: veel geld zou naar asielopvang, internationale hulp, EU-bijdragen en klimaatbeleid gaan, waardoor de koopkracht, betaalbaarheid van wonen, energiekosten en zorg voor hardwerkende Nederlanders zouden lijden. Andere thema’s die volgens het programma problematisch zijn: een tekort aan betaalbare woningen (genoemd wordt een schatting van circa 400.000), wachttijden en toegankelijkheid in de zorg, personeelstekorten in de zorg, en bestuurlijke en juridische belemmeringen voor woningbouw en handhaving. Kortom: het programma schetst een Nederland dat volgens de PVV onveiliger, minder beheersbaar en economisch scheefgeprioriteerd is door immigratie, bestuurlijk beleid en internationale verplichtingen."
-        ),
-        future_vision=(
-            "Het PVV-programma schetst een toekomstbeeld van een Nederland waarin 'Nederlanders op 1' staan: een land met strikte migratie- en asielregels, sterke handhaving van orde en veiligheid, en prioriteit voor huisvesting en koopkracht van Nederlandse burgers. Centraal staat een onmiddellijk beleid om de asielinstroom te stoppen: grensweigering van asielzoekers, sluiting van asielzoekerscentra (azc’s), inzet van leger en technologie voor grensbewaking, stop op gezinshereniging en het afdwingen van een opt‑out in EU‑zaken rond asiel en immigratie. Het programma streeft naar massale uitzettingen van criminele vreemdelingen, het intrekken van tijdelijke verblijfsvergunningen (bijvoorbeeld voor grote groepen Syriërs) en beperkingen op dubbele nationaliteit en naturalisatie. Op veiligheid wil de PVV een 'zerotolerance'-aanpak: fors meer politie op straat (onder andere 10.000 extra agenten), strengere straffen, afschaffing van tbs voor bepaalde misdrijven, levenslange straffen daadwerkelijk levenslang en uitbreiding van gevangeniscapaciteit met sobere regimes en verplichte arbeid. Voor wonen wil de PVV een nationaal crisisplan: veel sneller bouwen (binnen- en buitenstedelijk), geen voorrang meer voor statushouders bij sociale huur, 10% verlaging van sociale huren en het behouden van hypotheekrenteaftrek. In de zorg wil de PVV het eigen risico afschaffen, tandartszorg in het basispakket opnemen, regionale ziekenhuizen beschermen en personeelstekorten aanpakken door minder bureaucratie, AI-ondersteuning en financiële prikkels voor meer werk. Financieel wil de partij middelen herverdelen van internationale uitgaven, klimaatprogramma’s en EU-betalingen naar Nederlandse prioriteiten. Het overall doel is een herwonnen controle over grenzen, veiligheid en publieke voorzieningen ten behoeve van Nederlandse inwoners."
-        ),
-        key_policies=[
-        "Totale asielstop en sluiting van azc’s: grensweigering van asielzoekers, stop op gezinshereniging, inzet leger voor bewaking",
-        "Strenge migratie- en naturalisatiepolitiek: uitzetting criminele vreemdelingen, beperking dubbele nationaliteit, remigratieregelingen",
-        "Hardere veiligheidsaanpak: 10.000 extra politieagenten, strengere straffen, afschaffing TBS voor bepaalde zaken en uitbreiding gevangeniscapaciteit",
-        "Huisvestingsprioriteit voor Nederlanders: geen voorrang voor statushouders, nationaal bouwcrisisplan, 10% verlaging sociale huren",
-        "Zorg- en koopkrachtmaatregelen: afschaffing eigen risico, tandarts in basispakket, bescherming regionale ziekenhuizen en maatregelen tegen zorgfraude"
-        ],
-        website_url="https://www.pvv.nl"
-    ),
-    Party(
-        id=2,
-        name="GroenLinks-PvdA",
-        color="#DC143C",
-        logo_url="/logos/glpvda.png",
-        current_vision="Nederland is te ongelijk geworden. Grote bedrijven en rijken profiteren, terwijl gewone mensen achteruitgaan. De klimaatcrisis vraagt urgente actie. Publieke voorzieningen worden wegbezuinigd.",
-        future_vision="Een eerlijk Nederland waar iedereen mee telt. Sociale zekerheid, goede publieke voorzieningen, en een groene economie die werkt voor iedereen. Klimaatrechtvaardigheid en solidariteit.",
-        key_policies=[
-            "Hogere belastingen voor rijken en bedrijven",
-            "Massale investeringen in groene energie",
-            "Sterke publieke sector en sociale zekerheid",
-            "Mensenrechten en internationale solidariteit",
-            "Betaalbare woningen voor iedereen"
-        ],
-        website_url="https://www.groenlinks.nl"
-    ),
-    Party(
-        id=3,
-        name="VVD",
-        color="#0A4D8C",
-        logo_url="/logos/vvd.png",
-        current_vision="Nederland staat er economisch goed voor, maar we moeten onze concurrentiepositie behouden. We zien kansen in innovatie en ondernemerschap, maar bureaucratie houdt ons tegen. Koopkracht moet beschermd worden.",
-        future_vision="Een Nederland waar ondernemers vrijelijk kunnen innoveren, waar de overheid efficiënt werkt, en waar iedereen kansen krijgt om te groeien. Minder regels, meer ruimte voor initiatief.",
-        key_policies=[
-            "Lagere belastingen voor bedrijven en ondernemers",
-            "Vermindering van bureaucratie en regelgeving",
-            "Investeren in onderwijs en innovatie",
-            "Sterke defensie en internationale samenwerking",
-            "Effectieve immigratie- en integratiebeleid"
-        ],
-        website_url="https://www.vvd.nl"
-    ),
-    Party(
-        id=4,
-        name="NSC",
-        color="#00A0A0",
-        logo_url="/logos/nsc.png",
-        current_vision="Nederland heeft goede fundamenten maar de politiek is verdeeld en weinig daadkrachtig. We hebben bestuurlijke vernieuwing nodig om de grote uitdagingen aan te pakken.",
-        future_vision="Een Nederland met een betrouwbare overheid die zich richt op de hoofdzaken: veiligheid, welvaart en welzijn. Pragmatisch bestuur zonder ideologische verdeeldheid.",
-        key_policies=[
-            "Bestuurlijke vernieuwing en effectief overheidsbeleid",
-            "Beheersbare migratie en goede integratie",
-            "Investeren in onderwijs en zorg",
-            "Klimaatbeleid dat betaalbaar en realistisch is",
-            "Versterken van de rechtsstaat"
-        ],
-        website_url="https://www.nieuwsociaalcontract.nl"
-    ),
-    Party(
-        id=5,
-        name="D66",
-        color="#E7007E",
-        logo_url="/logos/d66.png",
-        current_vision="Nederland heeft veel kansen maar wordt geremd door verouderde structuren. We moeten moderner, democratischer en Europeeser worden. Ongelijkheid neemt toe.",
-        future_vision="Een progressief, open Nederland dat voorop loopt in Europa. Meer directe democratie, gelijke kansen voor iedereen, en ambitieus klimaatbeleid. Innovatie en inclusiviteit.",
-        key_policies=[
-            "Democratische vernieuwing en referenda",
-            "Ambitieus klimaat- en duurzaamheidsbeleid",
-            "Investeren in onderwijs en wetenschap",
-            "Pro-Europese koers en internationale samenwerking",
-            "Gelijke rechten en kansen voor iedereen"
-        ],
-        website_url="https://www.d66.nl"
-    ),
-    Party(
-        id=6,
-        name="BBB",
-        color="#89C442",
-        logo_url="/logos/bbb.png",
-        current_vision="Het platteland en de boeren worden over het hoofd gezien. Beleid wordt gemaakt in de Randstad zonder oog voor de gevolgen voor het landelijke gebied. Boeren worden onterecht weggezet als vervuilers.",
-        future_vision="Een Nederland waar stad en platteland in balans zijn. Respect voor boeren en de agrarische sector. Beleid dat rekening houdt met alle regio's, niet alleen de grote steden.",
-        key_policies=[
-            "Beschermen van de agrarische sector",
-            "Meer aandacht voor het platteland",
-            "Realistische stikstofaanpak",
-            "Burgers centraal in plaats van bureaucratie",
-            "Betaalbare energie en mobiliteit"
-        ],
-        website_url="https://www.boerburgerbeweging.nl"
-    ),
-    Party(
-        id=7,
-        name="CDA",
-        color="#00A74A",
-        logo_url="/logos/cda.png",
-        current_vision="Nederland heeft sterke fundamenten maar we moeten meer investeren in samenhang en solidariteit. Te veel individualisering bedreigt onze sociale cohesie. Gemeenschappen hebben versterking nodig.",
-        future_vision="Een samenleving gebaseerd op christelijke waarden: naastenliefde, verantwoordelijkheid en rentmeesterschap. Sterke gemeenschappen en duurzame ontwikkeling voor toekomstige generaties.",
-        key_policies=[
-            "Investeren in gezin en gemeenschap",
-            "Duurzame landbouw en klimaatbeleid",
-            "Behoud van christelijke waarden in beleid",
-            "Sterke sociale zekerheid met eigen verantwoordelijkheid",
-            "Zorg voor kwetsbare groepen"
-        ],
-        website_url="https://www.cda.nl"
-    ),
-    Party(
-        id=8,
-        name="SP",
-        color="#FF0000",
-        logo_url="/logos/sp.png",
-        current_vision="Nederland wordt steeds ongelijker. Gewone mensen kunnen nauwelijks rondkomen terwijl rijken en bedrijven steeds rijker worden. De publieke sector wordt kapot bezuinigd.",
-        future_vision="Een Nederland voor gewone mensen. Goede zorg, onderwijs en huizen voor iedereen. Bedrijven moeten bijdragen aan de samenleving in plaats van alleen winst maken.",
-        key_policies=[
-            "Hogere minimumloon en betere arbeidsrechten",
-            "Nationalisatie van cruciale sectoren",
-            "Stoppen met bezuinigingen op zorg en onderwijs",
-            "Maximuminkomen en vermogensbelasting",
-            "Betaalbare woningen voor iedereen"
-        ],
-        website_url="https://www.sp.nl"
-    ),
-    Party(
-        id=9,
-        name="DENK",
-        color="#00A859",
-        logo_url="/logos/denk.png",
-        current_vision="Nederland heeft een probleem met discriminatie en ongelijke behandeling. Migranten en minderheden worden achtergesteld. Er is te weinig aandacht voor diversiteit en inclusie.",
-        future_vision="Een Nederland waar iedereen gelijke kansen krijgt, ongeacht afkomst. Een inclusieve samenleving die diversiteit omarmt en discriminatie actief bestrijdt.",
-        key_policies=[
-            "Bestrijding van discriminatie en racisme",
-            "Gelijke kansen voor alle Nederlanders",
-            "Erkenning van de multiculturele samenleving",
-            "Investeren in achterstandswijken",
-            "Internationale verbindingen en diplomatie"
-        ],
-        website_url="https://www.bewegingdenk.nl"
-    ),
-    Party(
-        id=10,
-        name="Partij voor de Dieren",
-        color="#006C2B",
-        logo_url="/logos/pvdd.png",
-        current_vision="Nederland behandelt dieren slecht en vernietigt de natuur voor korte termijn economische winst. De bio-industrie en intensieve landbouw veroorzaken enorme dierenleed en milieuproblemen.",
-        future_vision="Een Nederland waar dieren, natuur en milieu centraal staan. Een plantaardige economie die duurzaam is voor mens, dier en planeet. Respect voor alle levende wezens.",
-        key_policies=[
-            "Dierenrechten in de Grondwet",
-            "Stoppen met de bio-industrie",
-            "Bescherming van natuur en biodiversiteit",
-            "Transitie naar plantaardige economie",
-            "Stoppen met dierproeven"
-        ],
-        website_url="https://www.partijvoordedieren.nl"
-    ),
-    Party(
-        id=11,
-        name="FVD",
-        color="#722896",
-        logo_url="/logos/fvd.png",
-        current_vision="Nederland wordt geregeerd door globalistische elites die de Nederlandse soevereiniteit ondermijnen. Corona-maatregelen hebben onze vrijheden aangetast. De EU dicteert ons beleid.",
-        future_vision="Een vrij en soeverein Nederland waar burgers zelf kunnen beslissen. Directe democratie, nationale soevereiniteit en het behoud van Nederlandse waarden en tradities.",
-        key_policies=[
-            "Nederland uit de EU",
-            "Directe democratie en referenda",
-            "Behoud van Nederlandse soevereiniteit",
-            "Stoppen met klimaatbeleid",
-            "Geen lockdowns of verplichte vaccinaties"
-        ],
-        website_url="https://www.fvd.nl"
-    ),
-    Party(
-        id=12,
-        name="SGP",
-        color="#0066CC",
-        logo_url="/logos/sgp.png",
-        current_vision="Nederland verliest zijn christelijke wortels en morele kompas. Seculiere ideologieën ondermijnen de Bijbelse normen en waarden die ons land groot hebben gemaakt. Familie en gezag staan onder druk.",
-        future_vision="Een Nederland dat wordt geregeerd volgens Gods woord, waar Bijbelse normen en waarden leidend zijn. Respect voor gezag, sterke christelijke gezinnen en een samenleving gebaseerd op Gereformeerde beginselen.",
-        key_policies=[
-            "Handhaving van christelijke normen en waarden",
-            "Bescherming van het gezin en huwelijk",
-            "Zondag als rustdag beschermen",
-            "Christelijk onderwijs en opvoeding",
-            "Respect voor Gods schepping"
-        ],
-        website_url="https://www.sgp.nl"
-    ),
-    Party(
-        id=13,
-        name="ChristenUnie",
-        color="#007CBA",
-        logo_url="/logos/cu.png",
-        current_vision="Nederland heeft veel goeds maar we verliezen onze morele kompas. Familie en gemeenschap staan onder druk. We moeten meer oog hebben voor kwetsbare mensen en toekomstige generaties.",
-        future_vision="Een Nederland gebaseerd op Bijbelse waarden: rechtvaardigheid, rentmeesterschap en naastenliefde. Bescherming van het leven, sterke families en duurzame samenleving.",
-        key_policies=[
-            "Bescherming van het leven van wieg tot graf",
-            "Sterke gezinnen en gemeenschappen",
-            "Rentmeesterschap van de schepping",
-            "Zorg voor de zwakkeren in de samenleving",
-            "Eerlijk delen van welvaart"
-        ],
-        website_url="https://www.christenunie.nl"
-    ),
-    Party(
-        id=14,
-        name="Volt",
-        color="#502379",
-        logo_url="/logos/volt.png",
-        current_vision="Nederland kampt met versnipperde politiek en korte termijn denken. We missen een Europese visie en ambitieuze plannen voor de toekomst. Oude partijen bieden geen antwoord op moderne uitdagingen.",
-        future_vision="Een progressief Nederland dat voorop loopt in Europa. Ambitieus klimaatbeleid, digitale innovatie, Europese integratie en pragmatische oplossingen voor complexe problemen van de 21e eeuw.",
-        key_policies=[
-            "Europese federatie en integratie",
-            "Ambitieus klimaat- en energiebeleid",
-            "Digitalisering en innovatie",
-            "Evidence-based beleid en lange termijn denken",
-            "Gelijke kansen en inclusiviteit"
-        ],
-        website_url="https://www.volteuropa.org/nl"
-    ),
-    Party(
-        id=15,
-        name="JA21",
-        color="#2E8B57",
-        logo_url="/logos/ja21.png",
-        current_vision="Nederland heeft goede kanten maar wordt belemmerd door linkse ideologie en inefficiënte overheidsbestuur. We moeten terug naar gezond verstand en realisme in het beleid.",
-        future_vision="Een Nederland gebaseerd op conservatief realisme: sterke rechtsstaat, effectief bestuur, behoud van tradities en waarden, en pragmatisch beleid zonder ideologische dogma's.",
-        key_policies=[
-            "Conservatief realisme in het beleid",
-            "Effectieve immigratie en integratie",
-            "Sterke rechtsstaat en veiligheid",
-            "Realistische klimaataanpak",
-            "Behoud van Nederlandse cultuur"
-        ],
-        website_url="https://www.ja21.nl"
-    )
-]
+
+def __getattr__(name: str) -> Any:
+    # The base party definitions are read from database/parties_2025.json on first use,
+    # not at import
+    if name == "PARTIES_2025":
+        return list(load_party_definitions())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @app.get("/")
@@ -298,89 +80,1167 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy"}
 
 
-def load_party_data_from_database(party_name: str) -> dict | None:
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics of this worker process."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), "database")
+BUNDLE_FILE = "parties.bundle.json"
+BUNDLE_PATH = os.path.join(DATABASE_DIR, BUNDLE_FILE)
+BUNDLE_FORMAT = 1
+POSITIONS_FILE = "positions.json"
+POSITIONS_PATH = os.path.join(DATABASE_DIR, POSITIONS_FILE)
+# Generation counter of the snapshot shared by all workers; its presence enables shared
+# mode
+SHARED_SNAPSHOT_PATH = os.path.join(DATABASE_DIR, "parties.snapshot.gen")
+
+# The current election lives in database/, earlier and later ones in
+# database/<election>/
+CURRENT_ELECTION = "2025"
+# Estimated memory the non-current elections may hold before the least recently used is
+# evicted
+ELECTION_CACHE_BYTES = 64 * 1024 * 1024
+
+# Fields of the lightweight list view used by the party grid (in Party field order);
+# the key policies are short and give each card a preview, the visions are left for the
+# detail view
+SUMMARY_VIEW_FIELDS = ("id", "name", "color", "logo_url", "key_policies")
+
+# Minimum number of seconds between two mtime/size checks of the database files
+SNAPSHOT_CHECK_INTERVAL = 2.0
+
+# Top-level key of each party's summary file, stored as
+# database/<key lowercased>_summary.json
+PARTY_DATABASE_KEYS = {
+    "PVV": "PVV",
+    "GroenLinks-PvdA": "GL",
+    "VVD": "VVD",
+    "NSC": "NSC",
+    "D66": "D66",
+    "BBB": "BBB",
+    "CDA": "CDA",
+    "SP": "SP",
+    "DENK": "DENK",
+    "Partij voor de Dieren": "PVDD",
+    "FVD": "FVD",
+    "SGP": "SGP",
+    "ChristenUnie": "CU",
+    "Volt": "VOLT",
+    "JA21": "JA21",
+}
+
+SUMMARY_FIELDS = ("current_vision", "future_vision", "key_policies")
+
+logger = logging.getLogger(__name__)
+
+LOADER_DURATION = REGISTRY.histogram(
+    "party_loader_duration_seconds",
+    "Time spent loading party data, by function.",
+    ("function",),
+)
+PARTY_DATA_SOURCE = REGISTRY.counter(
+    "party_data_source_total",
+    "Parties loaded from the bundle, shared snapshot, summary files or hardcoded "
+    "fallback.",
+    ("source",),
+)
+SEARCH_INDEX_UPDATES = REGISTRY.counter(
+    "search_index_updated_parties_total",
+    "Parties (re)indexed for search after a data change.",
+)
+SNAPSHOT_CHECKS = REGISTRY.counter(
+    "party_snapshot_checks_total",
+    "Database change checks by result (unchanged or rebuilt).",
+    ("result",),
+)
+SNAPSHOT_LOADS = REGISTRY.counter(
+    "party_snapshot_loads_total",
+    "Snapshot loads run in the threadpool (load), and requests that awaited a running "
+    "one (join).",
+    ("event",),
+)
+ELECTION_EVENTS = REGISTRY.counter(
+    "election_snapshot_events_total",
+    "Non-current election snapshots loaded or evicted.",
+    ("event",),
+)
+EVENT_STREAM_CLIENTS = REGISTRY.gauge(
+    "event_stream_clients", "Open /api/events connections of this worker."
+)
+EVENT_STREAM_VERSIONS = REGISTRY.counter(
+    "event_stream_versions_total",
+    "Party data versions published to /api/events clients.",
+)
+
+
+class DatabaseError(ValueError):
+    """Raised when a summary file or the compiled bundle doesn't match the parties."""
+
+
+@dataclass(frozen=True)
+class Election:
+    """Location of one election's party definitions, summaries, bundle and positions."""
+
+    id: str
+    database_dir: str
+
+    @classmethod
+    def named(cls, election: str) -> "Election":
+        if election == CURRENT_ELECTION:
+            return cls(election, DATABASE_DIR)
+        return cls(election, os.path.join(DATABASE_DIR, election))
+
+    @property
+    def definitions_path(self) -> str:
+        return os.path.join(self.database_dir, f"parties_{self.id}.json")
+
+    @property
+    def bundle_path(self) -> str:
+        return os.path.join(self.database_dir, BUNDLE_FILE)
+
+    @property
+    def positions_path(self) -> str:
+        return os.path.join(self.database_dir, POSITIONS_FILE)
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.definitions_path)
+
+
+CURRENT = Election.named(CURRENT_ELECTION)
+
+
+def available_elections() -> List[str]:
+    """The current election plus each database/<election>/ directory with parties."""
+    elections = {CURRENT_ELECTION}
+    with os.scandir(DATABASE_DIR) as entries:
+        for entry in entries:
+            if (
+                entry.is_dir()
+                and entry.name.isalnum()
+                and Election.named(entry.name).exists()
+            ):
+                elections.add(entry.name)
+    return sorted(elections)
+
+
+def summary_file_path(party_name: str, database_dir: str = DATABASE_DIR) -> str:
+    """Return the summary file path for a party."""
+    key = PARTY_DATABASE_KEYS.get(party_name, party_name)
+    return os.path.join(database_dir, f"{key.lower()}_summary.json")
+
+
+def read_summary_file(file_path: str) -> dict:
+    """Read a summary file and check it holds one party with all the summary fields."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise DatabaseError(f"{file_path}: invalid JSON ({e})") from e
+
+    if not isinstance(data, dict) or len(data) != 1:
+        raise DatabaseError(f"{file_path}: expected one top-level party key")
+    (key, summary), = data.items()
+    if not isinstance(summary, dict):
+        raise DatabaseError(f"{file_path}: summary for {key!r} is not an object")
+    missing = [field for field in SUMMARY_FIELDS if field not in summary]
+    if missing:
+        raise DatabaseError(
+            f"{file_path}: summary for {key!r} misses {', '.join(missing)}"
+        )
+    return {"key": key, **summary}
+
+
+@LOADER_DURATION.time(function="load_party_data_from_database")
+def load_party_data_from_database(
+    party_name: str, database_dir: str = DATABASE_DIR
+) -> dict | None:
     """Load party data from database JSON file if it exists."""
-    # Map party names to their JSON file names
-    party_file_mapping = {
-        "PVV": "pvv",
-        "GroenLinks-PvdA": "gl",
-        "VVD": "vvd",
-        "NSC": "nsc",
-        "D66": "d66",
-        "BBB": "bbb",
-        "CDA": "cda",
-        "SP": "sp",
-        "DENK": "denk",
-        "Partij voor de Dieren": "pvdd",
-        "FVD": "fvd",
-        "SGP": "sgp",
-        "ChristenUnie": "cu",
-        "Volt": "volt",
-        "JA21": "ja21"
-    }
-    
-    database_dir = os.path.join(os.path.dirname(__file__), "database")
-    file_name = party_file_mapping.get(party_name, party_name.lower())
-    file_path = os.path.join(database_dir, f"{file_name}_summary.json")
-    
-    if os.path.exists(file_path):
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # The JSON structure is {"PARTY_NAME": {...}} or direct fields
-                if isinstance(data, dict):
-                    # Check if it has nested structure with party name as key
-                    if len(data) == 1:
-                        party_key = list(data.keys())[0]
-                        # Check if the key matches the party in some way
-                        if (party_key.upper() in party_name.upper() or 
-                            party_name.upper() in party_key.upper() or
-                            any(part.upper() in party_key.upper() for part in party_name.split("-")) or
-                            party_key.upper() == "GL" and "GroenLinks" in party_name or
-                            party_key.upper() == "PVDD" and "Partij voor de Dieren" in party_name or
-                            party_key.upper() == "CU" and "ChristenUnie" in party_name):
-                            return data[party_key]
-                    # Check if it has direct fields
-                    elif "current_vision" in data or "future_vision" in data:
-                        return data
-                return None
-        except (json.JSONDecodeError, IndexError, KeyError):
-            return None
-    return None
+    file_path = summary_file_path(party_name, database_dir)
+    if not os.path.exists(file_path):
+        return None
+
+    try:
+        data = read_summary_file(file_path)
+    except (OSError, DatabaseError) as e:
+        logger.warning("Ignoring summary for %s: %s", party_name, e)
+        return None
+    if data["key"] != PARTY_DATABASE_KEYS.get(party_name, party_name):
+        logger.warning(
+            "Ignoring summary for %s: unexpected key %r in %s",
+            party_name,
+            data["key"],
+            file_path,
+        )
+        return None
+    return data
 
 
-def get_party_with_database_fallback(hardcoded_party: Party) -> Party:
+@LOADER_DURATION.time(function="get_party_with_database_fallback")
+def get_party_with_database_fallback(
+    hardcoded_party: Party, database_dir: str = DATABASE_DIR
+) -> Party:
     """Get party data from database file, fallback to hardcoded data."""
-    database_data = load_party_data_from_database(hardcoded_party.name)
+    database_data = load_party_data_from_database(hardcoded_party.name, database_dir)
     
     if database_data:
+        PARTY_DATA_SOURCE.inc(source="database")
         # Update party with database data while keeping other fields
         return Party(
             id=hardcoded_party.id,
             name=hardcoded_party.name,
             color=hardcoded_party.color,
             logo_url=hardcoded_party.logo_url,
-            current_vision=database_data.get("current_vision", hardcoded_party.current_vision),
-            future_vision=database_data.get("future_vision", hardcoded_party.future_vision),
-            key_policies=database_data.get("key_policies", hardcoded_party.key_policies),
-            website_url=hardcoded_party.website_url
+            current_vision=database_data.get(
+                "current_vision", hardcoded_party.current_vision
+            ),
+            future_vision=database_data.get(
+                "future_vision", hardcoded_party.future_vision
+            ),
+            key_policies=database_data.get(
+                "key_policies", hardcoded_party.key_policies
+            ),
+            website_url=hardcoded_party.website_url,
         )
     
+    PARTY_DATA_SOURCE.inc(source="hardcoded")
     return hardcoded_party
 
 
+DatabaseSignature = Tuple[Tuple[str, int, int], ...]
+# Encoded responses shared between elections, by digest
+PayloadPool = SharedPool[EncodedPayload]
+
+
+class PartyList:
+    """The Party objects of a snapshot, parsed on first use.
+
+    Responses are served from the pre-encoded payloads; only search, similarity
+    and matching need Party objects. Their long texts are shared through the text
+    pool until release().
+    """
+
+    def __init__(
+        self, load: Callable[[], Iterable[Party]], text_pool: Optional[TextPool] = None
+    ) -> None:
+        self._load: Optional[Callable[[], Iterable[Party]]] = load
+        self._text_pool = text_pool
+        self._parties: Optional[Tuple[Party, ...]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Tuple[Party, ...]:
+        """The parties, parsing them if this is the first use."""
+        parties = self._parties
+        if parties is not None:
+            return parties
+        with self._lock:
+            parties = self._parties
+            if parties is None:
+                load = self._load
+                assert load is not None  # only cleared once the parties are set
+                parties = tuple(load())
+                if self._text_pool is not None:
+                    parties = tuple(
+                        share_texts(party, self._text_pool) for party in parties
+                    )
+                self._parties = parties
+                # Whatever the loader holds (e.g. the unshared parties) can go now
+                self._load = None
+            return parties
+
+    @property
+    def pooled(self) -> bool:
+        """Whether the texts are (or, once parsed, will be) shared through the pool."""
+        return self._text_pool is not None
+
+    def parsed(self) -> Tuple[Party, ...]:
+        """The parties if they have been parsed, else an empty tuple."""
+        return self._parties or ()
+
+    def release(self) -> None:
+        """Return the shared texts to the pool; parties parsed later aren't shared."""
+        with self._lock:
+            if self._text_pool is not None:
+                self._text_pool.release(
+                    text for party in self.parsed() for text in party_texts(party)
+                )
+                self._text_pool = None
+
+
+@dataclass(frozen=True)
+class PartySnapshot:
+    """Immutable, merged view of all parties with pre-encoded responses.
+
+    The Party objects and their id index are only built when first used.
+    """
+
+    party_list: PartyList
+    signature: DatabaseSignature
+    list_payload: EncodedPayload
+    party_payloads: Mapping[int, EncodedPayload]
+    # None until database/positions.json exists (and is valid)
+    positions: Optional["PositionMatrix"]
+    # Sparse fieldset payloads, filled on first use and dropped together with the
+    # snapshot
+    field_payloads: Dict[Tuple[str, ...], EncodedPayload] = field(default_factory=dict)
+    # Holds list_payload and party_payloads when they are shared with other elections
+    payload_pool: Optional[PayloadPool] = field(default=None, compare=False, repr=False)
+
+    @property
+    def parties(self) -> Tuple[Party, ...]:
+        """The merged parties, parsed on first use."""
+        return self.party_list.get()
+
+    @cached_property
+    def by_id(self) -> Mapping[int, Party]:
+        """O(1) index of the parties by id."""
+        return MappingProxyType({party.id: party for party in self.parties})
+
+    def fields_payload(self, fields: Tuple[str, ...]) -> EncodedPayload:
+        """Return the party list restricted to the given fields."""
+        payload = self.field_payloads.get(fields)
+        if payload is None:
+            # Cut from the encoded list (in Party field order), so sparse fieldsets
+            # don't need the Party objects
+            parties = json.loads(bytes(self.list_payload.body))
+            payload = EncodedPayload.from_data(
+                [{name: party[name] for name in fields} for party in parties]
+            )
+            self.field_payloads[fields] = payload
+        return payload
+
+    @cached_property
+    def similarity(self) -> "PartySimilarity":
+        """Pairwise party similarities, computed on first use (this imports NumPy).
+
+        Takes a few hundred milliseconds; request handlers go through
+        snapshot_similarity().
+        """
+        from similarity import PartySimilarity
+
+        return PartySimilarity.from_parties(
+            [party.model_dump(mode="json") for party in self.parties]
+        )
+
+    @cached_property
+    def memory_size(self) -> int:
+        """Rough estimate of the bytes held by this snapshot alone.
+
+        Payloads and texts kept in the shared pools are left out; the pools count
+        them once for all elections.
+        """
+        payloads = list(self.field_payloads.values())
+        if self.payload_pool is None:
+            payloads += [self.list_payload, *self.party_payloads.values()]
+        size = sum(payload.memory_size for payload in payloads)
+        if not self.party_list.pooled:
+            parsed = self.party_list.parsed()
+            size += sum(len(text) for party in parsed for text in party_texts(party))
+        return size
+
+    def release(self) -> None:
+        """Return the snapshot's texts and payloads to the shared pools."""
+        self.party_list.release()
+        if self.payload_pool is not None:
+            self.payload_pool.release(
+                [self.list_payload, *self.party_payloads.values()]
+            )
+
+
+def share_payload(
+    payload: EncodedPayload, payload_pool: Optional[PayloadPool]
+) -> EncodedPayload:
+    """The pool's copy of payload, or payload itself when there is no pool."""
+    return payload if payload_pool is None else payload_pool.share(payload)
+
+
+def party_texts(party: Party) -> List[str]:
+    """The long text fields of a party, which are shared between elections."""
+    return [party.current_vision, party.future_vision, *party.key_policies]
+
+
+def share_texts(party: Party, text_pool: TextPool) -> Party:
+    """Return party with its long texts replaced by the pool's canonical copies."""
+    return party.model_copy(update={
+        "current_vision": text_pool.share(party.current_vision),
+        "future_vision": text_pool.share(party.future_vision),
+        "key_policies": [text_pool.share(policy) for policy in party.key_policies],
+    })
+
+
+def database_signature(election: Election = CURRENT) -> DatabaseSignature:
+    """Return (file name, mtime, size) of the files a snapshot is built from.
+
+    That is the bundle, or every summary file when there is no bundle, plus the
+    positions file.
+    """
+    try:
+        entries = os.scandir(election.database_dir)
+    except FileNotFoundError:
+        return ()
+    with entries:
+        signature = [
+            (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+            for entry in entries
+            if entry.name.endswith("_summary.json")
+            or entry.name in (BUNDLE_FILE, POSITIONS_FILE)
+        ]
+    bundled = [item for item in signature if item[0] == BUNDLE_FILE]
+    summaries = sorted(item for item in signature if item[0] != POSITIONS_FILE)
+    positions = [item for item in signature if item[0] == POSITIONS_FILE]
+    return tuple((bundled or summaries) + positions)
+
+
+def compile_parties(
+    database_dir: str = DATABASE_DIR, definitions_path: str = PARTY_DEFINITIONS_PATH
+) -> List[Party]:
+    """Merge every summary file into the hardcoded parties.
+
+    Raises DatabaseError on any mismatch.
+    """
+    definitions = load_party_definitions(definitions_path)
+    parties_by_key = {
+        PARTY_DATABASE_KEYS.get(party.name, party.name): party.name
+        for party in definitions
+    }
+    summaries: dict[str, dict] = {}
+    errors = []
+
+    for file_name in sorted(os.listdir(database_dir)):
+        if not file_name.endswith("_summary.json"):
+            continue
+        file_path = os.path.join(database_dir, file_name)
+        try:
+            data = read_summary_file(file_path)
+        except DatabaseError as e:
+            errors.append(str(e))
+            continue
+
+        party_name = parties_by_key.get(data["key"])
+        if party_name is None:
+            errors.append(f"{file_path}: unknown party key {data['key']!r}")
+        elif summary_file_path(party_name, database_dir) != file_path:
+            expected_path = summary_file_path(party_name, database_dir)
+            errors.append(
+                f"{file_path}: key {data['key']!r} belongs in {expected_path}"
+            )
+        else:
+            summaries[party_name] = data
+
+    parties = []
+    for hardcoded_party in definitions:
+        summary = summaries.get(hardcoded_party.name)
+        if summary is None:
+            logger.warning(
+                "No summary for %s, using hardcoded data", hardcoded_party.name
+            )
+            parties.append(hardcoded_party)
+            continue
+        try:
+            parties.append(Party.model_validate({
+                **hardcoded_party.model_dump(),
+                **{field: summary[field] for field in SUMMARY_FIELDS},
+            }))
+        except ValidationError as e:
+            errors.append(
+                f"{summary_file_path(hardcoded_party.name, database_dir)}: {e}"
+            )
+
+    if errors:
+        raise DatabaseError("\n".join(errors))
+    return parties
+
+
+def write_bundle(parties: List[Party], bundle_path: str = BUNDLE_PATH) -> None:
+    """Atomically write the compiled parties as one compact JSON bundle."""
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "parties": [party.model_dump(mode="json") for party in parties],
+    }
+    tmp_path = f"{bundle_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, bundle_path)
+
+
+@LOADER_DURATION.time(function="load_bundle")
+def load_bundle(bundle_path: str = BUNDLE_PATH) -> List[Party]:
+    """Read the compiled bundle written by compile_database.py."""
+    with open(bundle_path, "r", encoding="utf-8") as f:
+        bundle = json.load(f)
+    if bundle.get("format") != BUNDLE_FORMAT:
+        raise DatabaseError(
+            f"{bundle_path}: unsupported bundle format {bundle.get('format')!r}"
+        )
+    return [Party.model_validate(data) for data in bundle["parties"]]
+
+
+def party_ids_by_key(definitions_path: str = PARTY_DEFINITIONS_PATH) -> Dict[str, int]:
+    """Map the database file keys (e.g. "GL") to party ids."""
+    return {
+        PARTY_DATABASE_KEYS.get(party.name, party.name): party.id
+        for party in load_party_definitions(definitions_path)
+    }
+
+
+@LOADER_DURATION.time(function="load_positions")
+def load_positions(
+    positions_path: str = POSITIONS_PATH, definitions_path: str = PARTY_DEFINITIONS_PATH
+) -> Optional["PositionMatrix"]:
+    """Load the party positions for voter matching.
+
+    None when the file is missing or invalid.
+    """
+    if not os.path.exists(positions_path):
+        return None
+    from matching import PositionMatrix, PositionsError
+
+    try:
+        return PositionMatrix.load(positions_path, party_ids_by_key(definitions_path))
+    except (OSError, PositionsError) as e:
+        logger.error("Voter matching disabled: %s", e)
+        return None
+
+
+@LOADER_DURATION.time(function="build_snapshot")
+def build_snapshot(
+    election: Election = CURRENT,
+    text_pool: Optional[TextPool] = None,
+    payload_pool: Optional[PayloadPool] = None,
+) -> PartySnapshot:
+    """Load the compiled bundle, or merge the summary files when there is none."""
+    # Take the signature before reading so a write during the build triggers another
+    # rebuild
+    signature = database_signature(election)
+    if os.path.exists(election.bundle_path):
+        parties = tuple(load_bundle(election.bundle_path))
+        PARTY_DATA_SOURCE.inc(len(parties), source="bundle")
+    else:
+        parties = tuple(
+            get_party_with_database_fallback(party, election.database_dir)
+            for party in load_party_definitions(election.definitions_path)
+        )
+    positions = load_positions(election.positions_path, election.definitions_path)
+    return make_snapshot(parties, signature, positions, text_pool, payload_pool)
+
+
+def make_snapshot(
+    parties: Tuple[Party, ...],
+    signature: DatabaseSignature,
+    positions: Optional["PositionMatrix"],
+    text_pool: Optional[TextPool] = None,
+    payload_pool: Optional[PayloadPool] = None,
+) -> PartySnapshot:
+    """Pre-encode the responses of merged parties."""
+    party_data = [party.model_dump(mode="json") for party in parties]
+    party_list = PartyList(lambda: parties, text_pool)
+    # The parties exist already, so share their texts right away
+    party_list.get()
+    snapshot = PartySnapshot(
+        party_list=party_list,
+        signature=signature,
+        list_payload=share_payload(EncodedPayload.from_data(party_data), payload_pool),
+        party_payloads=MappingProxyType({
+            data["id"]: share_payload(EncodedPayload.from_data(data), payload_pool)
+            for data in party_data
+        }),
+        positions=positions,
+        payload_pool=payload_pool,
+    )
+    snapshot.fields_payload(SUMMARY_VIEW_FIELDS)
+    return snapshot
+
+
+SUMMARY_VIEW_KEY = f"fields:{','.join(SUMMARY_VIEW_FIELDS)}"
+
+
+def publish_shared_snapshot(
+    snapshot: PartySnapshot, control_path: str = SHARED_SNAPSHOT_PATH
+) -> int:
+    """Write the snapshot's payloads as the next shared generation and return it."""
+    payloads = {
+        "list": snapshot.list_payload,
+        SUMMARY_VIEW_KEY: snapshot.fields_payload(SUMMARY_VIEW_FIELDS),
+    }
+    payloads.update(
+        {
+            f"party:{party_id}": payload
+            for party_id, payload in snapshot.party_payloads.items()
+        }
+    )
+    return write_shared_snapshot(control_path, payloads)
+
+
+@LOADER_DURATION.time(function="load_shared_snapshot")
+def load_shared_snapshot(
+    reader: SharedSnapshotReader,
+    generation: int,
+    text_pool: Optional[TextPool] = None,
+) -> PartySnapshot:
+    """Build a snapshot whose payloads are views into a published generation.
+
+    Nothing is parsed up front: responses are served from the shared mapping, and
+    the Party objects are only built in the workers that search, compare or match.
+    The payloads stay out of the payload pool, where another election holding one
+    would keep the whole mapping alive after the next generation is published.
+    """
+    payloads, _ = reader.load(generation)
+    list_payload = payloads["list"]
+
+    def parse_parties() -> List[Party]:
+        data = json.loads(bytes(list_payload.body))
+        return [Party.model_validate(party) for party in data]
+
+    party_payloads = {
+        int(key[len("party:"):]): payload
+        for key, payload in payloads.items()
+        if key.startswith("party:")
+    }
+    PARTY_DATA_SOURCE.inc(len(party_payloads), source="shared")
+    # A generation published before the summary view changed is re-encoded on first use
+    field_payloads: Dict[Tuple[str, ...], EncodedPayload] = {}
+    if SUMMARY_VIEW_KEY in payloads:
+        field_payloads[SUMMARY_VIEW_FIELDS] = payloads[SUMMARY_VIEW_KEY]
+    return PartySnapshot(
+        party_list=PartyList(parse_parties, text_pool),
+        signature=shared_signature(generation),
+        list_payload=list_payload,
+        party_payloads=MappingProxyType(party_payloads),
+        positions=load_positions(),
+        field_payloads=field_payloads,
+    )
+
+
+def shared_signature(generation: int) -> DatabaseSignature:
+    return (("generation", generation, 0),)
+
+
+class SnapshotCache:
+    """The current snapshot of an election, rebuilt when a summary file changes."""
+
+    def __init__(
+        self,
+        check_interval: float = SNAPSHOT_CHECK_INTERVAL,
+        election: Election = CURRENT,
+        text_pool: Optional[TextPool] = None,
+        shared: Optional[SharedSnapshotReader] = None,
+        payload_pool: Optional[PayloadPool] = None,
+    ) -> None:
+        self.check_interval = check_interval
+        self.election = election
+        self.text_pool = text_pool
+        self.payload_pool = payload_pool
+        # When set, snapshots come from the published shared file instead of the
+        # database files
+        self.shared = shared
+        self._snapshot: Optional[PartySnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[PartySnapshot]:
+        """The snapshot if it is known to be current without file reads, else None."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if self.shared is not None:
+            # Checking the generation is a single read from shared memory, so it is done
+            # on every call
+            return (
+                snapshot
+                if snapshot.signature == shared_signature(self.shared.generation())
+                else None
+            )
+        return (
+            snapshot
+            if time.monotonic() - self._checked_at < self.check_interval
+            else None
+        )
+
+    def get(self) -> PartySnapshot:
+        """Return the current snapshot.
+
+        The database files are checked at most once per interval.
+        """
+        snapshot = self.current()
+        if snapshot is not None:
+            return snapshot
+        if self.shared is not None:
+            return self._get_shared(self.shared)
+
+        with self._lock:
+            now = time.monotonic()
+            snapshot = self._snapshot
+            if snapshot is None or now - self._checked_at >= self.check_interval:
+                if (
+                    snapshot is None
+                    or database_signature(self.election) != snapshot.signature
+                ):
+                    snapshot = self._build()
+                    self._replace(snapshot)
+                    SNAPSHOT_CHECKS.inc(result="rebuilt")
+                else:
+                    SNAPSHOT_CHECKS.inc(result="unchanged")
+                self._checked_at = now
+            return snapshot
+
+    def _get_shared(self, shared: SharedSnapshotReader) -> PartySnapshot:
+        signature = shared_signature(shared.generation())
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.signature != signature:
+                snapshot = load_shared_snapshot(shared, signature[0][1], self.text_pool)
+                self._replace(snapshot)
+                SNAPSHOT_CHECKS.inc(result="rebuilt")
+            return snapshot
+
+    def reload(self) -> PartySnapshot:
+        """Rebuild the snapshot unconditionally."""
+        with self._lock:
+            if self.shared is not None:
+                snapshot = load_shared_snapshot(
+                    self.shared, self.shared.generation(), self.text_pool
+                )
+            else:
+                snapshot = self._build()
+            self._replace(snapshot)
+            self._checked_at = time.monotonic()
+            return snapshot
+
+    def release(self) -> None:
+        """Drop the snapshot and its references into the pools.
+
+        The next get() rebuilds it.
+        """
+        with self._lock:
+            self._replace(None)
+
+    def _build(self) -> PartySnapshot:
+        return build_snapshot(self.election, self.text_pool, self.payload_pool)
+
+    def _replace(self, snapshot: Optional[PartySnapshot]) -> None:
+        if self._snapshot is not None:
+            self._snapshot.release()
+        self._snapshot = snapshot
+
+
+def open_election(election: str) -> Optional[SnapshotCache]:
+    """Snapshot cache for a non-current election, or None without a data directory."""
+    if not election.isalnum() or not Election.named(election).exists():
+        return None
+    return SnapshotCache(
+        election=Election.named(election),
+        text_pool=text_pool,
+        payload_pool=payload_pool,
+    )
+
+
+# Text and encoded responses that several elections have in common are kept once
+text_pool = TextPool()
+payload_pool: PayloadPool = SharedPool(
+    key=lambda payload: payload.digest, size=lambda payload: payload.memory_size
+)
+party_snapshot = SnapshotCache(
+    text_pool=text_pool,
+    shared=SharedSnapshotReader.open(SHARED_SNAPSHOT_PATH),
+    payload_pool=payload_pool,
+)
+election_store: ElectionStore[PartySnapshot] = ElectionStore(
+    open_election,
+    memory_cap=ELECTION_CACHE_BYTES,
+    pinned={CURRENT_ELECTION: party_snapshot},
+    on_event=lambda event: ELECTION_EVENTS.inc(event=event),
+    shared_size=lambda: text_pool.memory_size() + payload_pool.memory_size(),
+)
+snapshot_loads = SingleFlight(on_event=lambda event: SNAPSHOT_LOADS.inc(event=event))
+
+
+async def current_snapshot(election: str = CURRENT_ELECTION) -> PartySnapshot:
+    """The election's snapshot; KeyError if there is no such election.
+
+    Checking or (re)loading the database files runs in the threadpool, once for all
+    requests that need it at the same time, so the event loop keeps serving while a
+    snapshot is built.
+    """
+    snapshot = election_store.current(election)
+    if snapshot is not None:
+        return snapshot
+    return await snapshot_loads.run(election, election_store.get, election)
+
+
+def parse_fields(fields: str) -> Tuple[str, ...]:
+    """Parse a comma-separated sparse fieldset into Party field order."""
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - Party.model_fields.keys()
+    if not requested:
+        raise HTTPException(status_code=400, detail="No fields requested")
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return tuple(name for name in Party.model_fields if name in requested)
+
+
+def parties_response(
+    request: Request, snapshot: PartySnapshot, fields: Optional[str]
+) -> Response:
+    if fields is None:
+        return payload_response(request, snapshot.list_payload)
+    return payload_response(request, snapshot.fields_payload(parse_fields(fields)))
+
+
+def party_response(
+    request: Request, snapshot: PartySnapshot, party_id: int
+) -> Response:
+    payload = snapshot.party_payloads.get(party_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Party not found")
+    return payload_response(request, payload)
+
+
+async def election_snapshot(election: str) -> PartySnapshot:
+    try:
+        return await current_snapshot(election)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Election not found")
+
+
 @app.get("/api/parties", response_model=List[Party])
-async def get_parties() -> List[Party]:
-    """Get all parties with database data when available, fallback to hardcoded data."""
-    return [get_party_with_database_fallback(party) for party in PARTIES_2025]
+async def get_parties(request: Request, fields: Optional[str] = None) -> Response:
+    """Get all parties with database data when available, fallback to hardcoded data.
+
+    Pass ``fields`` (e.g. ``id,name,color,logo_url``) to get only those fields per
+    party.
+    """
+    return parties_response(request, await current_snapshot(), fields)
 
 
 @app.get("/api/parties/{party_id}", response_model=Party)
-async def get_party(party_id: int) -> Party:
-    """Get specific party with database data when available, fallback to hardcoded data."""
-    hardcoded_party = next((p for p in PARTIES_2025 if p.id == party_id), None)
-    if hardcoded_party is None:
-        from fastapi import HTTPException
+async def get_party(party_id: int, request: Request) -> Response:
+    """Get specific party with database data when available, else hardcoded data."""
+    return party_response(request, await current_snapshot(), party_id)
+
+
+async def current_version() -> Tuple[str, Dict[str, Any]]:
+    """Version event of the current snapshot.
+
+    Carries the digests of the party list, of the summary view and of every party;
+    they match the ETags of those responses.
+    """
+    snapshot = await current_snapshot()
+    version = snapshot.list_payload.digest
+    summary = snapshot.fields_payload(SUMMARY_VIEW_FIELDS).digest
+    parties = {
+        str(party_id): payload.digest
+        for party_id, payload in snapshot.party_payloads.items()
+    }
+    return version, {"version": version, "summary": summary, "parties": parties}
+
+
+def count_event_stream(event: str) -> None:
+    if event == "connect":
+        EVENT_STREAM_CLIENTS.inc()
+    elif event == "disconnect":
+        EVENT_STREAM_CLIENTS.dec()
+    else:
+        EVENT_STREAM_VERSIONS.inc()
+
+
+party_events = Broadcaster(
+    current_version, interval=SNAPSHOT_CHECK_INTERVAL, on_event=count_event_stream
+)
+
+
+@app.get("/api/events")
+async def get_events(request: Request) -> StreamingResponse:
+    """Server-Sent Events stream of the party data version.
+
+    Sends a ``version`` event with the digests of the party list and of each party on
+    connect and whenever the data changes, so clients refetch only the parties that
+    changed.
+    """
+    return StreamingResponse(
+        party_events.subscribe(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class ElectionsResponse(BaseModel):
+    current: str
+    elections: List[str]
+
+
+@app.get("/api/elections", response_model=ElectionsResponse)
+async def get_elections() -> ElectionsResponse:
+    """List the elections that /api/{election}/parties can serve."""
+    return ElectionsResponse(current=CURRENT_ELECTION, elections=available_elections())
+
+
+@app.get("/api/{election}/parties", response_model=List[Party])
+async def get_election_parties(
+    election: str, request: Request, fields: Optional[str] = None
+) -> Response:
+    """Get all parties of an election; earlier elections are loaded on first access."""
+    return parties_response(request, await election_snapshot(election), fields)
+
+
+@app.get("/api/{election}/parties/{party_id}", response_model=Party)
+async def get_election_party(
+    election: str, party_id: int, request: Request
+) -> Response:
+    """Get a specific party of an election."""
+    return party_response(request, await election_snapshot(election), party_id)
+
+
+class SimilarParty(BaseModel):
+    id: int
+    name: str
+    color: str
+    logo_url: str
+    similarity: float
+
+
+DEFAULT_SIMILAR_K = 3
+
+
+def similar_parties(
+    snapshot: PartySnapshot, party_id: int, k: int = DEFAULT_SIMILAR_K
+) -> List[SimilarParty]:
+    """The k parties most similar to party_id in the given snapshot."""
+    similar = []
+    for other_id, score in snapshot.similarity.most_similar(party_id, k):
+        party = snapshot.by_id[other_id]
+        similar.append(
+            SimilarParty(
+                id=party.id,
+                name=party.name,
+                color=party.color,
+                logo_url=party.logo_url,
+                similarity=score,
+            )
+        )
+    return similar
+
+
+async def snapshot_similarity(snapshot: PartySnapshot) -> "PartySimilarity":
+    """The snapshot's similarity matrix.
+
+    The first request after a rebuild computes it in the threadpool.
+    """
+    if "similarity" in vars(snapshot):
+        return snapshot.similarity
+    return await snapshot_loads.run(
+        ("similarity", snapshot.signature), getattr, snapshot, "similarity"
+    )
+
+
+@app.get("/api/parties/{party_id}/similar", response_model=List[SimilarParty])
+async def get_similar_parties(
+    party_id: int, k: int = Query(DEFAULT_SIMILAR_K, ge=1, le=50)
+) -> List[SimilarParty]:
+    """Get the k parties whose programs are closest to this one.
+
+    Closeness is the cosine similarity of their TF-IDF vectors.
+    """
+    snapshot = await current_snapshot()
+    if party_id not in snapshot.by_id:
         raise HTTPException(status_code=404, detail="Party not found")
-    
-    return get_party_with_database_fallback(hardcoded_party)
\ No newline at end of file
+    await snapshot_similarity(snapshot)
+    return similar_parties(snapshot, party_id, k)
+
+
+class SearchSnippet(BaseModel):
+    field: str
+    text: str
+
+
+class SearchResult(BaseModel):
+    id: int
+    name: str
+    color: str
+    logo_url: str
+    score: float
+    snippets: List[SearchSnippet]
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+
+
+party_search_index = SearchIndex()
+
+
+def sync_search_index(snapshot: PartySnapshot) -> None:
+    updated = party_search_index.sync(
+        snapshot.signature, lambda: [party.model_dump() for party in snapshot.parties]
+    )
+    if updated:
+        SEARCH_INDEX_UPDATES.inc(updated)
+
+
+async def current_search_index() -> Tuple[PartySnapshot, SearchIndex]:
+    """Return the snapshot with the search index brought up to date.
+
+    Only changed parties are re-indexed. That tokenizes and stems their texts, so it
+    runs in the threadpool, once for all requests that arrive meanwhile.
+    """
+    snapshot = await current_snapshot()
+    if not party_search_index.is_current(snapshot.signature):
+        await snapshot_loads.run(
+            ("search", snapshot.signature), sync_search_index, snapshot
+        )
+    return snapshot, party_search_index
+
+
+@app.get("/api/search", response_model=SearchResponse)
+async def search_parties(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+) -> SearchResponse:
+    """Full-text search over visions and key policies, ranked by BM25.
+
+    Snippet text is HTML-escaped with the matching words wrapped in ``<mark>``.
+    """
+    snapshot, index = await current_search_index()
+    results = []
+    for hit in index.search(q, limit):
+        party = snapshot.by_id[hit.party_id]
+        results.append(
+            SearchResult(
+                id=party.id,
+                name=party.name,
+                color=party.color,
+                logo_url=party.logo_url,
+                score=hit.score,
+                snippets=[
+                    SearchSnippet(field=snippet.field, text=snippet.text)
+                    for snippet in hit.snippets
+                ],
+            )
+        )
+    return SearchResponse(query=q, results=results)
+
+
+class StatementModel(BaseModel):
+    id: str
+    text: str
+    weight: float
+
+
+class MatchRequest(BaseModel):
+    # One answer per statement, in /api/statements order: -1 (disagree) .. 1 (agree),
+    # null to skip
+    answers: List[Optional[float]]
+    # Optional per-statement importance factors (e.g. 2 for "important to me", 0 to
+    # ignore)
+    importance: Optional[List[float]] = None
+
+
+class PartyMatch(BaseModel):
+    id: int
+    name: str
+    color: str
+    logo_url: str
+    score: Optional[float]
+
+
+class BulkMatchRequest(BaseModel):
+    answers: List[List[Optional[float]]] = Field(..., min_length=1, max_length=10000)
+    importance: Optional[List[float]] = None
+
+
+class BulkMatchResponse(BaseModel):
+    party_ids: List[int]
+    scores: List[List[Optional[float]]]
+
+
+async def current_positions() -> Tuple[PartySnapshot, "PositionMatrix"]:
+    snapshot = await current_snapshot()
+    if snapshot.positions is None:
+        raise HTTPException(status_code=503, detail="Party positions are not available")
+    return snapshot, snapshot.positions
+
+
+def score_answers(
+    positions: "PositionMatrix",
+    answers: List[List[Optional[float]]],
+    importance: Optional[List[float]],
+) -> List[List[Optional[float]]]:
+    from matching import PositionsError
+
+    try:
+        return positions.match(answers, importance)
+    except PositionsError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def encode_bulk_scores(
+    positions: "PositionMatrix",
+    answers: List[List[Optional[float]]],
+    importance: Optional[List[float]],
+) -> str:
+    body = {
+        "party_ids": list(positions.party_ids),
+        "scores": score_answers(positions, answers, importance),
+    }
+    return json.dumps(body, separators=(",", ":"))
+
+
+def statement_models(positions: "PositionMatrix") -> List[StatementModel]:
+    return [
+        StatementModel(id=s.id, text=s.text, weight=s.weight)
+        for s in positions.statements
+    ]
+
+
+@app.get("/api/statements", response_model=List[StatementModel])
+async def get_statements() -> List[StatementModel]:
+    """Get the quiz statements that /api/match answers refer to."""
+    _, positions = await current_positions()
+    return statement_models(positions)
+
+
+@app.post("/api/match", response_model=List[PartyMatch])
+async def match_parties(request: MatchRequest) -> List[PartyMatch]:
+    """Rank parties by agreement (0-100) with one set of answers."""
+    snapshot, positions = await current_positions()
+    scores = (
+        await run_in_threadpool(
+            score_answers, positions, [request.answers], request.importance
+        )
+    )[0]
+    # Highest score first; parties without any shared statement (None) last
+    ranked = sorted(
+        zip(positions.party_ids, scores),
+        key=lambda item: (item[1] is None, -(item[1] or 0)),
+    )
+    matches = []
+    for party_id, score in ranked:
+        party = snapshot.by_id[party_id]
+        matches.append(
+            PartyMatch(
+                id=party.id,
+                name=party.name,
+                color=party.color,
+                logo_url=party.logo_url,
+                score=score,
+            )
+        )
+    return matches
+
+
+@app.post("/api/match/bulk", response_model=BulkMatchResponse)
+async def match_parties_bulk(request: BulkMatchRequest) -> Response:
+    """Score many anonymized answer sets at once.
+
+    scores[i][j] is set i's agreement with party_ids[j].
+    """
+    _, positions = await current_positions()
+    # Scoring and encoding 10,000 answer sets takes a few hundred milliseconds; keep it
+    # off the event loop
+    body = await run_in_threadpool(
+        encode_bulk_scores, positions, request.answers, request.importance
+    )
+    return Response(body, media_type="application/json")
@@ -0,0 +1,194 @@
+"""Party positions on quiz statements and vectorized agreement scoring of answers."""
+
+import json
+import math
+from dataclasses import dataclass
+from typing import List, Mapping, Optional, Tuple
+
+import numpy as np
+
+POSITIONS_FORMAT = 1
+
+# Rows scored per step in bulk matching, bounding the (rows x parties x statements)
+# intermediate
+SCORE_BLOCK_ROWS = 4096
+
+
+class PositionsError(ValueError):
+    """Raised when the party positions file is malformed."""
+
+
+@dataclass(frozen=True)
+class Statement:
+    id: str
+    text: str
+    weight: float
+
+
+@dataclass(frozen=True)
+class PositionMatrix:
+    """Party positions: parties x statements, -1 disagree .. 1 agree, NaN: no stance."""
+
+    statements: Tuple[Statement, ...]
+    party_ids: Tuple[int, ...]
+    positions: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def load(
+        cls, path: str, party_ids_by_key: Mapping[str, int]
+    ) -> "PositionMatrix":
+        """Read and validate a positions file, its parties keyed like the summaries."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise PositionsError(f"{path}: invalid JSON: {e}") from e
+
+        if not isinstance(data, dict) or data.get("format") != POSITIONS_FORMAT:
+            raise PositionsError(
+                f"{path}: expected an object with \"format\": {POSITIONS_FORMAT}"
+            )
+
+        errors = []
+        statements = []
+        for index, item in enumerate(data.get("statements") or []):
+            if (
+                not isinstance(item, dict)
+                or not isinstance(item.get("id"), str)
+                or not isinstance(item.get("text"), str)
+            ):
+                errors.append(f"statement {index}: needs string id and text")
+                continue
+            weight = item.get("weight", 1)
+            if not isinstance(weight, (int, float)) or weight <= 0:
+                errors.append(
+                    f"statement {item['id']!r}: weight must be a positive number"
+                )
+                continue
+            statements.append(
+                Statement(id=item["id"], text=item["text"], weight=float(weight))
+            )
+        if not statements and not errors:
+            errors.append("no statements")
+        if len({statement.id for statement in statements}) != len(statements):
+            errors.append("statement ids are not unique")
+
+        party_ids = []
+        rows = []
+        for key, values in (data.get("positions") or {}).items():
+            if key not in party_ids_by_key:
+                errors.append(f"positions: unknown party key {key!r}")
+                continue
+            if not isinstance(values, list) or len(values) != len(statements):
+                errors.append(
+                    f"positions[{key!r}]: expected {len(statements)} values"
+                )
+                continue
+            if any(
+                value is not None
+                and not (isinstance(value, (int, float)) and -1 <= value <= 1)
+                for value in values
+            ):
+                errors.append(
+                    f"positions[{key!r}]: values must be null or between -1 and 1"
+                )
+                continue
+            party_ids.append(party_ids_by_key[key])
+            rows.append(
+                [math.nan if value is None else float(value) for value in values]
+            )
+        if not rows and not errors:
+            errors.append("no party positions")
+
+        if errors:
+            raise PositionsError(f"{path}: " + "; ".join(errors))
+
+        positions = np.array(rows, dtype=np.float64)
+        weights = np.array(
+            [statement.weight for statement in statements], dtype=np.float64
+        )
+        positions.setflags(write=False)
+        weights.setflags(write=False)
+        return cls(
+            statements=tuple(statements),
+            party_ids=tuple(party_ids),
+            positions=positions,
+            weights=weights,
+        )
+
+    def answer_matrix(self, answers: List[List[Optional[float]]]) -> np.ndarray:
+        """Convert answer lists (None for skipped statements) to a float matrix.
+
+        PositionsError if a list has the wrong length or a value is out of range.
+        """
+        if any(len(row) != len(self.statements) for row in answers):
+            raise PositionsError(f"Expected {len(self.statements)} answers per set")
+        matrix = np.array(
+            [
+                [math.nan if value is None else value for value in row]
+                for row in answers
+            ],
+            dtype=np.float64,
+        ).reshape(len(answers), len(self.statements))
+        if np.any(np.abs(matrix) > 1):
+            raise PositionsError("Answers must be null or between -1 and 1")
+        return matrix
+
+    def importance_vector(
+        self, importance: Optional[List[float]]
+    ) -> Optional[np.ndarray]:
+        """Convert optional per-statement importance factors to a vector.
+
+        PositionsError if it has the wrong length or a negative value.
+        """
+        if importance is None:
+            return None
+        if len(importance) != len(self.statements):
+            raise PositionsError(f"Expected {len(self.statements)} importance values")
+        if any(value < 0 for value in importance):
+            raise PositionsError("Importance values must not be negative")
+        return np.array(importance, dtype=np.float64)
+
+    def score(
+        self, answers: np.ndarray, importance: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Agreement percentage (0-100) of every answer row with every party.
+
+        The result is a rows x parties matrix. Per statement, agreement is
+        1 - |answer - position| / 2, weighted by the statement weight times the
+        optional importance. Statements the voter skipped or a party took no
+        stance on are left out for that pair; a pair without any shared statement
+        scores NaN.
+        """
+        weights = self.weights if importance is None else self.weights * importance
+        weights = np.broadcast_to(weights, answers.shape)
+        scores = np.empty((answers.shape[0], len(self.party_ids)))
+        for start in range(0, answers.shape[0], SCORE_BLOCK_ROWS):
+            block = slice(start, start + SCORE_BLOCK_ROWS)
+            distance = np.abs(answers[block, None, :] - self.positions[None, :, :])
+            shared = ~np.isnan(distance)
+            block_weights = np.where(shared, weights[block, None, :], 0.0)
+            agreement = np.where(shared, 1 - distance / 2, 0.0)
+            total = block_weights.sum(axis=2)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                scores[block] = (block_weights * agreement).sum(axis=2) / total * 100
+        return scores
+
+    def match(
+        self,
+        answers: List[List[Optional[float]]],
+        importance: Optional[List[float]] = None,
+    ) -> List[List[Optional[float]]]:
+        """Validate and score answer lists.
+
+        Scores are rounded to one decimal, None where nothing is shared.
+        """
+        scores = np.round(
+            self.score(self.answer_matrix(answers), self.importance_vector(importance)),
+            1,
+        )
+        matches = scores.astype(object)
+        matches[np.isnan(scores)] = None
+        result: List[List[Optional[float]]] = matches.tolist()
+        return result
@@ -0,0 +1,36 @@
+"""Shared data models and the base party definitions, free of web-framework imports."""
+
+import json
+import os
+from functools import lru_cache
+from typing import List, Tuple
+
+from pydantic import BaseModel
+
+PARTY_DEFINITIONS_PATH = os.path.join(
+    os.path.dirname(__file__), "database", "parties_2025.json"
+)
+PARTY_DEFINITIONS_FORMAT = 1
+
+
+class Party(BaseModel):
+    id: int
+    name: str
+    color: str
+    logo_url: str
+    current_vision: str
+    future_vision: str
+    key_policies: List[str]
+    website_url: str
+
+
+@lru_cache(maxsize=None)
+def load_party_definitions(path: str = PARTY_DEFINITIONS_PATH) -> Tuple[Party, ...]:
+    """Read the base party definitions (used when no summary exists) on first use."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != PARTY_DEFINITIONS_FORMAT:
+        raise ValueError(
+            f"{path}: unsupported party definitions format {data.get('format')!r}"
+        )
+    return tuple(Party.model_validate(party) for party in data["parties"])
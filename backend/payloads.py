@@ -0,0 +1,133 @@
+"""Pre-serialized, pre-compressed JSON payloads served straight from memory."""
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # only without the brotli dependency; clients get gzip instead
+    brotli = None
+
+CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+# Encoded bodies are bytes, or views into a shared memory-mapped snapshot
+# (see shared_snapshot.py)
+Buffer = Union[bytes, memoryview]
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """JSON body plus its gzip and brotli encodings and a strong ETag."""
+
+    body: Buffer
+    gzip: Buffer
+    br: Optional[Buffer]
+    digest: str
+
+    @classmethod
+    def from_data(cls, data: Any) -> "EncodedPayload":
+        """Serialize data the way FastAPI's JSONResponse does and compress it once."""
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        body = text.encode("utf-8")
+        return cls(
+            body=body,
+            gzip=gzip.compress(body, compresslevel=9, mtime=0),
+            br=brotli.compress(body, quality=11) if brotli is not None else None,
+            digest=hashlib.sha256(body).hexdigest()[:32],
+        )
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag of the uncompressed body."""
+        return f'"{self.digest}"'
+
+    @property
+    def memory_size(self) -> int:
+        """Bytes held by all encodings."""
+        return sum(len(body) for body in self.encodings().values())
+
+    def encodings(self) -> Dict[str, Buffer]:
+        """Available content codings, most compact first."""
+        available = {"br": self.br, "gzip": self.gzip, "identity": self.body}
+        return {coding: body for coding, body in available.items() if body is not None}
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into a coding -> q-value mapping."""
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(payload: EncodedPayload, accept_encoding: str) -> str:
+    """Pick the most compact content coding the client accepts."""
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    for coding in payload.encodings():
+        if coding == "identity":
+            break
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return "identity"
+
+
+def etag_matches(payload: EncodedPayload, if_none_match: str) -> bool:
+    """Check If-None-Match against every encoded variant of the payload."""
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"').split("-", 1)[0] == payload.digest:
+            return True
+    return False
+
+
+class PayloadResponse(Response):
+    """Response that sends a memoryview body as is.
+
+    Starlette's Response.render() only passes bytes through, which would copy
+    views into the shared snapshot for every response.
+    """
+
+    def render(self, content: Any) -> Any:
+        if isinstance(content, memoryview):
+            return content
+        return super().render(content)
+
+
+def payload_response(request: Request, payload: EncodedPayload) -> Response:
+    """Serve a pre-encoded payload, answering revalidations with 304 Not Modified."""
+    coding = choose_encoding(payload, request.headers.get("accept-encoding", ""))
+    etag = payload.etag if coding == "identity" else f'"{payload.digest}-{coding}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(payload, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return PayloadResponse(
+        content=payload.encodings()[coding],
+        media_type="application/json",
+        headers=headers,
+    )
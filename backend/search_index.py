@@ -0,0 +1,403 @@
+"""Inverted index with Dutch stemming and BM25 ranking over the party texts."""
+import hashlib
+import html
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+SEARCH_FIELDS = ("current_vision", "future_vision", "key_policies")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+SNIPPET_RADIUS = 80
+MAX_SNIPPETS = 3
+QUERY_CACHE_SIZE = 1024
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+DUTCH_STOPWORDS = frozenset("""
+aan al alle als bij dan dat de der deze die dit door een en er het hij hun ik in is
+je kan maar met meer naar niet nog of om ons onze ook op over te tegen tot uit van
+veel voor was wat we wij wel worden wordt zal ze zich zij zijn zo zoals
+""".split())
+
+
+# --- Dutch Snowball stemmer -------------------------------------------------
+
+_VOWELS = "aeiouyè"
+_ACCENTS = str.maketrans("äëïöüáéíóú", "aeiouaeiou")
+
+
+def _is_vowel(char: str) -> bool:
+    return char in _VOWELS
+
+
+def _undouble(word: str) -> str:
+    return word[:-1] if word.endswith(("kk", "dd", "tt")) else word
+
+
+def _regions(word: str) -> Tuple[int, int]:
+    """R1 and R2 start positions; R1 leaves at least 3 letters before it."""
+    def region_after(start: int) -> int:
+        for i in range(start + 1, len(word)):
+            if not _is_vowel(word[i]) and _is_vowel(word[i - 1]):
+                return i + 1
+        return len(word)
+
+    r1 = max(region_after(0), 3)
+    r2 = region_after(r1) if r1 < len(word) else len(word)
+    return min(r1, len(word)), r2
+
+
+def _valid_en_ending(word: str, end: int) -> bool:
+    return end > 0 and not _is_vowel(word[end - 1]) and not word[:end].endswith("gem")
+
+
+def _valid_s_ending(word: str, end: int) -> bool:
+    return end > 0 and not _is_vowel(word[end - 1]) and word[end - 1] != "j"
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Stem a lowercase Dutch word with the Snowball Dutch algorithm."""
+    word = word.translate(_ACCENTS)
+    if len(word) < 3:
+        return word
+
+    # Mark consonant-like y and i with capitals so they don't count as vowels
+    chars = list(word)
+    if chars[0] == "y":
+        chars[0] = "Y"
+    for i in range(1, len(chars)):
+        if chars[i] == "y" and _is_vowel(chars[i - 1]):
+            chars[i] = "Y"
+        elif (
+            chars[i] == "i"
+            and _is_vowel(chars[i - 1])
+            and i + 1 < len(chars)
+            and _is_vowel(chars[i + 1])
+        ):
+            chars[i] = "I"
+    word = "".join(chars)
+    r1, r2 = _regions(word)
+
+    # Step 1
+    if word.endswith("heden"):
+        if len(word) - 5 >= r1:
+            word = word[:-5] + "heid"
+    elif word.endswith(("ene", "en")):
+        suffix = 3 if word.endswith("ene") else 2
+        end = len(word) - suffix
+        if end >= r1 and _valid_en_ending(word, end):
+            word = _undouble(word[:end])
+    elif word.endswith(("se", "s")):
+        suffix = 2 if word.endswith("se") else 1
+        end = len(word) - suffix
+        if end >= r1 and _valid_s_ending(word, end):
+            word = word[:end]
+
+    # Step 2
+    e_found = False
+    if (
+        word.endswith("e")
+        and len(word) - 1 >= r1
+        and len(word) > 1
+        and not _is_vowel(word[-2])
+    ):
+        word = _undouble(word[:-1])
+        e_found = True
+
+    # Step 3a
+    if word.endswith("heid") and len(word) - 4 >= r2 and not word[:-4].endswith("c"):
+        word = word[:-4]
+        end = len(word) - 2
+        if word.endswith("en") and end >= r1 and _valid_en_ending(word, end):
+            word = _undouble(word[:end])
+
+    # Step 3b
+    if word.endswith(("end", "ing")):
+        if len(word) - 3 >= r2:
+            word = word[:-3]
+            if (
+                word.endswith("ig")
+                and len(word) - 2 >= r2
+                and not word[:-2].endswith("e")
+            ):
+                word = word[:-2]
+            else:
+                word = _undouble(word)
+    elif word.endswith("ig"):
+        if len(word) - 2 >= r2 and not word[:-2].endswith("e"):
+            word = word[:-2]
+    elif word.endswith("lijk"):
+        if len(word) - 4 >= r2:
+            word = word[:-4]
+            if (
+                word.endswith("e")
+                and len(word) - 1 >= r1
+                and len(word) > 1
+                and not _is_vowel(word[-2])
+            ):
+                word = _undouble(word[:-1])
+    elif word.endswith("baar"):
+        if len(word) - 4 >= r2:
+            word = word[:-4]
+    elif word.endswith("bar"):
+        if len(word) - 3 >= r2 and e_found:
+            word = word[:-3]
+
+    # Step 4: undouble vowel (maan -> man)
+    if (
+        len(word) >= 4
+        and not _is_vowel(word[-1]) and word[-1] != "I"
+        and word[-2] == word[-3] and word[-2] in "aeou"
+        and not _is_vowel(word[-4])
+    ):
+        word = word[:-2] + word[-1]
+
+    return word.replace("I", "i").replace("Y", "y")
+
+
+# --- Tokenization -----------------------------------------------------------
+
+def normalize(text: str) -> str:
+    """Casefold and compose so 'Asiel' and 'asiel' map to the same token."""
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+def tokenize(text: str) -> List[Tuple[int, int, str]]:
+    """Return (start, end, stem) for every non-stopword token of text."""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        word = normalize(match.group())
+        if word not in DUTCH_STOPWORDS and not word.isdigit():
+            tokens.append((match.start(), match.end(), stem(word)))
+    return tokens
+
+
+def query_terms(query: str) -> Tuple[str, ...]:
+    """Distinct stems of a query, in query order."""
+    return tuple(OrderedDict.fromkeys(term for _, _, term in tokenize(query)))
+
+
+# --- Index ------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class IndexedDocument:
+    """One party's searchable text with token positions for snippets."""
+
+    party_id: int
+    digest: str
+    fields: Mapping[str, str]
+    tokens: Mapping[str, Tuple[Tuple[int, int, str], ...]]
+    term_counts: Mapping[str, int]
+    length: int
+
+
+@dataclass(frozen=True)
+class Snippet:
+    field: str
+    text: str
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    party_id: int
+    score: float
+    snippets: Tuple[Snippet, ...]
+
+
+def document_fields(party: Mapping[str, object]) -> Dict[str, str]:
+    """Searchable fields of a party dict, with key policies joined one per line."""
+    fields = {}
+    for name in SEARCH_FIELDS:
+        value = party.get(name, "")
+        fields[name] = (
+            "\n".join(value) if isinstance(value, (list, tuple)) else str(value)
+        )
+    return fields
+
+
+def index_document(
+    party_id: int, fields: Dict[str, str], digest: str
+) -> IndexedDocument:
+    tokens = {name: tuple(tokenize(text)) for name, text in fields.items()}
+    term_counts = Counter(
+        term for field_tokens in tokens.values() for _, _, term in field_tokens
+    )
+    return IndexedDocument(
+        party_id=party_id,
+        digest=digest,
+        fields=fields,
+        tokens=tokens,
+        term_counts=dict(term_counts),
+        length=sum(term_counts.values()),
+    )
+
+
+def highlight(
+    text: str, tokens: Sequence[Tuple[int, int, str]], terms: Iterable[str]
+) -> List[str]:
+    """HTML snippets around the matching tokens of a field, matches in <mark>."""
+    terms = set(terms)
+    matches = [(start, end) for start, end, term in tokens if term in terms]
+    snippets: List[str] = []
+    i = 0
+    while i < len(matches) and len(snippets) < MAX_SNIPPETS:
+        window_start = max(matches[i][0] - SNIPPET_RADIUS, 0)
+        window_end = min(matches[i][1] + SNIPPET_RADIUS, len(text))
+        # Snap the window to word boundaries
+        if window_start > 0:
+            space = text.find(" ", window_start, matches[i][0])
+            window_start = space + 1 if space >= 0 else window_start
+        if window_end < len(text):
+            space = text.rfind(" ", matches[i][1], window_end)
+            window_end = space if space >= 0 else window_end
+
+        parts = ["…" if window_start > 0 else ""]
+        position = window_start
+        while i < len(matches) and matches[i][1] <= window_end:
+            start, end = matches[i]
+            parts.append(html.escape(text[position:start]))
+            parts.append(f"<mark>{html.escape(text[start:end])}</mark>")
+            position = end
+            i += 1
+        parts.append(html.escape(text[position:window_end]))
+        parts.append("…" if window_end < len(text) else "")
+        snippets.append("".join(parts))
+    return snippets
+
+
+class SearchIndex:
+    """BM25 inverted index over party documents, updated per changed party."""
+
+    def __init__(self) -> None:
+        self._documents: Dict[int, IndexedDocument] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+        self._version: object = None
+        self._query_cache: (
+            "OrderedDict[Tuple[Tuple[str, ...], int], Tuple[SearchHit, ...]]"
+        ) = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def update(self, parties: Iterable[Mapping[str, object]]) -> int:
+        """Index new or changed parties and drop removed ones.
+
+        Returns the number of re-indexed parties.
+        """
+        with self._lock:
+            seen = set()
+            changed = 0
+            for party in parties:
+                party_id = int(party["id"])  # type: ignore[call-overload]
+                seen.add(party_id)
+                fields = document_fields(party)
+                digest = hashlib.sha256(
+                    "\0".join(fields.values()).encode("utf-8")
+                ).hexdigest()
+                existing = self._documents.get(party_id)
+                if existing is not None and existing.digest == digest:
+                    continue
+                if existing is not None:
+                    self._remove(existing)
+                self._add(index_document(party_id, fields, digest))
+                changed += 1
+            for party_id in self._documents.keys() - seen:
+                self._remove(self._documents[party_id])
+                changed += 1
+            if changed:
+                self._query_cache.clear()
+            return changed
+
+    def is_current(self, version: object) -> bool:
+        """Whether the index already reflects this data version."""
+        return version == self._version
+
+    def sync(
+        self, version: object, parties: Callable[[], Iterable[Mapping[str, object]]]
+    ) -> int:
+        """Update from parties() unless the index already reflects this data version."""
+        if self.is_current(version):
+            return 0
+        changed = self.update(parties())
+        self._version = version
+        return changed
+
+    def _add(self, document: IndexedDocument) -> None:
+        self._documents[document.party_id] = document
+        self._total_length += document.length
+        for term, count in document.term_counts.items():
+            self._postings.setdefault(term, {})[document.party_id] = count
+
+    def _remove(self, document: IndexedDocument) -> None:
+        del self._documents[document.party_id]
+        self._total_length -= document.length
+        for term in document.term_counts:
+            postings = self._postings[term]
+            del postings[document.party_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str, limit: int = 10) -> Tuple[SearchHit, ...]:
+        """Parties ranked by BM25 score for the query, with highlighted snippets."""
+        terms = query_terms(query)
+        key = (terms, limit)
+        with self._lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                return cached
+            hits = self._search(terms, limit)
+            self._query_cache[key] = hits
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+            return hits
+
+    def _search(self, terms: Tuple[str, ...], limit: int) -> Tuple[SearchHit, ...]:
+        if not terms or not self._documents:
+            return ()
+        document_count = len(self._documents)
+        average_length = self._total_length / document_count or 1.0
+        scores: Dict[int, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for party_id, tf in postings.items():
+                length = self._documents[party_id].length
+                scores[party_id] = scores.get(party_id, 0.0) + idf * tf * (K1 + 1) / (
+                    tf + K1 * (1 - B + B * length / average_length)
+                )
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        hits = []
+        for party_id, score in ranked:
+            document = self._documents[party_id]
+            snippets = tuple(
+                Snippet(field=name, text=text)
+                for name in SEARCH_FIELDS
+                for text in highlight(
+                    document.fields[name], document.tokens[name], terms
+                )
+            )[:MAX_SNIPPETS]
+            hits.append(
+                SearchHit(party_id=party_id, score=round(score, 4), snippets=snippets)
+            )
+        return tuple(hits)
+
+    def document(self, party_id: int) -> Optional[IndexedDocument]:
+        return self._documents.get(party_id)
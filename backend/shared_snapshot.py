@@ -0,0 +1,160 @@
+"""
+Pre-encoded party payloads in a read-only file that every worker process memory-maps.
+
+A publisher (compile_database.py --shared) writes parties.snapshot.<generation>
+and then bumps the 8-byte generation counter in parties.snapshot.gen. Workers
+keep the counter mapped, so noticing a new snapshot costs one memory read, and
+serve response bodies as slices of the shared mapping instead of private copies.
+"""
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Mapping, Optional, Tuple
+
+from payloads import EncodedPayload
+
+SNAPSHOT_MAGIC = b"N2SNAP01"
+SNAPSHOT_FORMAT = 1
+GENERATION = struct.Struct("<Q")
+HEADER_LENGTH = struct.Struct("<I")
+# Generations kept on disk besides the current one, for workers still mapping an
+# older file
+KEEP_GENERATIONS = 2
+
+
+def snapshot_path(control_path: str, generation: int) -> str:
+    base = control_path
+    if base.endswith(".gen"):
+        base = base[: -len(".gen")]
+    return f"{base}.{generation}"
+
+
+def read_generation(control_path: str) -> int:
+    try:
+        with open(control_path, "rb") as f:
+            data = f.read(GENERATION.size)
+    except FileNotFoundError:
+        return 0
+    return GENERATION.unpack(data)[0] if len(data) == GENERATION.size else 0
+
+
+def write_shared_snapshot(
+    control_path: str,
+    payloads: Mapping[str, EncodedPayload],
+    metadata: Optional[dict] = None,
+) -> int:
+    """Write payloads as the next generation and publish it.
+
+    Returns the new generation.
+    """
+    generation = read_generation(control_path) + 1
+    entries: Dict[str, dict] = {}
+    blobs = []
+    offset = 0
+    for key, payload in payloads.items():
+        entry: Dict[str, object] = {"digest": payload.digest}
+        for coding, body in payload.encodings().items():
+            entry[coding] = [offset, len(body)]
+            blobs.append(body)
+            offset += len(body)
+        entries[key] = entry
+    header = json.dumps(
+        {
+            "format": SNAPSHOT_FORMAT,
+            "generation": generation,
+            "metadata": metadata or {},
+            "payloads": entries,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    path = snapshot_path(control_path, generation)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+        for blob in blobs:
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # Publish: the snapshot file is complete before any worker can see its generation
+    if not os.path.exists(control_path):
+        with open(f"{control_path}.tmp", "wb") as f:
+            f.write(GENERATION.pack(0))
+        os.replace(f"{control_path}.tmp", control_path)
+    with open(control_path, "r+b") as f:
+        with mmap.mmap(f.fileno(), GENERATION.size) as control:
+            control[: GENERATION.size] = GENERATION.pack(generation)
+            control.flush()
+
+    for old in range(generation - KEEP_GENERATIONS - 1, 0, -1):
+        try:
+            os.remove(snapshot_path(control_path, old))
+        except FileNotFoundError:
+            break
+    return generation
+
+
+class SharedSnapshotReader:
+    """Worker-side view of the published snapshots."""
+
+    def __init__(self, control_path: str) -> None:
+        self.control_path = control_path
+        with open(control_path, "rb") as f:
+            self._control = mmap.mmap(
+                f.fileno(), GENERATION.size, access=mmap.ACCESS_READ
+            )
+
+    @classmethod
+    def open(cls, control_path: str) -> Optional["SharedSnapshotReader"]:
+        """Reader for control_path, or None when nothing was ever published there."""
+        return cls(control_path) if os.path.exists(control_path) else None
+
+    def generation(self) -> int:
+        """The currently published generation.
+
+        A read from the shared mapping, without a system call.
+        """
+        generation: int = GENERATION.unpack_from(self._control)[0]
+        return generation
+
+    def load(self, generation: int) -> Tuple[Dict[str, EncodedPayload], dict]:
+        """Map a generation's file and return its payloads.
+
+        The payload bodies are views into the mapping.
+        """
+        with open(snapshot_path(self.control_path, generation), "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # The views keep the mapping alive; it is unmapped once the last payload
+        # referencing it is gone
+        view = memoryview(mapping)
+        if bytes(view[: len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+            raise ValueError(
+                f"{snapshot_path(self.control_path, generation)}: not a party snapshot"
+            )
+        (header_length,) = HEADER_LENGTH.unpack_from(view, len(SNAPSHOT_MAGIC))
+        header_start = len(SNAPSHOT_MAGIC) + HEADER_LENGTH.size
+        header = json.loads(bytes(view[header_start:header_start + header_length]))
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(
+                f"unsupported shared snapshot format {header.get('format')!r}"
+            )
+
+        data = view[header_start + header_length:]
+
+        def span(entry: dict, coding: str) -> memoryview:
+            start, length = entry[coding]
+            return data[start:start + length]
+
+        payloads = {
+            key: EncodedPayload(
+                body=span(entry, "identity"),
+                gzip=span(entry, "gzip"),
+                br=span(entry, "br") if "br" in entry else None,
+                digest=entry["digest"],
+            )
+            for key, entry in header["payloads"].items()
+        }
+        return payloads, header["metadata"]
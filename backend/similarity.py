@@ -0,0 +1,63 @@
+"""TF-IDF vectors of the party texts and their pairwise cosine similarity matrix."""
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from search_index import document_fields, tokenize
+
+
+@dataclass(frozen=True)
+class PartySimilarity:
+    """Pairwise cosine similarities between parties, computed once per data version."""
+
+    party_ids: Tuple[int, ...]
+    matrix: np.ndarray
+    row_of: Mapping[int, int]
+
+    @classmethod
+    def from_parties(
+        cls, parties: Sequence[Mapping[str, object]]
+    ) -> "PartySimilarity":
+        """TF-IDF vectors of every party's merged text and all their similarities."""
+        party_ids = tuple(int(party["id"]) for party in parties)  # type: ignore[call-overload]
+        term_counts: List[Counter] = []
+        vocabulary: Dict[str, int] = {}
+        for party in parties:
+            text = "\n".join(document_fields(party).values())
+            counts = Counter(term for _, _, term in tokenize(text))
+            for term in counts:
+                vocabulary.setdefault(term, len(vocabulary))
+            term_counts.append(counts)
+
+        tf = np.zeros((len(parties), len(vocabulary)), dtype=np.float32)
+        for row, counts in enumerate(term_counts):
+            columns = [vocabulary[term] for term in counts]
+            tf[row, columns] = list(counts.values())
+
+        # Sublinear term frequency and smoothed idf, like scikit-learn's TfidfVectorizer
+        document_frequency = np.count_nonzero(tf, axis=0)
+        idf = np.log((1 + len(parties)) / (1 + document_frequency)) + 1
+        vectors = np.log1p(tf, out=tf) * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        matrix = vectors @ vectors.T
+        np.fill_diagonal(matrix, -np.inf)
+        matrix.setflags(write=False)
+        return cls(
+            party_ids=party_ids,
+            matrix=matrix,
+            row_of={party_id: row for row, party_id in enumerate(party_ids)},
+        )
+
+    def most_similar(self, party_id: int, k: int) -> List[Tuple[int, float]]:
+        """The k parties most similar to party_id, as (party id, similarity)."""
+        row = self.matrix[self.row_of[party_id]]
+        k = min(k, len(row) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-row, k - 1)[:k]
+        top = top[np.argsort(-row[top], kind="stable")]
+        return [(self.party_ids[i], round(float(row[i]), 4)) for i in top]
@@ -0,0 +1,50 @@
+"""
+Coalesced loading of blocking data off the event loop.
+
+A load runs in the threadpool, so the event loop keeps serving other
+requests (and /health) while files are read. Requests that arrive while a
+load with the same key is running don't start another one: they await the
+result of the running load, so a burst of requests on cold or changed data
+costs one load and one worker thread.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs one load per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self, on_event: Callable[[str], None] = lambda event: None) -> None:
+        # Called with "load" when a load starts and "join" when a caller waits for a
+        # running one
+        self.on_event = on_event
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def run(self, key: Hashable, load: Callable[..., T], *args: Any) -> T:
+        """Return load(*args), run in the threadpool.
+
+        A caller joins the running load with the same key instead of starting one.
+        """
+        loop = asyncio.get_running_loop()
+        flight = self._flights.get(key)
+        # A flight of another loop (e.g. an earlier test client) can't be awaited here
+        if flight is None or flight.done() or flight.get_loop() is not loop:
+            flight = loop.create_task(run_in_threadpool(load, *args))
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+            self.on_event("load")
+        else:
+            self.on_event("join")
+        # Shielded, so a caller that disconnects doesn't cancel the load for the others
+        return await asyncio.shield(flight)
+
+    def _land(self, key: Hashable, flight: "asyncio.Future[Any]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Mark the exception as retrieved when every caller has gone away
+            flight.exception()
@@ -0,0 +1,84 @@
+"""
+Split long party programs into token-budgeted chunks along section headings.
+Used by the map-reduce mode of summarize_programs.py.
+"""
+
+import re
+from typing import List
+
+# Headings are short lines that are numbered ("3.2 Wonen", "Hoofdstuk 4") or in capitals
+HEADING_PATTERN = re.compile(
+    r"^(?:(?i:hoofdstuk|deel|thema)\s+\d+\b.*"
+    r"|\d+(?:\.\d+)*\.?\s+[A-ZÀ-Ý].*"
+    r"|[A-ZÀ-Ý0-9][A-ZÀ-Ý0-9 ,:&'’\-]{3,})$"
+)
+MAX_HEADING_LENGTH = 80
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def is_heading(line: str) -> bool:
+    """Check whether a line looks like a section heading."""
+    line = line.strip()
+    return (
+        0 < len(line) <= MAX_HEADING_LENGTH
+        and not line.endswith((".", ",", ";"))
+        and HEADING_PATTERN.match(line) is not None
+    )
+
+
+def split_into_sections(text: str) -> List[str]:
+    """Split text into sections that each start at a heading."""
+    sections: List[List[str]] = [[]]
+    for line in text.splitlines():
+        if is_heading(line) and any(existing.strip() for existing in sections[-1]):
+            sections.append([])
+        sections[-1].append(line)
+    return [
+        "\n".join(lines) for lines in sections if any(line.strip() for line in lines)
+    ]
+
+
+def split_oversized(section: str, max_tokens: int) -> List[str]:
+    """Split a section over the budget on line boundaries (or hard, for huge lines)."""
+    max_chars = max_tokens * 4
+    pieces: List[str] = []
+    current: List[str] = []
+    current_length = 0
+    for line in section.splitlines():
+        while len(line) > max_chars:
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and current_length + len(line) + 1 > max_chars:
+            pieces.append("\n".join(current))
+            current, current_length = [], 0
+        current.append(line)
+        current_length += len(line) + 1
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """Pack consecutive sections into chunks of at most max_tokens estimated tokens."""
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for section in split_into_sections(text):
+        if estimate_tokens(section) > max_tokens:
+            pieces = split_oversized(section, max_tokens)
+        else:
+            pieces = [section]
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -0,0 +1,499 @@
+"""
+LLM backends used by summarize_programs.py.
+
+- OpenAIChatBackend: one chat completion per prompt, optionally streamed to a file
+- OpenAIBatchBackend: all prompts in one Batch API job (cheaper, slower)
+- FakeBackend: deterministic offline responses with configurable latency
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from chunking import estimate_tokens
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+    from openai.types.chat import ChatCompletionMessageParam
+
+# Final states of a Batch API job
+BATCH_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+# Sent after the partial answer of an interrupted stream, so the model picks up where
+# it stopped
+CONTINUE_PROMPT = (
+    "Je antwoord werd onderbroken. "
+    "Ga precies verder waar je gebleven was, zonder iets te herhalen."
+)
+
+T = TypeVar("T")
+
+
+def transient_errors() -> Tuple[Type[Exception], ...]:
+    """Errors worth retrying: rate limits, timeouts, dropped connections and 5xx."""
+    # openai is imported here rather than at module level; it takes most of a second
+    # to import
+    import httpx
+    import openai
+
+    return (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+        # A stream that breaks off after the response started surfaces as a plain
+        # transport error
+        httpx.TransportError,
+    )
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting requests and (approximate) tokens per minute.
+
+    Without tokens_per_minute (None or 0) only requests are limited.
+    """
+
+    def __init__(
+        self, requests_per_minute: float, tokens_per_minute: Optional[float] = None
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute or None
+        self._request_allowance = float(requests_per_minute)
+        self._token_allowance = float(tokens_per_minute or 0)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._request_allowance = min(
+            self.requests_per_minute,
+            self._request_allowance + elapsed * self.requests_per_minute / 60,
+        )
+        if self.tokens_per_minute is not None:
+            self._token_allowance = min(
+                self.tokens_per_minute,
+                self._token_allowance + elapsed * self.tokens_per_minute / 60,
+            )
+
+    def _token_wait(self, tokens: int) -> float:
+        """Seconds until the token budget covers tokens; 0 when it already does."""
+        if self.tokens_per_minute is None or self._token_allowance >= tokens:
+            return 0.0
+        return (tokens - self._token_allowance) * 60 / self.tokens_per_minute
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request of tokens fits in the budget; return seconds waited."""
+        # A single request larger than the whole per-minute budget waits for a full
+        # bucket
+        if self.tokens_per_minute is not None:
+            tokens = min(tokens, int(self.tokens_per_minute))
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                token_wait = self._token_wait(tokens)
+                if self._request_allowance >= 1 and not token_wait:
+                    self._request_allowance -= 1
+                    if self.tokens_per_minute is not None:
+                        self._token_allowance -= tokens
+                    return time.monotonic() - start
+                request_wait = (
+                    (1 - self._request_allowance) * 60 / self.requests_per_minute
+                )
+                wait = max(request_wait, token_wait)
+            time.sleep(max(wait, 0.01))
+
+
+def with_retries(
+    call: Callable[[], T],
+    description: str,
+    max_retries: int = 5,
+    base_delay: float = 2.0,
+) -> T:
+    """Run call, retrying transient API errors with exponential backoff and jitter."""
+    retryable = transient_errors()
+    attempt = 0
+    while True:
+        try:
+            return call()
+        except retryable as e:
+            if attempt == max_retries:
+                raise
+            attempt += 1
+            delay = base_delay * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            print(
+                f"  {description}: {type(e).__name__}, retrying in {delay:.1f}s "
+                f"({attempt}/{max_retries})"
+            )
+            time.sleep(delay)
+
+
+def new_openai_client() -> "OpenAI":
+    from openai import OpenAI
+
+    return OpenAI()
+
+
+@dataclass
+class Completion:
+    """A completion plus what it took: tokens, wall time, rate limit waits, retries."""
+
+    text: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Wall-clock seconds of the whole call, rate limit waits and retries included
+    seconds: float = 0.0
+    rate_limit_wait: float = 0.0
+    retries: int = 0
+    # Set when the API reported no usage (fake backend, interrupted streams) and
+    # tokens were estimated
+    estimated: bool = False
+
+    def count(
+        self, prompt: str, text: str, usage: Optional[Tuple[int, int]] = None
+    ) -> None:
+        """Add the (prompt, completion) tokens of one request.
+
+        Without usage the tokens are estimated from the text.
+        """
+        if usage is None:
+            usage = (estimate_tokens(prompt), estimate_tokens(text))
+            self.estimated = True
+        self.prompt_tokens += usage[0]
+        self.completion_tokens += usage[1]
+
+
+class LLMBackend(ABC):
+    """Turns prompts into completions."""
+
+    # Part of the summary cache keys, so different models never share cached output
+    model = "unknown"
+    # Whether complete_many submits all prompts at once rather than one request each
+    batch = False
+
+    @abstractmethod
+    def complete(
+        self, prompt: str, description: str, partial_path: Optional[Path] = None
+    ) -> Completion:
+        """Return the completion for a single prompt.
+
+        With partial_path, the completion is appended to that file as it arrives
+        and an answer already partly in the file is continued rather than restarted.
+        """
+
+    def complete_many(
+        self, prompts: Dict[str, str], concurrency: int = 4
+    ) -> Dict[str, Completion]:
+        """Complete prompts keyed by id; ids whose request failed are left out."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            futures = {
+                key: executor.submit(self.complete, prompt, key)
+                for key, prompt in prompts.items()
+            }
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    print(f"✗ Request {key} failed: {e}")
+        return results
+
+
+class OpenAIChatBackend(LLMBackend):
+    """Synchronous chat completions, rate limited and retried on transient errors."""
+
+    def __init__(
+        self,
+        model: str,
+        params: Optional[Dict[str, Any]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 5,
+        client: Optional["OpenAI"] = None,
+    ) -> None:
+        self.model = model
+        self.params = params or {}
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.client = client or new_openai_client()
+
+    def complete(
+        self, prompt: str, description: str, partial_path: Optional[Path] = None
+    ) -> Completion:
+        completion = Completion()
+        attempts = 0
+
+        def request() -> None:
+            nonlocal attempts
+            attempts += 1
+            if partial_path is not None:
+                self._stream(prompt, partial_path, completion)
+            else:
+                self._request(prompt, completion)
+
+        start = time.perf_counter()
+        with_retries(request, description, max_retries=self.max_retries)
+        completion.seconds = time.perf_counter() - start
+        completion.retries = attempts - 1
+        return completion
+
+    def _wait_for_budget(self, tokens: int, completion: Completion) -> None:
+        if self.rate_limiter is not None:
+            completion.rate_limit_wait += self.rate_limiter.acquire(tokens)
+
+    def _request(self, prompt: str, completion: Completion) -> None:
+        self._wait_for_budget(estimate_tokens(prompt), completion)
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            **self.params,
+        )
+        completion.text = response.choices[0].message.content or ""
+        usage = response.usage
+        completion.count(
+            prompt,
+            completion.text,
+            (usage.prompt_tokens, usage.completion_tokens) if usage else None,
+        )
+
+    def _stream(self, prompt: str, partial_path: Path, completion: Completion) -> None:
+        """Stream the answer into partial_path, continuing an earlier attempt's part."""
+        if partial_path.exists():
+            received = partial_path.read_text(encoding='utf-8')
+        else:
+            received = ""
+        messages: List["ChatCompletionMessageParam"] = [
+            {"role": "user", "content": prompt}
+        ]
+        if received:
+            messages.append({"role": "assistant", "content": received})
+            messages.append({"role": "user", "content": CONTINUE_PROMPT})
+        self._wait_for_budget(
+            estimate_tokens(prompt) + estimate_tokens(received), completion
+        )
+
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **self.params,
+        )
+        streamed = ""
+        usage: Optional[Tuple[int, int]] = None
+        try:
+            with open(partial_path, 'a', encoding='utf-8') as f:
+                for chunk in stream:
+                    # The usage arrives in a final chunk without choices
+                    if chunk.usage is not None:
+                        usage = (
+                            chunk.usage.prompt_tokens,
+                            chunk.usage.completion_tokens,
+                        )
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        streamed += delta
+                        f.write(delta)
+                        f.flush()
+        finally:
+            # An interrupted stream costs tokens too
+            completion.count(prompt + received, streamed, usage)
+        completion.text = received + streamed
+
+
+class OpenAIBatchBackend(LLMBackend):
+    """Packs all prompts into one Batch API job, submits it and polls until done."""
+
+    batch = True
+
+    def __init__(
+        self,
+        model: str,
+        params: Optional[Dict[str, Any]] = None,
+        poll_interval: float = 30.0,
+        max_retries: int = 5,
+        client: Optional["OpenAI"] = None,
+    ) -> None:
+        self.model = model
+        self.params = params or {}
+        self.poll_interval = poll_interval
+        self.max_retries = max_retries
+        self.client = client or new_openai_client()
+
+    def complete(
+        self, prompt: str, description: str, partial_path: Optional[Path] = None
+    ) -> Completion:
+        results = self.complete_many({description: prompt})
+        if description not in results:
+            raise RuntimeError(f"Batch request {description} failed")
+        # Batch results arrive whole, there is nothing to stream
+        if partial_path is not None:
+            partial_path.write_text(results[description].text, encoding='utf-8')
+        return results[description]
+
+    def complete_many(
+        self, prompts: Dict[str, str], concurrency: int = 4
+    ) -> Dict[str, Completion]:
+        """Complete prompts as one batch job.
+
+        Every completion's seconds is the time of the whole job.
+        """
+        if not prompts:
+            return {}
+        start = time.perf_counter()
+
+        lines = []
+        for key, prompt in prompts.items():
+            body = {
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                **self.params,
+            }
+            request = {
+                "custom_id": key,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }
+            lines.append(json.dumps(request, ensure_ascii=False))
+        job_file = ("batch.jsonl", "\n".join(lines).encode("utf-8"))
+        input_file = with_retries(
+            lambda: self.client.files.create(file=job_file, purpose="batch"),
+            "batch upload",
+            self.max_retries,
+        )
+
+        batch = with_retries(
+            lambda: self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            ),
+            "batch submit",
+            self.max_retries,
+        )
+        print(f"  Submitted batch {batch.id} with {len(prompts)} requests")
+
+        while batch.status not in BATCH_FINAL_STATES:
+            time.sleep(self.poll_interval)
+            batch_id = batch.id
+            batch = with_retries(
+                lambda: self.client.batches.retrieve(batch_id),
+                "batch poll",
+                self.max_retries,
+            )
+            counts = batch.request_counts
+            if counts is not None:
+                print(
+                    f"  Batch {batch.id}: {batch.status} ({counts.completed}/"
+                    f"{counts.total} done, {counts.failed} failed)"
+                )
+
+        # An expired or cancelled job still has the results finished before it ended
+        if batch.status != "completed":
+            print(f"✗ Batch {batch.id} ended with status {batch.status}")
+        result_files = [
+            file_id
+            for file_id in (batch.output_file_id, batch.error_file_id)
+            if file_id
+        ]
+        if not result_files:
+            raise RuntimeError(
+                f"Batch {batch.id} ended with status {batch.status} without results"
+            )
+
+        results: Dict[str, Completion] = {}
+        for file_id in result_files:
+            output = with_retries(
+                lambda: self.client.files.content(file_id),
+                "batch download",
+                self.max_retries,
+            )
+            for line in output.text.splitlines():
+                if line.strip():
+                    self._read_result(json.loads(line), prompts, results)
+        seconds = time.perf_counter() - start
+        for completion in results.values():
+            completion.seconds = seconds
+        return results
+
+    @staticmethod
+    def _read_result(
+        item: Dict[str, Any], prompts: Dict[str, str], results: Dict[str, Completion]
+    ) -> None:
+        """Add one line of a batch output or error file to results, or log it."""
+        response = item.get("response") or {}
+        if response.get("status_code") != 200:
+            error = item.get("error") or response.get("body")
+            print(f"✗ Batch request {item['custom_id']} failed: {error}")
+            return
+        key = item["custom_id"]
+        body = response["body"]
+        completion = Completion(body["choices"][0]["message"]["content"])
+        usage = body.get("usage")
+        completion.count(
+            prompts[key],
+            completion.text,
+            (usage["prompt_tokens"], usage["completion_tokens"]) if usage else None,
+        )
+        results[key] = completion
+
+
+class FakeBackend(LLMBackend):
+    """Deterministic offline backend for tests and benchmarks of the whole pipeline."""
+
+    model = "fake"
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+
+    def complete(
+        self, prompt: str, description: str, partial_path: Optional[Path] = None
+    ) -> Completion:
+        start = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        content = self.response(prompt, description)
+        received = ""
+        if partial_path is not None:
+            # Continue a partial answer like the chat backend would
+            if partial_path.exists():
+                received = partial_path.read_text(encoding='utf-8')
+            if not content.startswith(received):
+                received = ""
+                partial_path.unlink(missing_ok=True)
+            with open(partial_path, 'a', encoding='utf-8') as f:
+                f.write(content[len(received):])
+        completion = Completion(content)
+        completion.count(prompt + received, content[len(received):])
+        completion.seconds = time.perf_counter() - start
+        return completion
+
+    @staticmethod
+    def response(prompt: str, description: str) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        # Prompts that ask for the final JSON get a summary, map prompts get plain notes
+        if "JSON formaat" not in prompt:
+            return f"Aantekeningen {digest} bij {description}."
+        return json.dumps({
+            "current_vision": f"Huidige visie {digest} ({description}).",
+            "future_vision": f"Toekomstvisie {digest} ({description}).",
+            "key_policies": [f"Kernpunt {i} {digest}" for i in range(1, 6)],
+        }, ensure_ascii=False)
@@ -0,0 +1,177 @@
+"""
+Strip PDF boilerplate from extracted program text before it is sent to the LLM.
+Used by summarize_programs.py between extraction and summarization.
+
+Pages are processed as a stream with a small look-ahead window: a line at the
+top or bottom of a page that also appears near the edge of several nearby
+pages is a running header or footer and is kept only the first time. Page
+numbers and table-of-contents lines are dropped, words hyphenated across a
+line (or page) break are joined, and whitespace runs are collapsed.
+"""
+
+import re
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Deque, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Part of the summary cache key; bump when a change alters the normalized text
+NORMALIZATION_VERSION = 2
+
+# Non-empty lines at the top and at the bottom of a page where headers, footers and
+# page numbers sit
+EDGE_LINES = 3
+# At most this share of a page's lines counts as edge lines, so a short page keeps
+# its body
+EDGE_SHARE = 0.25
+# Pages before and after a page that are compared with it
+REPEAT_WINDOW = 4
+# Pages within the window (the page itself included) an edge line must appear on to
+# count as boilerplate
+MIN_REPEATS = 3
+
+PAGE_NUMBER_PATTERN = re.compile(
+    r"^[-–—]?\s*(?:(?:pagina|pag\.|p\.)\s*)?"
+    r"\d{1,4}(?:\s*(?:/|van)\s*\d{1,4})?\s*[-–—]?$",
+    re.IGNORECASE,
+)
+# "3.2 Wonen ........ 12", "Wonen … 12" or "Wonen      12"
+TOC_LINE_PATTERN = re.compile(r"^\S.{2,}?(?:\s*[.·…_]{3,}\s*|\s{3,})\d{1,4}$")
+TOC_HEADING_PATTERN = re.compile(r"^(?:inhoud|inhoudsopgave)$", re.IGNORECASE)
+# A page is a table of contents when at least this many and this share of its lines
+# are TOC lines
+TOC_MIN_LINES = 5
+TOC_MIN_SHARE = 0.4
+
+SPACE_PATTERN = re.compile(r"[ \t\u00a0]+")
+# Numbers that change from page to page in a running header or footer: at the start
+# or the end of the line, or in "pagina 3" and "3 van 40". A number inside a sentence
+# is left alone.
+PAGE_REFERENCE_PATTERN = re.compile(
+    r"^\d+\b|\b\d+$|(?<=pagina )\d+|\d+(?= van \d)|(?<=van )\d+"
+)
+# Words that follow an elision hyphen ("zorg- en onderwijs"), which must not be joined
+ELISION_WORDS = r"(?:en|of|tot|noch|als|dan)\b"
+# A word broken with a hyphen at the end of a line, continued in lower case on the next
+HYPHENATION_PATTERN = re.compile(rf"(\w)-\n(?!{ELISION_WORDS})(?=[a-zà-ÿ])")
+TRAILING_FRAGMENT_PATTERN = re.compile(r"(\w+)-$")
+ELISION_START_PATTERN = re.compile(ELISION_WORDS)
+
+
+@dataclass
+class NormalizationStats:
+    """What normalize_pages removed."""
+
+    pages: int = 0
+    boilerplate_lines: int = 0
+    page_numbers: int = 0
+    toc_lines: int = 0
+    hyphenations: int = 0
+
+
+def line_key(line: str) -> str:
+    """Compare lines case-insensitively, ignoring spacing and page references.
+
+    "Pagina 3" matches "Pagina 4", "In 2021 ..." doesn't match "In 2022 ...".
+    """
+    return PAGE_REFERENCE_PATTERN.sub("#", SPACE_PATTERN.sub(" ", line).lower())
+
+
+def page_lines(page: str) -> List[str]:
+    """Stripped lines of a page, without soft hyphens."""
+    return [line.strip() for line in page.replace("\u00ad", "").splitlines()]
+
+
+def edge_indexes(lines: List[str]) -> Set[int]:
+    """Indexes of the first and last EDGE_LINES filled lines (fewer on short pages)."""
+    filled = [i for i, line in enumerate(lines) if line]
+    count = min(EDGE_LINES, max(1, int(len(filled) * EDGE_SHARE)))
+    return set(filled[:count] + filled[-count:])
+
+
+def is_toc_page(lines: List[str]) -> bool:
+    filled = [line for line in lines if line]
+    toc_lines = sum(1 for line in filled if TOC_LINE_PATTERN.match(line))
+    return toc_lines >= TOC_MIN_LINES and toc_lines >= TOC_MIN_SHARE * len(filled)
+
+
+def join_lines(lines: List[str]) -> str:
+    """Join lines, keeping at most one empty line between paragraphs."""
+    text = re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+    return text.strip("\n")
+
+
+def normalize_pages(
+    pages: Iterable[str], stats: Optional[NormalizationStats] = None
+) -> Iterator[str]:
+    """Yield each page without boilerplate.
+
+    At most 2 * REPEAT_WINDOW + 1 pages are held in memory.
+    """
+    stats = stats if stats is not None else NormalizationStats()
+    # (lines, edge line indexes, keys of the edge lines) of the pages in the window
+    window: Deque[Tuple[List[str], Set[int], Set[str]]] = deque()
+    counts: Counter = Counter()
+    seen_boilerplate: Set[str] = set()
+    first = 0  # stream index of window[0]
+    next_page = 0  # stream index of the next page to yield
+    carry = ""  # start of a word hyphenated across the page break
+
+    def clean(lines: List[str], edges: Set[int], last: bool) -> str:
+        nonlocal carry
+        toc_page = is_toc_page(lines)
+        kept = []
+        for i, line in enumerate(lines):
+            if line and i in edges:
+                key = line_key(line)
+                if PAGE_NUMBER_PATTERN.match(line):
+                    stats.page_numbers += 1
+                    continue
+                if counts[key] >= MIN_REPEATS:
+                    if key in seen_boilerplate:
+                        stats.boilerplate_lines += 1
+                        continue
+                    seen_boilerplate.add(key)
+            toc_line = TOC_LINE_PATTERN.match(line) or TOC_HEADING_PATTERN.match(line)
+            if toc_page and line and toc_line:
+                stats.toc_lines += 1
+                continue
+            kept.append(SPACE_PATTERN.sub(" ", line))
+
+        text = join_lines(kept)
+        text, joined = HYPHENATION_PATTERN.subn(r"\1", text)
+        stats.hyphenations += joined
+        if carry:
+            if text[:1].islower() and not ELISION_START_PATTERN.match(text):
+                stats.hyphenations += 1
+                text = carry + text
+            else:
+                text = f"{carry}-\n{text}"
+            carry = ""
+        fragment = TRAILING_FRAGMENT_PATTERN.search(text)
+        if fragment and not last:
+            carry = fragment.group(1)
+            text = text[:fragment.start()].rstrip()
+        stats.pages += 1
+        return text
+
+    def emit(last: bool = False) -> str:
+        nonlocal next_page
+        lines, edges, _ = window[next_page - first]
+        next_page += 1
+        return clean(lines, edges, last)
+
+    for page in pages:
+        lines = page_lines(page)
+        edges = edge_indexes(lines)
+        keys = {line_key(lines[i]) for i in edges}
+        window.append((lines, edges, keys))
+        counts.update(keys)
+        # A page is cleaned once the REPEAT_WINDOW pages after it are known
+        while next_page + REPEAT_WINDOW < first + len(window):
+            yield emit()
+            while first < next_page - REPEAT_WINDOW:
+                counts.subtract(window.popleft()[2])
+                first += 1
+
+    while next_page < first + len(window):
+        yield emit(last=next_page == first + len(window) - 1)
@@ -0,0 +1,131 @@
+"""
+Persistent record of a summary run, so an interrupted run can be resumed.
+
+The journal is one small JSON file with, per party, the last stage it
+completed (extracted, requested, parsed, saved) and the error if it failed.
+It is rewritten atomically after every change, so it is never half written
+even when the process is killed.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+JOURNAL_FORMAT = 1
+# Stages of one party, in pipeline order
+STAGES = ("pending", "extracted", "requested", "parsed", "saved")
+
+# A party's stage, error and details such as the PDF's file name and hash
+Entry = Dict[str, Any]
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class RunJournal:
+    """Thread-safe per-party stage log backed by a JSON file."""
+
+    def __init__(
+        self,
+        path: Path,
+        parties: Optional[Dict[str, Entry]] = None,
+        started_at: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.parties: Dict[str, Entry] = parties or {}
+        self.started_at = started_at or now()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "RunJournal":
+        """The journal at path, or an empty one when there is none yet."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(path)
+        if data.get("format") != JOURNAL_FORMAT:
+            raise ValueError(
+                f"{path}: unsupported journal format {data.get('format')!r}"
+            )
+        return cls(path, data["parties"], data["started_at"])
+
+    @classmethod
+    def start(cls, path: Path, parties: Iterable[str]) -> "RunJournal":
+        """A fresh journal for a new run over the given parties."""
+        journal = cls(
+            path,
+            {party: {"stage": "pending", "updated_at": now()} for party in parties},
+        )
+        journal._write()
+        return journal
+
+    def finished(self, party: str, pdf_hash: str) -> bool:
+        """Whether the party was saved in this run from a PDF with the given hash."""
+        with self._lock:
+            entry = self.parties.get(party, {})
+            return (
+                entry.get("stage") == "saved"
+                and "error" not in entry
+                and entry.get("pdf") == pdf_hash
+            )
+
+    def record(self, party: str, stage: str, **details: object) -> None:
+        """Mark party as having completed stage; clears an earlier error."""
+        with self._lock:
+            entry = self.parties.setdefault(party, {})
+            entry.pop("error", None)
+            entry.update(details, stage=stage, updated_at=now())
+            self._write()
+
+    def fail(self, party: str, error: str) -> None:
+        """Mark party as failed after its last completed stage."""
+        with self._lock:
+            entry = self.parties.setdefault(party, {"stage": "pending"})
+            entry.update(error=error, updated_at=now())
+            self._write()
+
+    def unfinished(self) -> Dict[str, Entry]:
+        """Parties that were not saved, or failed, with their journal entries."""
+        with self._lock:
+            return {
+                party: dict(entry)
+                for party, entry in self.parties.items()
+                if entry.get("stage") != "saved" or "error" in entry
+            }
+
+    def _write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        data = {
+            "format": JOURNAL_FORMAT,
+            "started_at": self.started_at,
+            "updated_at": now(),
+            "parties": self.parties,
+        }
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class NullJournal(RunJournal):
+    """Stands in for a journal when none is kept."""
+
+    def __init__(self) -> None:
+        super().__init__(Path())
+
+    def finished(self, party: str, pdf_hash: str) -> bool:
+        return False
+
+    def record(self, party: str, stage: str, **details: object) -> None:
+        pass
+
+    def fail(self, party: str, error: str) -> None:
+        pass
+
+    def unfinished(self) -> Dict[str, Entry]:
+        return {}
@@ -0,0 +1,131 @@
+"""
+Per-party, per-stage measurements of a summary run.
+
+Every measurement is one JSON line in the report file, for example
+{"party": "VVD", "stage": "request", "seconds": 41.2, "prompt_tokens": 52000, ...},
+so runs can be compared and budgeted afterwards. The numeric values are also
+summed per party and stage for the table printed at the end of the run.
+"""
+
+import json
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+Totals = Dict[str, float]
+
+
+def ratio(numerator: float, denominator: float) -> Optional[float]:
+    return numerator / denominator if denominator else None
+
+
+Column = Tuple[str, Callable[[Totals], Optional[float]], int]
+
+# End-of-run table: heading, how to compute the cell from a party's totals, and decimals
+TABLE_COLUMNS: List[Column] = [
+    ("extract s", lambda t: t["extract.seconds"], 1),
+    ("pages/s", lambda t: ratio(t["extract.parsed_pages"], t["extract.seconds"]), 0),
+    ("saved tok", lambda t: t["normalize.tokens_saved"], 0),
+    ("requests", lambda t: t["request.count"], 0),
+    ("prompt tok", lambda t: t["request.prompt_tokens"], 0),
+    ("output tok", lambda t: t["request.completion_tokens"], 0),
+    ("LLM s", lambda t: t["request.seconds"], 1),
+    ("waited s", lambda t: t["request.rate_limit_wait"], 1),
+    ("retries", lambda t: t["request.retries"], 0),
+    ("written KB", lambda t: (t["request.bytes"] + t["save.bytes"]) / 1024, 1),
+    ("total s", lambda t: t["party.seconds"] if t["party.count"] else None, 1),
+]
+
+
+class RunReport:
+    """Thread-safe JSON-lines recorder with per-party totals."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        token_prices: Optional[Tuple[float, float]] = None,
+    ) -> None:
+        self.path = path
+        # USD per million prompt and completion tokens, to add a cost column
+        self.token_prices = token_prices
+        self.totals: Dict[str, Totals] = defaultdict(lambda: defaultdict(float))
+        self.estimated: Set[str] = set()
+        self._lock = threading.Lock()
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("", encoding='utf-8')
+
+    def record(self, party: str, stage: str, **values: object) -> None:
+        """Write one measurement and add its numbers to the party's totals."""
+        line: Dict[str, object] = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "party": party,
+            "stage": stage,
+        }
+        line.update(values)
+        with self._lock:
+            totals = self.totals[party]
+            totals[f"{stage}.count"] += 1
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    totals[f"{stage}.{key}"] += value
+            if values.get("estimated"):
+                self.estimated.add(party)
+            if self.path is not None:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    def table(self) -> str:
+        """Totals per party and for the whole run as a text table."""
+        with self._lock:
+            parties = {
+                party: dict(totals) for party, totals in sorted(self.totals.items())
+            }
+        if not parties:
+            return "No measurements"
+
+        run_totals: Totals = defaultdict(float)
+        for party_totals in parties.values():
+            for key, amount in party_totals.items():
+                run_totals[key] += amount
+
+        columns = list(TABLE_COLUMNS)
+        if self.token_prices:
+            prompt_price, completion_price = self.token_prices
+
+            def cost(t: Totals) -> float:
+                prompt = t["request.prompt_tokens"] * prompt_price
+                completion = t["request.completion_tokens"] * completion_price
+                return (prompt + completion) / 1e6
+
+            columns.append(("cost $", cost, 3))
+
+        rows = [["party"] + [heading for heading, _, _ in columns]]
+        for party, party_totals in list(parties.items()) + [("TOTAL", run_totals)]:
+            totals: Totals = defaultdict(float, party_totals)
+            # Token counts that were (partly) estimated rather than reported by the API
+            # are marked with ~
+            if party == "TOTAL":
+                estimated = bool(self.estimated)
+            else:
+                estimated = party in self.estimated
+            cells = [party]
+            for heading, cell, decimals in columns:
+                value = cell(totals)
+                text = "-" if value is None else f"{value:,.{decimals}f}"
+                cells.append("~" + text if estimated and "tok" in heading else text)
+            rows.append(cells)
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = [
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            )
+            for row in rows
+        ]
+        lines.insert(1, "-" * len(lines[0]))
+        lines.insert(len(lines) - 1, "-" * len(lines[0]))
+        return "\n".join(lines)
@@ -3,48 +3,44 @@ CLI script to process party programs and generate summaries.
 Run once to populate the database with AI-generated summaries.
 """
 
-import os
+import argparse
+import hashlib
 import json
+import os
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from multiprocessing import get_context
 from pathlib import Path
-from typing import Dict, List
-import argparse
-import PyPDF2
-from openai import OpenAI  # or your preferred AI library
-from dotenv import load_dotenv
+from typing import AbstractSet, Dict, List, Optional, Tuple
 
-# Import your existing models
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))  # Add backend dir to path
-try:
-    from main import Party
-except ImportError:
-    # Define a minimal Party class if import fails
-    class Party:
-        pass
+from chunking import estimate_tokens, split_into_chunks
+from llm_backends import (
+    Completion,
+    FakeBackend,
+    LLMBackend,
+    OpenAIBatchBackend,
+    OpenAIChatBackend,
+    RateLimiter,
+)
+from normalization import NORMALIZATION_VERSION, NormalizationStats, normalize_pages
+from run_journal import NullJournal, RunJournal
+from run_report import RunReport
 
-load_dotenv()
+# Pages per extraction task; each task reopens the PDF, so don't make this too small
+PAGES_PER_TASK = 16
+# Separates pages in the cached extracted text
+PAGE_SEPARATOR = "\f"
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+MODEL = "gpt-5-mini"
+# Extra chat completion parameters; part of the summary cache key
+MODEL_PARAMS: Dict[str, object] = {}
 
-def extract_pdf_text(pdf_path: Path) -> str:
-    """Extract text from PDF file."""
-    with open(pdf_path, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-    return text
-
-def summarize_with_ai(program_text: str, party_name: str) -> Dict[str, str]:
-    """Use AI to generate current_vision and future_vision summaries."""
-    
-    # Limit text to avoid API constraints (roughly 8000 tokens = ~32000 characters)
-    # max_chars = 30000
-    # if len(program_text) > max_chars:
-    #     program_text = program_text[:max_chars] + "...\n[Text truncated for API limits]"
-    
-    prompt = f"""
+PROMPT_TEMPLATE = """
     Analyseer het volgende partijprogramma van {party_name} en geef twee samenvattingen:
 
     1. "current_vision": Hoe deze partij Nederland NU ziet (problemen, uitdagingen, huidige staat)
@@ -66,30 +62,377 @@ def summarize_with_ai(program_text: str, party_name: str) -> Dict[str, str]:
         "future_vision": "...",
         "key_policies": ["..."]
     }}
+    """  # noqa: E501
+
+# Map step of the chunked mode: notes on one part of the program
+CHUNK_PROMPT_TEMPLATE = """
+    Hieronder staat een deel van het partijprogramma van {party_name}.
+    Maak beknopte, neutrale aantekeningen in het Nederlands over:
+    - Hoe de partij Nederland NU ziet (problemen, uitdagingen, huidige staat)
+    - Hun visie voor de TOEKOMST van Nederland (doelen, oplossingen, ambities)
+    - Concrete standpunten en maatregelen
+
+    Deel van het partijprogramma:
+        {chunk_text}
     """
+
+# Reduce step of the chunked mode: combine the notes into the final summary
+REDUCE_PROMPT_TEMPLATE = """
+    Hieronder staan aantekeningen over opeenvolgende delen van het partijprogramma van {party_name}.
+    Combineer ze tot twee samenvattingen:
+
+    1. "current_vision": Hoe deze partij Nederland NU ziet (problemen, uitdagingen, huidige staat)
+    2. "future_vision": Hun visie voor de TOEKOMST van Nederland (doelen, oplossingen, ambities)
+    3. "key_policies": De 5 kernpunten van de partij
+
+    Elke samenvatting moet:
+    - 1 pagina zijn (ongeveer 300 woorden)
+    - Neutraal en feitelijk zijn
+    - In de Nederlandse taal
+    - De kernpunten van de partij weergeven
+
+    Aantekeningen:
+        {chunk_summaries}
     
-    # Use your preferred AI service here - fixed model name
-    print(prompt)
-    response = client.chat.completions.create(
-        model="gpt-5-mini",  
-        messages=[{"role": "user", "content": prompt}]
-    )
-    
-    # Parse the JSON response with error handling
+    Geef je antwoord in dit JSON formaat:
+    {{
+        "current_vision": "...",
+        "future_vision": "...",
+        "key_policies": ["..."]
+    }}
+    """  # noqa: E501
+
+# Token budget per chunk in the chunked mode
+DEFAULT_CHUNK_TOKENS = 6000
+
+# Fields every parsed summary must have
+SUMMARY_FIELDS = ("current_vision", "future_vision", "key_policies")
+
+# Used when no journal is kept
+NULL_JOURNAL = NullJournal()
+
+# Shared by all worker threads, configured from the command line in main()
+llm_backend: Optional[LLMBackend] = None
+run_report = RunReport()
+
+
+def backend() -> LLMBackend:
+    """The LLM backend main() configured."""
+    if llm_backend is None:
+        raise RuntimeError("No LLM backend configured")
+    return llm_backend
+
+def extract_page_range(pdf_path: Path, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop); runs in an extraction process."""
+    import PyPDF2
+
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [
+            (reader.pages[i].extract_text() or "").replace(PAGE_SEPARATOR, "\n")
+            for i in range(start, stop)
+        ]
+
+def extraction_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool for PDF extraction.
+
+    Its workers start on the first submit, which comes from a party's worker thread
+    while other threads hold locks, so they are spawned rather than forked.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+
+def extracted_text_path(pdf_path: Path, pdf_hash: str) -> Path:
+    """Cache file for the extracted text, next to the PDF and keyed by its hash."""
+    return pdf_path.with_name(f"{pdf_path.name}.{pdf_hash[:16]}.txt")
+
+def extract_pdf_pages(
+    pdf_path: Path, pdf_hash: Optional[str] = None, executor: Optional[Executor] = None
+) -> List[str]:
+    """Extract the text of every page, reusing the cached text of an identical PDF."""
+    pdf_hash = pdf_hash or file_sha256(pdf_path)
+    cache_path = extracted_text_path(pdf_path, pdf_hash)
+    if cache_path.exists():
+        return cache_path.read_text(encoding='utf-8').split(PAGE_SEPARATOR)
+
+    import PyPDF2
+
+    with open(pdf_path, 'rb') as file:
+        page_count = len(PyPDF2.PdfReader(file).pages)
+    # Split large programs into page ranges so a single PDF also uses several cores
+    ranges = [
+        (start, min(start + PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+    if executor is None:
+        chunks = [extract_page_range(pdf_path, start, stop) for start, stop in ranges]
+    else:
+        futures = [
+            executor.submit(extract_page_range, pdf_path, start, stop)
+            for start, stop in ranges
+        ]
+        chunks = [future.result() for future in futures]
+    pages = [page for chunk in chunks for page in chunk]
+
+    for stale_path in pdf_path.parent.glob(f"{pdf_path.name}.*.txt"):
+        stale_path.unlink()
+    tmp_path = cache_path.with_suffix(".tmp")
+    tmp_path.write_text(PAGE_SEPARATOR.join(pages), encoding='utf-8')
+    os.replace(tmp_path, cache_path)
+    return pages
+
+def extract_pdf_text(
+    pdf_path: Path, pdf_hash: Optional[str] = None, executor: Optional[Executor] = None
+) -> str:
+    """Extract text from PDF file."""
+    return "\n".join(extract_pdf_pages(pdf_path, pdf_hash, executor))
+
+class SummaryParseError(ValueError):
+    """The AI response is not a summary in the expected JSON format."""
+
+def parse_summary(content: str, party_name: str) -> Dict[str, str]:
+    """Parse the JSON response; SummaryParseError when it is not a complete summary."""
     try:
-        return json.loads(response.choices[0].message.content)
+        summary: Dict[str, str] = json.loads(content)
     except json.JSONDecodeError as e:
-        print(f"Warning: Failed to parse AI response as JSON for {party_name}: {e}")
-        # Return fallback structure
-        return {
-            "current_vision": f"Kon geen samenvatting genereren voor {party_name} (JSON parse error)",
-            "future_vision": f"Kon geen toekomstvisie genereren voor {party_name} (JSON parse error)",
-            "key_policies": ["Kon geen kernpunten genereren voor {party_name} (JSON parse error)"]
+        raise SummaryParseError(
+            f"AI response for {party_name} is not valid JSON: {e}"
+        ) from e
+    missing = [
+        field
+        for field in SUMMARY_FIELDS
+        if not isinstance(summary, dict) or field not in summary
+    ]
+    if missing:
+        raise SummaryParseError(
+            f"AI response for {party_name} lacks {', '.join(missing)}"
+        )
+    return summary
 
-        }
+def response_path(cache_dir: Path, prompt: str) -> Path:
+    """Where the response to prompt is kept.
+
+    It streams into a .partial sibling until it is complete.
+    """
+    material = {"prompt": prompt, "model": backend().model, "params": MODEL_PARAMS}
+    key = hashlib.sha256(
+        json.dumps(material, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return cache_dir / "responses" / f"{key}.txt"
 
-def save_individual_json(party_name: str, summary: Dict[str, str], output_dir: Path):
-    """Save individual party summary as JSON file."""
+def record_request(
+    party_name: str,
+    description: str,
+    completion: Completion,
+    stored: bool,
+    **details: object,
+) -> None:
+    """Add one LLM request to the run report."""
+    run_report.record(
+        party_name,
+        "request",
+        description=description,
+        seconds=round(completion.seconds, 3),
+        rate_limit_wait=round(completion.rate_limit_wait, 3),
+        prompt_tokens=completion.prompt_tokens,
+        completion_tokens=completion.completion_tokens,
+        retries=completion.retries,
+        estimated=completion.estimated,
+        bytes=len(completion.text.encode("utf-8")) if stored else 0,
+        **details,
+    )
+
+def stored_completion(
+    prompt: str,
+    party_name: str,
+    description: str,
+    path: Optional[Path] = None,
+    force: bool = False,
+) -> str:
+    """Complete prompt, keeping the response at path.
+
+    A complete response at path is reused, a partial one is continued.
+
+    With force, a stored or partial response is discarded and the prompt is sent again.
+    """
+    if path is None:
+        completion = backend().complete(prompt, description)
+        record_request(party_name, description, completion, stored=False)
+        return completion.text
+    partial_path = path.with_suffix(".partial")
+    if force:
+        path.unlink(missing_ok=True)
+        partial_path.unlink(missing_ok=True)
+    elif path.exists():
+        return path.read_text(encoding='utf-8')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    resumed = partial_path.exists()
+    if resumed:
+        size = partial_path.stat().st_size
+        print(f"  {description}: continuing a partial response of {size} bytes")
+    completion = backend().complete(prompt, description, partial_path)
+    os.replace(partial_path, path)
+    record_request(party_name, description, completion, stored=True, resumed=resumed)
+    return completion.text
+
+def complete_summary(
+    prompt: str,
+    party_name: str,
+    description: str,
+    cache_dir: Optional[Path] = None,
+    force: bool = False,
+) -> Dict[str, str]:
+    """Request and parse a summary.
+
+    An unparsable response is discarded, so a rerun asks again.
+    """
+    path = response_path(cache_dir, prompt) if cache_dir else None
+    content = stored_completion(prompt, party_name, description, path, force)
+    try:
+        return parse_summary(content, party_name)
+    except SummaryParseError:
+        if path:
+            path.unlink(missing_ok=True)
+        raise
+
+def summarize_with_ai(
+    program_text: str,
+    party_name: str,
+    cache_dir: Optional[Path] = None,
+    force: bool = False,
+) -> Dict[str, str]:
+    """Use AI to generate current_vision and future_vision summaries."""
+    prompt = PROMPT_TEMPLATE.format(party_name=party_name, program_text=program_text)
+    return complete_summary(prompt, party_name, party_name, cache_dir, force)
+
+def summarize_chunk(
+    chunk: str,
+    party_name: str,
+    description: str,
+    cache_dir: Optional[Path] = None,
+    force: bool = False,
+) -> str:
+    """Map step: summarize one chunk.
+
+    A cached result for identical input is reused unless forced.
+    """
+    material = {
+        "chunk": chunk,
+        "party": party_name,
+        "prompt": CHUNK_PROMPT_TEMPLATE,
+        "model": backend().model,
+        "params": MODEL_PARAMS,
+    }
+    key = hashlib.sha256(
+        json.dumps(material, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    cache_path = cache_dir / "chunks" / f"{key}.txt" if cache_dir else None
+    prompt = CHUNK_PROMPT_TEMPLATE.format(party_name=party_name, chunk_text=chunk)
+    return stored_completion(prompt, party_name, description, cache_path, force)
+
+def summarize_chunked(
+    program_text: str,
+    party_name: str,
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+    chunk_concurrency: int = 4,
+    cache_dir: Optional[Path] = None,
+    force: bool = False,
+) -> Dict[str, str]:
+    """Map-reduce: summarize section-aligned chunks in parallel, then combine them."""
+    chunks = split_into_chunks(program_text, chunk_tokens)
+    print(
+        f"  {party_name}: summarizing {len(chunks)} chunks "
+        f"of at most ~{chunk_tokens} tokens"
+    )
+
+    with ThreadPoolExecutor(max_workers=max(chunk_concurrency, 1)) as executor:
+        futures = [
+            executor.submit(
+                summarize_chunk,
+                chunk,
+                party_name,
+                f"{party_name} chunk {i}/{len(chunks)}",
+                cache_dir,
+                force,
+            )
+            for i, chunk in enumerate(chunks, start=1)
+        ]
+        notes = [future.result() for future in futures]
+
+    chunk_summaries = "\n\n".join(
+        f"Deel {i}:\n{note}" for i, note in enumerate(notes, start=1)
+    )
+    prompt = REDUCE_PROMPT_TEMPLATE.format(
+        party_name=party_name, chunk_summaries=chunk_summaries
+    )
+    return complete_summary(
+        prompt, party_name, f"{party_name} reduce", cache_dir, force
+    )
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def summary_cache_key(
+    pdf_hash: str,
+    party_name: str,
+    chunk_tokens: Optional[int] = None,
+    normalize: bool = True,
+) -> str:
+    """Content address of a summary: everything that influences the AI output."""
+    material: Dict[str, object] = {
+        "pdf": pdf_hash,
+        "party": party_name,
+        "prompt": PROMPT_TEMPLATE,
+        "model": backend().model,
+        "params": MODEL_PARAMS,
+    }
+    if normalize:
+        material.update(normalization=NORMALIZATION_VERSION)
+    if chunk_tokens:
+        material.update(
+            chunk_tokens=chunk_tokens,
+            chunk_prompt=CHUNK_PROMPT_TEMPLATE,
+            reduce_prompt=REDUCE_PROMPT_TEMPLATE,
+        )
+    return hashlib.sha256(
+        json.dumps(material, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+def load_cached_summary(cache_dir: Path, key: str) -> Optional[Dict[str, str]]:
+    """Return a cached summary, or None when there is no (readable) entry."""
+    try:
+        with open(cache_dir / f"{key}.json", 'r', encoding='utf-8') as f:
+            summary: Dict[str, str] = json.load(f)["summary"]
+            return summary
+    except (OSError, json.JSONDecodeError, KeyError):
+        return None
+
+def store_cached_summary(
+    cache_dir: Path, key: str, party_name: str, summary: Dict[str, str]
+) -> int:
+    """Atomically store a summary under its content address; return bytes written."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / f"{key}.json.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(
+            {"party": party_name, "model": backend().model, "summary": summary},
+            f,
+            indent=2,
+            ensure_ascii=False,
+        )
+    size = tmp_path.stat().st_size
+    os.replace(tmp_path, cache_dir / f"{key}.json")
+    return size
+
+def save_individual_json(
+    party_name: str, summary: Dict[str, str], output_dir: Path
+) -> int:
+    """Save individual party summary as JSON file; returns the bytes written."""
     output_dir.mkdir(exist_ok=True)
     json_filename = f"{party_name.lower()}_summary.json"
     json_path = output_dir / json_filename
@@ -98,9 +441,325 @@ def save_individual_json(party_name: str, summary: Dict[str, str], output_dir: P
         json.dump({party_name: summary}, f, indent=2, ensure_ascii=False)
     
     print(f"  Saved individual JSON: {json_path}")
+    return json_path.stat().st_size
+
+def load_saved_summary(party_name: str, output_dir: Path) -> Optional[Dict[str, str]]:
+    """The summary save_individual_json wrote for a party, or None."""
+    path = output_dir / f"{party_name.lower()}_summary.json"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            summary: Dict[str, str] = json.load(f)[party_name]
+            return summary
+    except (OSError, json.JSONDecodeError, KeyError):
+        return None
+
+def party_name_from_file(pdf_file: Path) -> str:
+    """Extract party name from filename - handle different formats."""
+    return pdf_file.stem.split('-')[0].upper()  # e.g., "vvd-2025.pdf" -> "VVD"
+
+def normalize_program(party_name: str, pages: List[str], raw_text: str) -> str:
+    """Strip boilerplate from the extracted pages and report the tokens that saved."""
+    stats = NormalizationStats()
+    start = time.perf_counter()
+    program_text = "\n".join(normalize_pages(pages, stats))
+    seconds = time.perf_counter() - start
+    tokens_before = estimate_tokens(raw_text)
+    tokens_after = estimate_tokens(program_text)
+    run_report.record(
+        party_name,
+        "normalize",
+        seconds=round(seconds, 3),
+        tokens_before=tokens_before,
+        tokens_after=tokens_after,
+        tokens_saved=tokens_before - tokens_after,
+        boilerplate_lines=stats.boilerplate_lines,
+        page_numbers=stats.page_numbers,
+        toc_lines=stats.toc_lines,
+        hyphenations=stats.hyphenations,
+    )
+    print(
+        f"  {party_name}: normalized text saves ~{tokens_before - tokens_after} "
+        f"of ~{tokens_before} tokens ({stats.boilerplate_lines} header/footer, "
+        f"{stats.page_numbers} page number and {stats.toc_lines} contents lines "
+        "removed)"
+    )
+    return program_text
+
+def load_cached_or_extract(
+    pdf_file: Path,
+    cache_dir: Optional[Path] = None,
+    force: bool = False,
+    extract_executor: Optional[Executor] = None,
+    chunk_tokens: Optional[int] = None,
+    journal: RunJournal = NULL_JOURNAL,
+    normalize: bool = True,
+) -> Tuple[Optional[str], Optional[Dict[str, str]], Optional[str]]:
+    """(cache key, cached summary, None) for an unchanged program.
+
+    Otherwise the program's text is extracted and (cache key, None, program text)
+    returned.
+    """
+    party_name = party_name_from_file(pdf_file)
+    pdf_hash = file_sha256(pdf_file)
+    cache_key = None
+    if cache_dir:
+        cache_key = summary_cache_key(pdf_hash, party_name, chunk_tokens, normalize)
+        summary = None if force else load_cached_summary(cache_dir, cache_key)
+        if summary is not None:
+            print(f"✓ {party_name} unchanged, using cached summary {cache_key[:12]}")
+            journal.record(party_name, "parsed", file=pdf_file.name, pdf=pdf_hash)
+            return cache_key, summary, None
 
-def process_programs(programs_dir: Path, specific_files: List[str] = None) -> Dict[str, Dict[str, str]]:
-    """Process PDF programs - either all in directory or specific files."""
+    print(f"Processing {party_name} ({pdf_file.name})...")
+
+    cached_text = extracted_text_path(pdf_file, pdf_hash).exists()
+    start = time.perf_counter()
+    pages = extract_pdf_pages(pdf_file, pdf_hash, extract_executor)
+    seconds = time.perf_counter() - start
+    program_text = "\n".join(pages)
+    run_report.record(
+        party_name,
+        "extract",
+        seconds=round(seconds, 3),
+        pages=len(pages),
+        # Pages actually parsed by PyPDF2 rather than read from the extracted text cache
+        parsed_pages=0 if cached_text else len(pages),
+        pages_per_second=(
+            round(len(pages) / seconds, 1) if seconds and not cached_text else None
+        ),
+        characters=len(program_text),
+        cached=cached_text,
+    )
+    print(
+        f"  {party_name}: extracted {len(program_text)} characters "
+        f"from {len(pages)} pages in {seconds:.1f}s"
+    )
+    if normalize:
+        program_text = normalize_program(party_name, pages, program_text)
+    journal.record(party_name, "extracted", file=pdf_file.name, pdf=pdf_hash)
+    return cache_key, None, program_text
+
+def finish_program(
+    party_name: str,
+    summary: Dict[str, str],
+    json_output_dir: Path,
+    cache_dir: Optional[Path] = None,
+    cache_key: Optional[str] = None,
+    journal: RunJournal = NULL_JOURNAL,
+) -> None:
+    """Cache a freshly generated summary and save it to the database."""
+    journal.record(party_name, "parsed")
+    start = time.perf_counter()
+    written = 0
+    if cache_dir and cache_key:
+        written = store_cached_summary(cache_dir, cache_key, party_name, summary)
+
+    # Save individual JSON immediately after processing
+    written += save_individual_json(party_name, summary, json_output_dir)
+    run_report.record(
+        party_name,
+        "save",
+        seconds=round(time.perf_counter() - start, 3),
+        bytes=written,
+    )
+    journal.record(party_name, "saved")
+
+    print(f"✓ Generated summary for {party_name}")
+    print(f"  Current vision: {summary['current_vision'][:100]}...")
+    print(f"  Future vision: {summary['future_vision'][:100]}...")
+
+def process_program(
+    pdf_file: Path,
+    json_output_dir: Path,
+    cache_dir: Optional[Path] = None,
+    force: bool = False,
+    extract_executor: Optional[Executor] = None,
+    chunk_tokens: Optional[int] = None,
+    chunk_concurrency: int = 4,
+    journal: RunJournal = NULL_JOURNAL,
+    normalize: bool = True,
+) -> Dict[str, str]:
+    """Extract, summarize and save a single party program.
+
+    Failures are recorded in the journal.
+    """
+    party_name = party_name_from_file(pdf_file)
+    start = time.perf_counter()
+    status = "failed"
+    try:
+        cache_key, summary, program_text = load_cached_or_extract(
+            pdf_file,
+            cache_dir,
+            force,
+            extract_executor,
+            chunk_tokens,
+            journal,
+            normalize,
+        )
+        if summary is not None:
+            written = save_individual_json(party_name, summary, json_output_dir)
+            run_report.record(party_name, "save", bytes=written)
+            journal.record(party_name, "saved")
+            status = "cached"
+            return summary
+        # Without a cached summary, load_cached_or_extract returns the program text
+        assert program_text is not None
+
+        journal.record(party_name, "requested")
+        if chunk_tokens:
+            summary = summarize_chunked(
+                program_text,
+                party_name,
+                chunk_tokens=chunk_tokens,
+                chunk_concurrency=chunk_concurrency,
+                cache_dir=cache_dir,
+                force=force,
+            )
+        else:
+            summary = summarize_with_ai(program_text, party_name, cache_dir, force)
+
+        finish_program(
+            party_name, summary, json_output_dir, cache_dir, cache_key, journal
+        )
+        status = "generated"
+        return summary
+    except Exception as e:
+        journal.fail(party_name, str(e))
+        raise
+    finally:
+        run_report.record(
+            party_name,
+            "party",
+            seconds=round(time.perf_counter() - start, 3),
+            status=status,
+        )
+
+
+def process_programs_batch(
+    pdf_files: List[Path],
+    json_output_dir: Path,
+    cache_dir: Optional[Path] = None,
+    forced: AbstractSet[str] = frozenset(),
+    extract_workers: Optional[int] = None,
+    journal: RunJournal = NULL_JOURNAL,
+    normalize: bool = True,
+) -> Dict[str, Dict[str, str]]:
+    """Submit every uncached program as one batch job.
+
+    The results are fanned out to the database.
+    """
+    summaries = {}
+    prompts = {}
+    cache_keys: Dict[str, Optional[str]] = {}
+    response_paths: Dict[str, Optional[Path]] = {}
+    responses = {}
+
+    with extraction_pool(extract_workers) as extract_executor:
+        for pdf_file in pdf_files:
+            party_name = party_name_from_file(pdf_file)
+            try:
+                cache_key, summary, program_text = load_cached_or_extract(
+                    pdf_file,
+                    cache_dir,
+                    party_name in forced,
+                    extract_executor,
+                    journal=journal,
+                    normalize=normalize,
+                )
+            except Exception as e:
+                print(f"✗ Error processing {party_name}: {e}")
+                journal.fail(party_name, str(e))
+                continue
+            if summary is not None:
+                written = save_individual_json(party_name, summary, json_output_dir)
+                run_report.record(party_name, "save", bytes=written)
+                journal.record(party_name, "saved")
+                summaries[party_name] = summary
+                continue
+            prompt = PROMPT_TEMPLATE.format(
+                party_name=party_name, program_text=program_text
+            )
+            cache_keys[party_name] = cache_key
+            path = response_path(cache_dir, prompt) if cache_dir else None
+            response_paths[party_name] = path
+            # A response downloaded by an earlier, interrupted run doesn't need a new
+            # batch, unless forced
+            if path and path.exists() and party_name not in forced:
+                responses[party_name] = path.read_text(encoding='utf-8')
+            else:
+                prompts[party_name] = prompt
+
+    if prompts:
+        print(f"Submitting {len(prompts)} parties as one batch job...")
+        for party_name in prompts:
+            journal.record(party_name, "requested")
+        missing = "no result in batch"
+        try:
+            completions = backend().complete_many(prompts)
+        except Exception as e:
+            # Keep going, so the journal and the report cover every party
+            print(f"✗ Batch job failed: {e}")
+            completions = {}
+            missing = f"batch job failed: {e}"
+        for party_name, completion in completions.items():
+            content = responses[party_name] = completion.text
+            path = response_paths[party_name]
+            if path:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_text(content, encoding='utf-8')
+                os.replace(tmp_path, path)
+            record_request(party_name, "batch", completion, stored=path is not None)
+        for party_name in prompts.keys() - responses.keys():
+            print(f"✗ Error processing {party_name}: {missing}")
+            journal.fail(party_name, missing)
+
+    for party_name, content in responses.items():
+        try:
+            summary = parse_summary(content, party_name)
+        except SummaryParseError as e:
+            print(f"✗ Error processing {party_name}: {e}")
+            journal.fail(party_name, str(e))
+            path = response_paths[party_name]
+            if path:
+                path.unlink(missing_ok=True)
+            continue
+        finish_program(
+            party_name,
+            summary,
+            json_output_dir,
+            cache_dir,
+            cache_keys[party_name],
+            journal,
+        )
+        summaries[party_name] = summary
+
+    return summaries
+
+
+def process_programs(
+    programs_dir: Path,
+    specific_files: Optional[List[str]] = None,
+    concurrency: int = 1,
+    cache_dir: Optional[Path] = None,
+    force: Optional[List[str]] = None,
+    extract_workers: Optional[int] = None,
+    chunk_tokens: Optional[int] = None,
+    chunk_concurrency: int = 4,
+    journal_path: Optional[Path] = None,
+    resume: bool = False,
+    normalize: bool = True,
+) -> Dict[str, Dict[str, str]]:
+    """Process PDF programs - either all in directory or specific files.
+
+    Summaries are cached in cache_dir by content; force lists the parties to
+    regenerate anyway (an empty list forces all, None forces none). With
+    chunk_tokens set, programs are summarized map-reduce style in chunks.
+    The stage each party reached is kept in the journal at journal_path; with
+    resume, parties the journal lists as saved from an unchanged PDF are
+    skipped.
+    Unless normalize is False, PDF boilerplate is stripped before prompting.
+    """
     summaries = {}
     
     # Create output directory for individual JSON files
@@ -108,42 +767,98 @@ def process_programs(programs_dir: Path, specific_files: List[str] = None) -> Di
     
     if specific_files:
         # Process only specified files
-        pdf_files = [programs_dir / filename for filename in specific_files]
-        # Verify files exist
-        for pdf_file in pdf_files:
-            if not pdf_file.exists():
+        pdf_files = []
+        for filename in specific_files:
+            pdf_file = programs_dir / filename
+            # Verify files exist
+            if pdf_file.exists():
+                pdf_files.append(pdf_file)
+            else:
                 print(f"Warning: File {pdf_file} does not exist, skipping...")
-                pdf_files.remove(pdf_file)
     else:
         # Process all PDF files in directory (original behavior)
         pdf_files = list(programs_dir.glob("*.pdf"))
     
-    for pdf_file in pdf_files:
-        # Extract party name from filename - handle different formats
-        party_name = pdf_file.stem.split('-')[0].upper()  # e.g., "vvd-2025.pdf" -> "VVD"
-        
-        print(f"Processing {party_name} ({pdf_file.name})...")
-        
-        try:
-            program_text = extract_pdf_text(pdf_file)
-            print(f"  Extracted {len(program_text)} characters from PDF")
-            
-            summary = summarize_with_ai(program_text, party_name)
-            summaries[party_name] = summary
-            
-            # Save individual JSON immediately after processing
-            save_individual_json(party_name, summary, json_output_dir)
-            
-            print(f"✓ Generated summary for {party_name}")
-            print(f"  Current vision: {summary['current_vision'][:100]}...")
-            print(f"  Future vision: {summary['future_vision'][:100]}...")
-            
-        except Exception as e:
-            print(f"✗ Error processing {party_name}: {e}")
-            
+    # None forces nothing, an empty list forces every party
+    forced: AbstractSet[str]
+    if force is None:
+        forced = set()
+    else:
+        forced = {name.upper() for name in force} or {
+            party_name_from_file(pdf_file) for pdf_file in pdf_files
+        }
+
+    journal: RunJournal
+    if journal_path is None:
+        journal = NULL_JOURNAL
+    elif resume:
+        journal = RunJournal.load(journal_path)
+        remaining = []
+        for pdf_file in pdf_files:
+            party_name = party_name_from_file(pdf_file)
+            summary = None
+            finished = journal.finished(party_name, file_sha256(pdf_file))
+            if party_name not in forced and finished:
+                summary = load_saved_summary(party_name, json_output_dir)
+            if summary is not None:
+                print(f"✓ {party_name} already saved by the resumed run")
+                summaries[party_name] = summary
+            else:
+                remaining.append(pdf_file)
+        pdf_files = remaining
+    else:
+        journal = RunJournal.start(
+            journal_path, [party_name_from_file(pdf_file) for pdf_file in pdf_files]
+        )
+
+    if backend().batch:
+        summaries.update(
+            process_programs_batch(
+                pdf_files,
+                json_output_dir,
+                cache_dir,
+                forced,
+                extract_workers,
+                journal,
+                normalize,
+            )
+        )
+    else:
+        # Each party is independent, so run up to `concurrency` of them at the same
+        # time; the CPU-bound PDF parsing is handed to a shared process pool
+        with extraction_pool(extract_workers) as extract_executor, \
+                ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            futures = {
+                executor.submit(
+                    process_program,
+                    pdf_file,
+                    json_output_dir,
+                    cache_dir,
+                    party_name_from_file(pdf_file) in forced,
+                    extract_executor,
+                    chunk_tokens,
+                    chunk_concurrency,
+                    journal,
+                    normalize,
+                ): pdf_file
+                for pdf_file in pdf_files
+            }
+            for future in as_completed(futures):
+                party_name = party_name_from_file(futures[future])
+                try:
+                    summaries[party_name] = future.result()
+                except Exception as e:
+                    print(f"✗ Error processing {party_name}: {e}")
+
+    unfinished = journal.unfinished()
+    if unfinished:
+        print(
+            f"{len(unfinished)} parties unfinished ({', '.join(sorted(unfinished))}), "
+            "continue them with --resume"
+        )
     return summaries
 
-def save_to_database(summaries: Dict[str, Dict[str, str]]):
+def save_to_database(summaries: Dict[str, Dict[str, str]]) -> None:
     """Update the party data in your database/main.py with AI summaries."""
     # TODO: Implement database saving logic
     # For now, we'll save to JSON as backup
@@ -156,39 +871,226 @@ def save_to_database(summaries: Dict[str, Dict[str, str]]):
     
     print(f"Summaries saved to {output_file}")
 
-def main():
+def main() -> None:
     # TEST FILES - modify this list to test specific files
     TEST_FILES = ["denk.pdf"]  # Add/remove files here for testing
     # TEST_FILES = [
-    #     "bbb.pdf", "cda.pdf", "cu.pdf", "d66.pdf", "denk23.pdf", "fvd.pdf", "gl-pvda.pdf", "ja21.pdf", "nsc.pdf", "pvdd.pdf", "pvv.pdf", "sgp.pdf", "sp.pdf"
-    #     "volt.pdf", "vvd.pdf"
+    #     "bbb.pdf", "cda.pdf", "cu.pdf", "d66.pdf", "denk23.pdf", "fvd.pdf",
+    #     "gl-pvda.pdf", "ja21.pdf", "nsc.pdf", "pvdd.pdf", "pvv.pdf", "sgp.pdf",
+    #     "sp.pdf", "volt.pdf", "vvd.pdf"
     # ]
-    parser = argparse.ArgumentParser(description="Generate AI summaries from party programs")
-    parser.add_argument("--programs-dir", default="summaries/programs", help="Directory containing PDF files")
-    parser.add_argument("--files", nargs="+", help="Specific PDF files to process (instead of all files)")
-    parser.add_argument("--test", action="store_true", help="Use predefined test file list")
+    parser = argparse.ArgumentParser(
+        description="Generate AI summaries from party programs"
+    )
+    parser.add_argument(
+        "--programs-dir",
+        default="summaries/programs",
+        help="Directory containing PDF files",
+    )
+    parser.add_argument(
+        "--files",
+        nargs="+",
+        help="Specific PDF files to process (instead of all files)",
+    )
+    parser.add_argument(
+        "--test", action="store_true", help="Use predefined test file list"
+    )
     parser.add_argument("--dry-run", action="store_true", help="Don't save to database")
+    parser.add_argument(
+        "--backend",
+        choices=["openai", "batch", "fake"],
+        default="openai",
+        help=(
+            "LLM backend: synchronous chat calls, one Batch API job, "
+            "or an offline fake"
+        ),
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=0.0,
+        help="Seconds per request of the fake backend",
+    )
+    parser.add_argument(
+        "--batch-poll-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between batch status checks",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of parties to process in parallel",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=30,
+        help="Maximum LLM requests per minute",
+    )
+    parser.add_argument(
+        "--tokens-per-minute",
+        type=float,
+        help="Maximum (estimated) prompt tokens per minute",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=5,
+        help="Retries per request on transient API errors",
+    )
+    parser.add_argument(
+        "--extract-workers",
+        type=int,
+        help="Processes for PDF text extraction (default: CPU count)",
+    )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="Summarize long programs map-reduce style in chunks",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=DEFAULT_CHUNK_TOKENS,
+        help="Token budget per chunk in --chunked mode",
+    )
+    parser.add_argument(
+        "--chunk-concurrency",
+        type=int,
+        default=4,
+        help="Chunks per party summarized in parallel",
+    )
+    parser.add_argument(
+        "--no-normalize",
+        action="store_true",
+        help=(
+            "Send the extracted text as is, with headers, footers, page numbers "
+            "and contents"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default="summaries/cache",
+        help="Directory of content-addressed summaries",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Don't read or write the summary cache"
+    )
+    parser.add_argument(
+        "--force",
+        nargs="*",
+        metavar="PARTY",
+        help="Regenerate these parties (all when none given) even if cached",
+    )
+    parser.add_argument(
+        "--journal",
+        help="Run journal file (default: journal.json in the cache directory)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Only process the parties the last run did not finish",
+    )
+    parser.add_argument(
+        "--report",
+        help=(
+            "JSON-lines report of every stage "
+            "(default: reports/<time>-<pid>.jsonl in the cache directory)"
+        ),
+    )
+    parser.add_argument(
+        "--token-prices",
+        nargs=2,
+        type=float,
+        metavar=("PROMPT", "COMPLETION"),
+        help=(
+            "USD per million prompt and completion tokens, "
+            "adds a cost column to the report table"
+        ),
+    )
     
     args = parser.parse_args()
+
+    if args.backend == "batch" and args.chunked:
+        parser.error("--chunked is not supported with the batch backend")
+    journal_path: Optional[Path]
+    if args.journal:
+        journal_path = Path(args.journal)
+    else:
+        journal_path = None if args.no_cache else Path(args.cache_dir) / "journal.json"
+    if args.resume and journal_path is None:
+        parser.error("--resume needs a journal; pass --journal when using --no-cache")
+    if args.report:
+        report_path = Path(args.report)
+    elif args.no_cache:
+        report_path = None
+    else:
+        # The pid keeps runs started in the same second from sharing (and truncating)
+        # a report
+        report_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl"
+        report_path = Path(args.cache_dir) / "reports" / report_name
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    global llm_backend, run_report
+    token_prices = tuple(args.token_prices) if args.token_prices else None
+    run_report = RunReport(report_path, token_prices)
+    if args.backend == "fake":
+        llm_backend = FakeBackend(latency=args.fake_latency)
+    elif args.backend == "batch":
+        llm_backend = OpenAIBatchBackend(
+            MODEL,
+            MODEL_PARAMS,
+            poll_interval=args.batch_poll_interval,
+            max_retries=args.max_retries,
+        )
+    else:
+        llm_backend = OpenAIChatBackend(
+            MODEL,
+            MODEL_PARAMS,
+            rate_limiter=RateLimiter(args.requests_per_minute, args.tokens_per_minute),
+            max_retries=args.max_retries,
+        )
+
+    options = {
+        "concurrency": args.concurrency,
+        "cache_dir": None if args.no_cache else Path(args.cache_dir),
+        "force": args.force,
+        "extract_workers": args.extract_workers,
+        "chunk_tokens": args.chunk_tokens if args.chunked else None,
+        "chunk_concurrency": args.chunk_concurrency,
+        "journal_path": journal_path,
+        "resume": args.resume,
+        "normalize": not args.no_normalize,
+    }
     
     programs_dir = Path(args.programs_dir)
     if not programs_dir.exists():
         print(f"Programs directory {programs_dir} does not exist!")
         return
     
+    start = time.perf_counter()
     if args.test:
         print(f"Processing test files: {TEST_FILES}")
         print(f"From directory: {programs_dir}")
-        summaries = process_programs(programs_dir, TEST_FILES)
+        summaries = process_programs(programs_dir, TEST_FILES, **options)
     elif args.files:
         print(f"Processing specific files: {args.files}")
         print(f"From directory: {programs_dir}")
-        summaries = process_programs(programs_dir, args.files)
+        summaries = process_programs(programs_dir, args.files, **options)
     else:
         print(f"Processing all programs from {programs_dir}")
-        summaries = process_programs(programs_dir)
+        summaries = process_programs(programs_dir, **options)
     
-    print(f"\nProcessed {len(summaries)} parties successfully")
+    seconds = time.perf_counter() - start
+    print(f"\nProcessed {len(summaries)} parties successfully in {seconds:.1f}s")
+    print(run_report.table())
+    if report_path is not None:
+        print(f"Stage report: {report_path}")
     
     if not args.dry_run:
         save_to_database(summaries)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The summary scripts import each other as top-level modules (they run from summaries/)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "summaries"))
@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+import matching
+from matching import PositionMatrix, PositionsError
+
+PARTY_IDS = {"GL": 1, "VVD": 2}
+
+POSITIONS = {
+    "format": 1,
+    "statements": [
+        {"id": "huur", "text": "De huren worden bevroren."},
+        {"id": "kernenergie", "text": "Nederland bouwt kerncentrales.", "weight": 2},
+        {"id": "defensie", "text": "Defensie krijgt meer geld."},
+    ],
+    "positions": {"GL": [1, -1, None], "VVD": [-1, 1, 0.5]},
+}
+
+
+def load(tmp_path: Path, data: dict) -> PositionMatrix:
+    path = tmp_path / "positions.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return PositionMatrix.load(str(path), PARTY_IDS)
+
+
+def test_match_weighs_shared_statements(tmp_path: Path) -> None:
+    matrix = load(tmp_path, POSITIONS)
+    assert matrix.party_ids == (1, 2)
+
+    # GL took no stance on defensie, so only huur and kernenergie count for it
+    assert matrix.match([[1, -1, 1]]) == [[100.0, 18.8]]
+    assert matrix.match([[1, None, 1]]) == [[100.0, 37.5]]
+    # Nothing in common with any party
+    assert matrix.match([[None, None, None]]) == [[None, None]]
+
+
+def test_match_applies_importance(tmp_path: Path) -> None:
+    matrix = load(tmp_path, POSITIONS)
+
+    assert matrix.match([[1, -1, 1]], importance=[1, 0, 1]) == [[100.0, 37.5]]
+    assert matrix.match([[1, -1, 1]], importance=[0, 0, 0]) == [[None, None]]
+
+
+def test_bulk_scores_match_single_scores(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    matrix = load(tmp_path, POSITIONS)
+    answer_sets: List[List[Optional[float]]] = [
+        [1, -1, 1],
+        [0, 0.5, None],
+        [-1, 1, 0.5],
+        [None, 1, -1],
+        [1, 1, 1],
+    ]
+    monkeypatch.setattr(matching, "SCORE_BLOCK_ROWS", 2)
+
+    assert matrix.match(answer_sets) == [
+        row for answers in answer_sets for row in matrix.match([answers])
+    ]
+
+
+def test_invalid_answers_are_rejected(tmp_path: Path) -> None:
+    matrix = load(tmp_path, POSITIONS)
+
+    with pytest.raises(PositionsError, match="Expected 3 answers"):
+        matrix.match([[1, -1]])
+    with pytest.raises(PositionsError, match="between -1 and 1"):
+        matrix.match([[1, -1, 2]])
+    with pytest.raises(PositionsError, match="must not be negative"):
+        matrix.match([[1, -1, 1]], importance=[1, -1, 1])
+
+
+def test_load_reports_every_problem(tmp_path: Path) -> None:
+    data = {**POSITIONS, "positions": {"GL": [1, -1], "CDA": [0, 0, 0]}}
+
+    with pytest.raises(PositionsError) as error:
+        load(tmp_path, data)
+    assert "positions['GL']: expected 3 values" in str(error.value)
+    assert "unknown party key 'CDA'" in str(error.value)
@@ -0,0 +1,80 @@
+from typing import List
+
+from normalization import NormalizationStats, line_key, normalize_pages
+
+# A program page as PyPDF2 extracts it: running header, chapter title, body text
+# broken over lines (with hyphenated words) and a footer with the page number
+PROGRAM_PAGE = """\
+Verkiezingsprogramma 2025-2029
+Hoofdstuk 3  Wonen en zorg
+In {year} stijgen de huren in de vrije sector opnieuw harder dan de lonen.
+Daarom bouwen we de komende vier jaar 100.000 betaalbare huurwo-
+ningen per jaar en maken we van de woningmarkt weer een markt voor
+iedereen. Gemeenten krijgen meer ruimte voor zorg-
+en onderwijsvoorzieningen in nieuwe wijken.
+Samen bouwen aan Nederland | {page}
+"""
+
+
+def program_pages(count: int, first_page: int = 12) -> List[str]:
+    return [
+        PROGRAM_PAGE.format(year=2020 + i, page=first_page + i) for i in range(count)
+    ]
+
+
+def normalize(pages: List[str]) -> List[str]:
+    return list(normalize_pages(pages, NormalizationStats()))
+
+
+def test_running_header_and_footer_are_kept_once() -> None:
+    stats = NormalizationStats()
+    pages = list(normalize_pages(program_pages(6), stats))
+
+    assert pages[0].startswith("Verkiezingsprogramma 2025-2029\n")
+    assert pages[0].endswith("Samen bouwen aan Nederland | 12")
+    for page in pages[1:]:
+        assert "Verkiezingsprogramma" not in page
+        assert "Samen bouwen" not in page
+    assert stats.boilerplate_lines > 0
+
+
+def test_sentences_that_differ_only_in_a_number_are_body_text() -> None:
+    pages = normalize(program_pages(6))
+
+    for i, page in enumerate(pages):
+        assert f"In {2020 + i} stijgen de huren" in page
+    assert line_key("In 2021 stijgen de huren") != line_key("In 2022 stijgen de huren")
+    assert line_key("Pagina 3") == line_key("Pagina 4")
+    assert line_key("3 van 40") == line_key("4 van 40")
+
+
+def test_hyphenated_words_are_joined_but_elisions_kept() -> None:
+    page = normalize(program_pages(1))[0]
+
+    assert "huurwoningen" in page
+    assert "zorg-\nen onderwijsvoorzieningen" in page
+
+
+def test_word_hyphenated_across_pages_is_joined() -> None:
+    pages = normalize(
+        ["De betaalbare huur-", "woning blijft ons doel.", "Zorg-", "en onderwijs."]
+    )
+
+    assert pages[0] == "De betaalbare"
+    assert pages[1] == "huurwoning blijft ons doel."
+    assert pages[3] == "Zorg-\nen onderwijs."
+
+
+def test_short_pages_keep_their_body() -> None:
+    short = "Verkiezingsprogramma 2025-2029\n{body}\nSamen bouwen aan Nederland | {i}"
+    bodies = [
+        "Wij investeren in de zorg.",
+        "Wij investeren in het onderwijs.",
+        "Wij investeren in de zorg.",
+        "Wij investeren in veiligheid.",
+        "Wij investeren in de zorg.",
+    ]
+    pages = normalize([short.format(body=body, i=i) for i, body in enumerate(bodies)])
+
+    for body, page in zip(bodies, pages):
+        assert body in page
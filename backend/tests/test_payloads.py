@@ -0,0 +1,71 @@
+import gzip
+
+import brotli
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from payloads import EncodedPayload, choose_encoding, etag_matches, payload_response
+
+PARTIES = [{"id": 1, "name": "D66", "key_policies": ["Onderwijs", "Klimaat"]}]
+PAYLOAD = EncodedPayload.from_data(PARTIES)
+
+app = FastAPI()
+
+
+@app.get("/parties")
+def get_parties(request: Request) -> Response:
+    return payload_response(request, PAYLOAD)
+
+
+client = TestClient(app)
+
+
+def test_encodings_decode_to_the_body() -> None:
+    assert gzip.decompress(PAYLOAD.gzip) == PAYLOAD.body
+    assert PAYLOAD.br is not None
+    assert brotli.decompress(PAYLOAD.br) == PAYLOAD.body
+    assert list(PAYLOAD.encodings()) == ["br", "gzip", "identity"]
+
+
+def test_choose_encoding_prefers_the_most_compact_accepted_coding() -> None:
+    assert choose_encoding(PAYLOAD, "gzip, deflate, br") == "br"
+    assert choose_encoding(PAYLOAD, "gzip, br;q=0") == "gzip"
+    assert choose_encoding(PAYLOAD, "*") == "br"
+    assert choose_encoding(PAYLOAD, "*, br;q=0") == "gzip"
+    assert choose_encoding(PAYLOAD, "deflate") == "identity"
+    assert choose_encoding(PAYLOAD, "") == "identity"
+
+
+def test_etag_matches_every_encoded_variant() -> None:
+    digest = PAYLOAD.digest
+    assert etag_matches(PAYLOAD, f'"{digest}"')
+    assert etag_matches(PAYLOAD, f'"{digest}-gzip"')
+    assert etag_matches(PAYLOAD, f'"other", W/"{digest}-br"')
+    assert etag_matches(PAYLOAD, "*")
+    assert not etag_matches(PAYLOAD, '"other"')
+
+
+def test_revalidation_gets_304_for_any_variant() -> None:
+    response = client.get("/parties", headers={"Accept-Encoding": "br"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["etag"] == f'"{PAYLOAD.digest}-br"'
+    assert response.json() == PARTIES
+
+    # A cache that stored the gzip variant revalidates it against a br-capable client
+    revalidated = client.get(
+        "/parties",
+        headers={"Accept-Encoding": "br", "If-None-Match": f'"{PAYLOAD.digest}-gzip"'},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == response.headers["etag"]
+    assert revalidated.headers["vary"] == "Accept-Encoding"
+
+    changed = client.get(
+        "/parties",
+        headers={"Accept-Encoding": "identity", "If-None-Match": '"other"'},
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] == PAYLOAD.etag
+    assert "content-encoding" not in changed.headers
@@ -0,0 +1,62 @@
+from typing import Dict, List
+
+from search_index import SearchIndex, stem
+
+
+def party(party_id: int, vision: str, policies: List[str]) -> Dict[str, object]:
+    return {
+        "id": party_id,
+        "name": f"Partij {party_id}",
+        "current_vision": vision,
+        "future_vision": "",
+        "key_policies": policies,
+    }
+
+
+PARTIES = [
+    party(1, "Wij bouwen betaalbare woningen voor starters.", ["Meer woningen"]),
+    party(2, "De zorg moet dichter bij huis.", ["Lagere zorgkosten"]),
+    party(3, "Investeren in onderwijs en leraren.", ["Kleinere klassen"]),
+]
+
+
+def test_update_reindexes_only_changed_parties() -> None:
+    index = SearchIndex()
+    assert index.update(PARTIES) == 3
+    first = index.document(1)
+
+    assert index.update(PARTIES) == 0
+
+    changed = [PARTIES[0], party(2, "Zorg en woningen voor ouderen.", []), PARTIES[2]]
+    assert index.update(changed) == 1
+    assert index.document(1) is first
+    assert [hit.party_id for hit in index.search("ouderen")] == [2]
+
+    # A removed party counts as a change and drops out of the results
+    assert index.update(changed[1:]) == 1
+    assert len(index) == 2
+    assert 1 not in {hit.party_id for hit in index.search("woningen")}
+
+
+def test_sync_skips_a_version_it_already_reflects() -> None:
+    index = SearchIndex()
+    loads = []
+
+    def parties() -> List[Dict[str, object]]:
+        loads.append(1)
+        return PARTIES
+
+    assert index.sync("v1", parties) == 3
+    assert index.sync("v1", parties) == 0
+    assert len(loads) == 1
+
+
+def test_search_matches_stems_and_highlights_snippets() -> None:
+    index = SearchIndex()
+    index.update(PARTIES)
+
+    assert stem("woningen") == stem("woning")
+    hits = index.search("woning")
+    assert [hit.party_id for hit in hits] == [1]
+    assert any("<mark>woningen</mark>" in snippet.text for snippet in hits[0].snippets)
+    assert index.search("de het een") == ()
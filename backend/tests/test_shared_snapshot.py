@@ -0,0 +1,97 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import main
+from models import load_party_definitions
+from payloads import EncodedPayload
+from shared_snapshot import (
+    KEEP_GENERATIONS,
+    SharedSnapshotReader,
+    snapshot_path,
+    write_shared_snapshot,
+)
+
+PARTIES = [{"id": 1, "name": "GroenLinks-PvdA"}, {"id": 2, "name": "VVD"}]
+
+
+def publish(control_path: str, parties: list) -> int:
+    payloads = {"list": EncodedPayload.from_data(parties)}
+    payloads.update(
+        {f"party:{party['id']}": EncodedPayload.from_data(party) for party in parties}
+    )
+    return write_shared_snapshot(control_path, payloads, {"parties": len(parties)})
+
+
+def test_payloads_round_trip_as_views(tmp_path: Path) -> None:
+    control_path = str(tmp_path / "parties.snapshot.gen")
+    assert SharedSnapshotReader.open(control_path) is None
+
+    generation = publish(control_path, PARTIES)
+    reader = SharedSnapshotReader.open(control_path)
+    assert reader is not None
+    assert reader.generation() == generation == 1
+
+    payloads, metadata = reader.load(generation)
+    assert metadata == {"parties": 2}
+    assert set(payloads) == {"list", "party:1", "party:2"}
+    expected = EncodedPayload.from_data(PARTIES)
+    loaded = payloads["list"]
+    assert isinstance(loaded.body, memoryview)
+    assert loaded.digest == expected.digest
+    assert {coding: bytes(body) for coding, body in loaded.encodings().items()} == {
+        coding: bytes(body) for coding, body in expected.encodings().items()
+    }
+
+
+def test_reader_sees_new_generations_and_old_files_are_removed(tmp_path: Path) -> None:
+    control_path = str(tmp_path / "parties.snapshot.gen")
+    publish(control_path, PARTIES)
+    reader = SharedSnapshotReader(control_path)
+    first, _ = reader.load(1)
+
+    renamed = [{**PARTIES[0], "name": "GL-PvdA"}, PARTIES[1]]
+    for _ in range(KEEP_GENERATIONS + 1):
+        generation = publish(control_path, renamed)
+
+    assert reader.generation() == generation == KEEP_GENERATIONS + 2
+    latest, _ = reader.load(generation)
+    assert latest["party:1"].digest != first["party:1"].digest
+    assert latest["party:2"].digest == first["party:2"].digest
+    # The first file is gone, but views into its mapping stay readable
+    assert not os.path.exists(snapshot_path(control_path, 1))
+    assert os.path.exists(snapshot_path(control_path, 2))
+    assert b"GroenLinks-PvdA" in bytes(first["party:1"].body)
+
+
+def test_load_rejects_a_file_that_is_not_a_snapshot(tmp_path: Path) -> None:
+    control_path = str(tmp_path / "parties.snapshot.gen")
+    publish(control_path, PARTIES)
+    with open(snapshot_path(control_path, 1), "r+b") as f:
+        f.write(b"NOTASNAP")
+
+    with pytest.raises(ValueError, match="not a party snapshot"):
+        SharedSnapshotReader(control_path).load(1)
+
+
+def test_snapshot_cache_switches_to_a_new_generation(tmp_path: Path) -> None:
+    control_path = str(tmp_path / "parties.snapshot.gen")
+    parties = tuple(load_party_definitions())
+    main.publish_shared_snapshot(main.make_snapshot(parties, (), None), control_path)
+    reader = SharedSnapshotReader(control_path)
+    cache = main.SnapshotCache(shared=reader)
+
+    first = cache.get()
+    assert cache.current() is first
+    assert not first.party_list.parsed()  # served without parsing the parties
+
+    renamed = (parties[0].model_copy(update={"name": "Renamed"}), *parties[1:])
+    main.publish_shared_snapshot(main.make_snapshot(renamed, (), None), control_path)
+    assert cache.current() is None
+
+    second = cache.get()
+    assert second.signature == main.shared_signature(2)
+    assert b"Renamed" in bytes(second.party_payloads[parties[0].id].body)
+    assert second.party_payloads[parties[1].id] == first.party_payloads[parties[1].id]
+    assert second.parties[0].name == "Renamed"
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from typing import List, Tuple
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+class BlockingLoad:
+    """A load that runs until release() is called, counting its calls."""
+
+    def __init__(self, result: str = "snapshot") -> None:
+        self.result = result
+        self.calls = 0
+        self._release = threading.Event()
+
+    def __call__(self) -> str:
+        self.calls += 1
+        self._release.wait(timeout=5)
+        return self.result
+
+    def release(self) -> None:
+        self._release.set()
+
+
+def test_concurrent_callers_share_one_load() -> None:
+    events: List[str] = []
+    flights = SingleFlight(on_event=events.append)
+    load = BlockingLoad()
+
+    async def main() -> List[str]:
+        callers = [asyncio.ensure_future(flights.run("2025", load)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        load.release()
+        return await asyncio.gather(*callers)
+
+    assert asyncio.run(main()) == ["snapshot"] * 3
+    assert load.calls == 1
+    assert events == ["load", "join", "join"]
+
+
+def test_different_keys_load_separately() -> None:
+    flights = SingleFlight()
+    first, second = BlockingLoad("2025"), BlockingLoad("2021")
+    first.release()
+    second.release()
+
+    async def main() -> Tuple[str, str]:
+        return await asyncio.gather(
+            flights.run("2025", first), flights.run("2021", second)
+        )
+
+    assert list(asyncio.run(main())) == ["2025", "2021"]
+    assert (first.calls, second.calls) == (1, 1)
+
+
+def test_cancelled_caller_does_not_cancel_the_load() -> None:
+    flights = SingleFlight()
+    load = BlockingLoad()
+
+    async def main() -> str:
+        leaving = asyncio.ensure_future(flights.run("2025", load))
+        staying = asyncio.ensure_future(flights.run("2025", load))
+        await asyncio.sleep(0.05)
+        leaving.cancel()
+        await asyncio.sleep(0.05)
+        load.release()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        return await staying
+
+    assert asyncio.run(main()) == "snapshot"
+    assert load.calls == 1
+
+
+def test_failed_load_reaches_every_caller_and_is_retried() -> None:
+    flights = SingleFlight()
+    calls = 0
+
+    def failing_load() -> str:
+        nonlocal calls
+        calls += 1
+        raise OSError("database/parties_2025.json is missing")
+
+    async def main() -> None:
+        results = await asyncio.gather(
+            flights.run("2025", failing_load),
+            flights.run("2025", failing_load),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, OSError) for result in results)
+        with pytest.raises(OSError):
+            await flights.run("2025", failing_load)
+
+    asyncio.run(main())
+    assert calls == 2
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useRef } from 'react'
 import { PartyCard } from './components/PartyCard'
 import { Header } from './components/Header'
 import { PartyModal } from './components/PartyModal'
@@ -6,22 +6,80 @@ import { PartyModal } from './components/PartyModal'
 // const BACKEND_URL = 'http://localhost:8000'
 const BACKEND_URL = 'https://api.nederland2025.app'
 
-interface Party { 
+// Optional CDN copy of the API written by backend/export_static.py; the backend is the fallback
+const STATIC_BASE_URL = import.meta.env.VITE_STATIC_BASE_URL
+
+// Fields needed by the party grid; the visions are fetched when a party is opened
+const SUMMARY_FIELDS = 'id,name,color,logo_url,key_policies'
+
+// A response body plus the backend's payload digest, null for the static copy
+interface Fetched<T> {
+  data: T
+  digest: string | null
+}
+
+// The payload digest in a backend ETag such as "abc123-gzip" or W/"abc123"
+const etagDigest = (response: Response): string | null => {
+  const etag = response.headers.get('ETag')
+  return etag ? etag.replace(/^W\//, '').replace(/"/g, '').split('-')[0] : null
+}
+
+// With fresh, skip the static copy and revalidate the browser cache (used after an update event)
+const fetchJson = async <T,>(staticPath: string, apiPath: string, fresh = false): Promise<Fetched<T>> => {
+  if (STATIC_BASE_URL && !fresh) {
+    try {
+      const response = await fetch(`${STATIC_BASE_URL}/${staticPath}`)
+      if (response.ok) {
+        return { data: await response.json(), digest: null }
+      }
+    } catch {
+      // Fall through to the backend
+    }
+  }
+  const response = await fetch(`${BACKEND_URL}${apiPath}`, fresh ? { cache: 'no-cache' } : undefined)
+  if (!response.ok) {
+    throw new Error(`Request to ${apiPath} failed`)
+  }
+  return { data: await response.json(), digest: etagDigest(response) }
+}
+
+interface PartySummary {
   id: number
   name: string
   color: string
   logo_url: string
+  key_policies: string[]
+}
+
+interface Party extends PartySummary {
   current_vision: string
   future_vision: string
-  key_policies: string[]
   website_url: string
 }
 
+// Sent by /api/events on connect and whenever the party data changes
+interface VersionEvent {
+  version: string
+  // Digest of the SUMMARY_FIELDS party list
+  summary: string
+  parties: Record<string, string>
+}
+
 function App() {
-  const [parties, setParties] = useState<Party[]>([])
-  const [selectedParty, setSelectedParty] = useState<Party | null>(null)
+  const [parties, setParties] = useState<PartySummary[]>([])
+  const [selectedParty, setSelectedParty] = useState<PartySummary | null>(null)
+  const [partyDetails, setPartyDetails] = useState<Record<number, Party>>({})
+  // Failed detail loads by party id, so an error shows only for the party it belongs to
+  const [detailsErrors, setDetailsErrors] = useState<Record<number, string>>({})
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
+  // Party digests of the last version event, to tell which parties changed
+  const partyVersions = useRef<Record<string, string> | null>(null)
+  // Digests of the data actually loaded (from the ETags), compared with the first version event.
+  // The browser cache or an update between the fetch and the connect can make them differ.
+  const loadedSummary = useRef<string | null>(null)
+  const loadedDetails = useRef<Record<string, string>>({})
+  const eventSummary = useRef<string | null>(null)
 
   const shuffleArray = <T,>(array: T[]): T[] => {
     const shuffled = [...array]
@@ -32,27 +90,138 @@ function App() {
     return shuffled
   }
 
+  const refreshParty = useCallback(async (partyId: number) => {
+    const { data, digest } = await fetchJson<Party>(`api/parties/${partyId}.json`, `/api/parties/${partyId}`, true)
+    if (digest) {
+      loadedDetails.current[partyId] = digest
+    }
+    const summary = {
+      id: data.id,
+      name: data.name,
+      color: data.color,
+      logo_url: data.logo_url,
+      key_policies: data.key_policies,
+    }
+    setParties(current => current.map(party => (party.id === data.id ? summary : party)))
+    setPartyDetails(details => ({ ...details, [data.id]: data }))
+  }, [])
+
+  const refreshPartyList = useCallback(async () => {
+    const { data, digest } = await fetchJson<PartySummary[]>(
+      'api/parties/summary.json',
+      `/api/parties?fields=${SUMMARY_FIELDS}`,
+      true,
+    )
+    loadedSummary.current = digest
+    // Keep the shuffled order; new parties go at the end
+    setParties(current => {
+      const order = new Map(current.map((party, index) => [party.id, index]))
+      return [...data].sort((a, b) => (order.get(a.id) ?? order.size) - (order.get(b.id) ?? order.size))
+    })
+  }, [])
+
   const fetchParties = useCallback(async () => {
     try {
-      const response = await fetch(`${BACKEND_URL}/api/parties`)
-      if (!response.ok) {
-        throw new Error('Failed to fetch parties')
-      }
-      const data = await response.json()
+      const { data, digest } = await fetchJson<PartySummary[]>(
+        'api/parties/summary.json',
+        `/api/parties?fields=${SUMMARY_FIELDS}`,
+      )
+      loadedSummary.current = digest
       setParties(shuffleArray(data))
+      // The version event came first and describes newer data than this response
+      if (digest && eventSummary.current && digest !== eventSummary.current) {
+        refreshPartyList().catch(() => {
+          // Keep showing the list that was loaded
+        })
+      }
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Unknown error')
     } finally {
       setLoading(false)
     }
-  }, [])
+  }, [refreshPartyList])
 
   useEffect(() => {
     fetchParties()
   }, [fetchParties])
 
-  const openPartyModal = (party: Party) => {
+  const fetchPartyDetails = useCallback(async (partyId: number) => {
+    try {
+      const { data, digest } = await fetchJson<Party>(`api/parties/${partyId}.json`, `/api/parties/${partyId}`)
+      if (digest) {
+        loadedDetails.current[partyId] = digest
+      }
+      setPartyDetails(details => ({ ...details, [data.id]: data }))
+      const version = partyVersions.current?.[partyId]
+      if (digest && version && digest !== version) {
+        refreshParty(partyId).catch(() => {
+          // Clear the digest, so the next event fetches this party again
+          if (partyVersions.current) {
+            partyVersions.current[partyId] = ''
+          }
+        })
+      }
+    } catch (err) {
+      const message = err instanceof Error ? err.message : 'Unknown error'
+      setDetailsErrors(errors => ({ ...errors, [partyId]: message }))
+    }
+  }, [refreshParty])
+
+  useEffect(() => {
+    // With a CDN copy the data changes only on a new export; don't hold a backend connection per visitor
+    if (STATIC_BASE_URL || typeof EventSource === 'undefined') {
+      return
+    }
+    const events = new EventSource(`${BACKEND_URL}/api/events`)
+    events.addEventListener('version', event => {
+      const { summary, parties: versions }: VersionEvent = JSON.parse((event as MessageEvent).data)
+      const previous = partyVersions.current
+      partyVersions.current = versions
+      eventSummary.current = summary
+      // Compare the first event with what was loaded; a list still loading is checked when it arrives
+      if (!previous) {
+        if (loadedSummary.current && loadedSummary.current !== summary) {
+          refreshPartyList().catch(() => {
+            // Keep showing the list that was loaded
+          })
+        }
+        for (const [id, digest] of Object.entries(loadedDetails.current)) {
+          if (versions[id] && versions[id] !== digest) {
+            refreshParty(Number(id)).catch(() => {
+              versions[id] = ''
+            })
+          }
+        }
+        return
+      }
+      const ids = Object.keys(versions)
+      if (ids.length !== Object.keys(previous).length || ids.some(id => !(id in previous))) {
+        refreshPartyList().catch(() => {
+          // Compare against the old digests again on the next event
+          partyVersions.current = previous
+        })
+      }
+      for (const id of ids.filter(id => id in previous && previous[id] !== versions[id])) {
+        refreshParty(Number(id)).catch(() => {
+          // Clear the digest, so the next event fetches this party again
+          versions[id] = ''
+        })
+      }
+    })
+    return () => events.close()
+  }, [refreshParty, refreshPartyList])
+
+  const openPartyModal = (party: PartySummary) => {
     setSelectedParty(party)
+    // Clear an earlier failure, so opening the party again retries the request
+    setDetailsErrors(errors => {
+      const remaining = { ...errors }
+      delete remaining[party.id]
+      return remaining
+    })
+    if (!partyDetails[party.id]) {
+      fetchPartyDetails(party.id)
+    }
   }
 
   const closePartyModal = () => {
@@ -159,6 +328,8 @@ function App() {
       {selectedParty && (
         <PartyModal 
           party={selectedParty} 
+          details={partyDetails[selectedParty.id] ?? null}
+          error={detailsErrors[selectedParty.id] ?? null}
           onClose={closePartyModal}
         />
       )}
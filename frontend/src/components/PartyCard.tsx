@@ -1,16 +1,16 @@
-interface Party {
+interface PartySummary {
   id: number
   name: string
   color: string
   logo_url: string
-  current_vision: string
-  future_vision: string
   key_policies: string[]
-  website_url: string
 }
 
+// Key policies shown on a card; the rest are in the party modal
+const PREVIEW_POLICIES = 2
+
 interface PartyCardProps {
-  party: Party
+  party: PartySummary
   onClick: () => void
 }
 
@@ -35,24 +35,17 @@ export const PartyCard = ({ party, onClick }: PartyCardProps) => {
           </div>
         </div>
         
-        <div className="space-y-4">
-          <div>
-            <h4 className="text-xs font-semibold text-gray-500 mb-2 uppercase tracking-wide">
-              Hoe zij Nederland zien
-            </h4>
-            <p className="text-gray-700 leading-relaxed line-clamp-3">
-              {party.current_vision}
-            </p>
-          </div>
-          
-          <div>
-            <h4 className="text-xs font-semibold text-gray-500 mb-2 uppercase tracking-wide">
-              Hun visie voor de toekomst
-            </h4>
-            <p className="text-gray-700 leading-relaxed line-clamp-3">
-              {party.future_vision}
-            </p>
-          </div>
+        <div>
+          <h4 className="text-xs font-semibold text-gray-500 mb-2 uppercase tracking-wide">
+            Kernstandpunten
+          </h4>
+          <ul className="space-y-2">
+            {party.key_policies.slice(0, PREVIEW_POLICIES).map((policy, index) => (
+              <li key={index} className="text-gray-700 leading-relaxed line-clamp-2">
+                {policy}
+              </li>
+            ))}
+          </ul>
         </div>
         
         <div className="flex items-center justify-between mt-6 pt-4 border-t border-gray-100">
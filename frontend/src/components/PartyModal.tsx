@@ -48,11 +48,14 @@ const formatVisionText = (text: string): string[] => {
   return paragraphs.filter(p => p.length > 0);
 }
 
-interface Party {
+interface PartySummary {
   id: number
   name: string
   color: string
   logo_url: string
+}
+
+interface Party extends PartySummary {
   current_vision: string
   future_vision: string
   key_policies: string[]
@@ -60,11 +63,13 @@ interface Party {
 }
 
 interface PartyModalProps {
-  party: Party
+  party: PartySummary
+  details: Party | null
+  error: string | null
   onClose: () => void
 }
 
-export const PartyModal = ({ party, onClose }: PartyModalProps) => {
+export const PartyModal = ({ party, details, error, onClose }: PartyModalProps) => {
   useEffect(() => {
     const handleEscape = (e: KeyboardEvent) => {
       if (e.key === 'Escape') {
@@ -132,102 +137,110 @@ export const PartyModal = ({ party, onClose }: PartyModalProps) => {
           </div>
         </div>
         
-        <div className="p-8 space-y-10">
-          <div className="grid md:grid-cols-2 gap-8">
-            <div className="space-y-4">
-              <div className="flex items-center mb-4">
-                <div className="w-3 h-3 bg-accent-400 rounded-full mr-3"></div>
-                <h3 className="text-2xl font-bold text-gray-800">
-                  Hoe zij Nederland nu zien
-                </h3>
+        {!details && (
+          <div className="p-8 text-center text-gray-600">
+            {error ?? 'Laden van partijinformatie...'}
+          </div>
+        )}
+
+        {details && (
+          <div className="p-8 space-y-10">
+            <div className="grid md:grid-cols-2 gap-8">
+              <div className="space-y-4">
+                <div className="flex items-center mb-4">
+                  <div className="w-3 h-3 bg-accent-400 rounded-full mr-3"></div>
+                  <h3 className="text-2xl font-bold text-gray-800">
+                    Hoe zij Nederland nu zien
+                  </h3>
+                </div>
+                <div className="bg-gray-50/80 backdrop-blur-sm rounded-2xl p-6 border border-gray-100">
+                  <div className="text-gray-700 leading-relaxed text-lg space-y-4">
+                    {formatVisionText(details.current_vision).map((paragraph, index) => (
+                      <p key={index} className="text-gray-700 leading-relaxed">
+                        {paragraph}
+                      </p>
+                    ))}
+                  </div>
+                </div>
               </div>
-              <div className="bg-gray-50/80 backdrop-blur-sm rounded-2xl p-6 border border-gray-100">
-                <div className="text-gray-700 leading-relaxed text-lg space-y-4">
-                  {formatVisionText(party.current_vision).map((paragraph, index) => (
-                    <p key={index} className="text-gray-700 leading-relaxed">
-                      {paragraph}
-                    </p>
-                  ))}
+              
+              <div className="space-y-4">
+                <div className="flex items-center mb-4">
+                  <div className="w-3 h-3 bg-accent-500 rounded-full mr-3"></div>
+                  <h3 className="text-2xl font-bold text-gray-800">
+                    Hun visie voor Nederland
+                  </h3>
+                </div>
+                <div className="bg-accent-50/80 backdrop-blur-sm rounded-2xl p-6 border border-accent-100">
+                  <div className="text-gray-700 leading-relaxed text-lg space-y-4">
+                    {formatVisionText(details.future_vision).map((paragraph, index) => (
+                      <p key={index} className="text-gray-700 leading-relaxed">
+                        {paragraph}
+                      </p>
+                    ))}
+                  </div>
                 </div>
               </div>
             </div>
             
-            <div className="space-y-4">
-              <div className="flex items-center mb-4">
-                <div className="w-3 h-3 bg-accent-500 rounded-full mr-3"></div>
+            <div>
+              <div className="flex items-center mb-6">
+                <div className="w-3 h-3 bg-accent-600 rounded-full mr-3"></div>
                 <h3 className="text-2xl font-bold text-gray-800">
-                  Hun visie voor Nederland
+                  Kernstandpunten
                 </h3>
               </div>
-              <div className="bg-accent-50/80 backdrop-blur-sm rounded-2xl p-6 border border-accent-100">
-                <div className="text-gray-700 leading-relaxed text-lg space-y-4">
-                  {formatVisionText(party.future_vision).map((paragraph, index) => (
-                    <p key={index} className="text-gray-700 leading-relaxed">
-                      {paragraph}
-                    </p>
-                  ))}
-                </div>
-              </div>
-            </div>
-          </div>
-          
-          <div>
-            <div className="flex items-center mb-6">
-              <div className="w-3 h-3 bg-accent-600 rounded-full mr-3"></div>
-              <h3 className="text-2xl font-bold text-gray-800">
-                Kernstandpunten
-              </h3>
-            </div>
-            <div className="grid gap-4">
-              {party.key_policies.map((policy, index) => (
-                <div 
-                  key={index}
-                  className="flex items-start space-x-4 p-6 bg-white/80 backdrop-blur-sm rounded-2xl border border-gray-100 hover:border-gray-200 transition-colors duration-300"
-                >
+              <div className="grid gap-4">
+                {details.key_policies.map((policy, index) => (
                   <div 
-                    className="w-8 h-8 rounded-xl flex items-center justify-center text-white text-sm font-bold flex-shrink-0 shadow-sm"
-                    style={{ backgroundColor: party.color }}
+                    key={index}
+                    className="flex items-start space-x-4 p-6 bg-white/80 backdrop-blur-sm rounded-2xl border border-gray-100 hover:border-gray-200 transition-colors duration-300"
                   >
-                    {index + 1}
+                    <div 
+                      className="w-8 h-8 rounded-xl flex items-center justify-center text-white text-sm font-bold flex-shrink-0 shadow-sm"
+                      style={{ backgroundColor: party.color }}
+                    >
+                      {index + 1}
+                    </div>
+                    <p className="text-gray-700 leading-relaxed text-lg font-medium flex-1">
+                      {policy}
+                    </p>
                   </div>
-                  <p className="text-gray-700 leading-relaxed text-lg font-medium flex-1">
-                    {policy}
-                  </p>
-                </div>
-              ))}
-            </div>
-          </div>
-          
-          <div className="flex flex-col md:flex-row items-center justify-between pt-8 border-t border-gray-200 space-y-4 md:space-y-0">
-            <div className="text-gray-600 font-medium">
-              Meer informatie op hun officiële website
+                ))}
+              </div>
             </div>
-            <div className="flex space-x-4">
-              <button
-                onClick={onClose}
-                className="btn-secondary"
-              >
-                Sluiten
-              </button>
-              <a
-                href={party.website_url}
-                target="_blank"
-                rel="noopener noreferrer"
-                className="btn-primary inline-flex items-center"
-              >
-                Bezoek website
-                <svg 
-                  className="w-4 h-4 ml-2" 
-                  fill="none" 
-                  stroke="currentColor" 
-                  viewBox="0 0 24 24"
+            
+            <div className="flex flex-col md:flex-row items-center justify-between pt-8 border-t border-gray-200 space-y-4 md:space-y-0">
+              <div className="text-gray-600 font-medium">
+                Meer informatie op hun officiële website
+              </div>
+              <div className="flex space-x-4">
+                <button
+                  onClick={onClose}
+                  className="btn-secondary"
                 >
-                  <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M10 6H6a2 2 0 00-2 2v10a2 2 0 002-2v-4M14 4h6m0 0v6m0-6L10 14" />
-                </svg>
-              </a>
+                  Sluiten
+                </button>
+                <a
+                  href={details.website_url}
+                  target="_blank"
+                  rel="noopener noreferrer"
+                  className="btn-primary inline-flex items-center"
+                >
+                  Bezoek website
+                  <svg 
+                    className="w-4 h-4 ml-2" 
+                    fill="none" 
+                    stroke="currentColor" 
+                    viewBox="0 0 24 24"
+                  >
+                    <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M10 6H6a2 2 0 00-2 2v10a2 2 0 002-2v-4M14 4h6m0 0v6m0-6L10 14" />
+                  </svg>
+                </a>
+              </div>
             </div>
           </div>
-        </div>
+        )}
       </div>
     </div>
   )